@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks of the pricing engines: `HestonEngine.npv` across strikes,
+maturities and mixed books, scenario ladders, the chf terms per backend, warm
+disk-store reads, and `BlackScholesEngine` Greeks and implied volatilities.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.engines.blackscholes import BlackScholesEngine
+from src.instruments.option import OptionBook
+from src.engines.heston import HestonEngine
+from src.engines.cache import DiskCache
+from src import backends
+import numpy as np
+import tempfile
+
+HESTON = dict(
+    theta=0.0398,
+    kappa=1.5768,
+    sigma=0.5751,
+    rho=-0.5711,
+    phi=0.05**2,
+    v0=0.0175,
+    risk_free_rate=0.025,
+    s0=100.0,
+)
+
+
+def _book(n_strikes: int, n_taus: int, n_spots: int = 1) -> OptionBook:
+    strike = np.linspace(60.0, 220.0, n_strikes)
+    tau = np.linspace(0.1, 5.0, n_taus)
+    s0 = np.linspace(100.0, 200.0, n_spots)
+    s0, tau, strike = (x.ravel() for x in np.meshgrid(s0, tau, strike, indexing="ij"))
+    return OptionBook(s0, strike, tau, np.where(strike >= s0, 1, -1))
+
+
+def bench_heston_npv_strikes(param):
+    integration, n_strikes = param
+    engine = HestonEngine(**HESTON, integration=integration)
+    book = _book(n_strikes, 1)
+    return lambda: engine.npv(book)
+
+
+bench_heston_npv_strikes.params = [
+    ("quad_vec", 10),
+    ("quad_vec", 100),
+    ("quad_vec", 1000),
+    ("laguerre", 10),
+    ("laguerre", 100),
+    ("laguerre", 1000),
+    ("laguerre", 10000),
+]
+
+
+def bench_heston_npv_maturities(param):
+    integration, n_taus = param
+    engine = HestonEngine(**HESTON, integration=integration)
+    book = _book(20, n_taus)
+    return lambda: engine.npv(book)
+
+
+bench_heston_npv_maturities.params = [
+    ("quad_vec", 10),
+    ("laguerre", 10),
+    ("laguerre", 100),
+]
+
+
+def bench_heston_npv_mixed(param):
+    # several spots per maturity, as in the notebook's mixed pools
+    integration = param
+    engine = HestonEngine(**HESTON, integration=integration)
+    book = _book(50, 10, 3)
+    return lambda: engine.npv(book)
+
+
+bench_heston_npv_mixed.params = ["quad_vec", "laguerre"]
+
+
+def bench_heston_chf_terms(backend):
+    engine = HestonEngine(**HESTON, backend=backend)
+    z = np.linspace(1e-3, 200.0, 4096)[:, None, None]
+    j = np.array([1, 2])[None, :, None]
+    tau = np.linspace(0.1, 5.0, 50)
+    engine.chf_terms(tau, z[:1], j)
+    return lambda: engine.chf_terms(tau, z, j)
+
+
+bench_heston_chf_terms.params = sorted(backends.registry)
+
+
+def bench_heston_scenarios(n_spots):
+    engine = HestonEngine(**HESTON, integration="laguerre")
+    book = _book(20, 10)
+    spot_shifts = np.linspace(-0.2, 0.2, n_spots)
+    return lambda: engine.scenarios(
+        book, spot_shifts, (-0.01, 0.0, 0.01), (0.0, 1 / 252)
+    )
+
+
+bench_heston_scenarios.params = [1, 41]
+
+
+def bench_heston_npv_store(n):
+    store = DiskCache(tempfile.mkdtemp(prefix="bench-store-"))
+    book = _book(n // 10, 10)
+    HestonEngine(**HESTON, integration="laguerre", store=store).npv(book)
+    # a fresh engine, as in a new worker process, reading the stored prices
+    return lambda: HestonEngine(**HESTON, integration="laguerre", store=store).npv(book)
+
+
+bench_heston_npv_store.params = [1000, 100000]
+
+
+def bench_blackscholes_greeks(n):
+    engine = BlackScholesEngine(risk_free_rate=0.025)
+    book = _book(n // 10, 10)
+    book.sigma[:] = 0.2
+    return lambda: engine.evaluate(book)
+
+
+bench_blackscholes_greeks.params = [1000, 100000]
+
+
+def bench_blackscholes_implied_volatility(n):
+    engine = BlackScholesEngine(risk_free_rate=0.025)
+    book = _book(n // 10, 10)
+    book.sigma[:] = 0.2
+    book.quote[:] = engine.npv(book)
+    engine.implied_volatility(book[:10])
+    return lambda: engine.implied_volatility(book)
+
+
+bench_blackscholes_implied_volatility.params = [1000, 100000]
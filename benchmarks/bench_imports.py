@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks of the cold start: importing the package, and the modules of its
+engines and processes, in a fresh interpreter. Their `budget` bounds the time
+of a short-lived job spent before its first pricing, relative to importing
+NumPy alone so that it holds on a loaded or slower machine.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import subprocess
+import sys
+import os
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def bench_import(module):
+    command = [sys.executable, "-c", f"import {module}"]
+    return lambda: subprocess.run(command, cwd=ROOT, check=True)
+
+
+def import_numpy():
+    command = [sys.executable, "-c", "import numpy"]
+    return lambda: subprocess.run(command, cwd=ROOT, check=True)
+
+
+bench_import.params = [
+    "src",
+    "src.engines.heston",
+    "src.engines.blackscholes",
+    "src.processes.heston",
+]
+# multiples of `import numpy`, interpreter start-up included in both
+bench_import.baseline = import_numpy
+bench_import.budget = {
+    "src": 0.5,
+    "src.engines.heston": 2.5,
+    "src.engines.blackscholes": 2.5,
+    "src.processes.heston": 3.0,
+}
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks of the instruments: bulk construction of
+`EuropeanVanillaOption` objects and of option books.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.instruments.option import EuropeanVanillaOption, OptionBook
+import numpy as np
+
+
+def bench_european_vanilla_options(n):
+    strikes = np.linspace(60.0, 220.0, n)
+    return lambda: [
+        EuropeanVanillaOption(s0=100.0, strike=k, tau=0.3, flag=-1) for k in strikes
+    ]
+
+
+bench_european_vanilla_options.params = [1000, 10000]
+
+
+def bench_option_book_from_options(n):
+    strikes = np.linspace(60.0, 220.0, n)
+    options = [EuropeanVanillaOption(s0=100.0, strike=k, tau=0.3) for k in strikes]
+    return lambda: OptionBook.from_options(options)
+
+
+bench_option_book_from_options.params = [1000, 10000]
+
+
+def bench_option_book(n):
+    strikes = np.linspace(60.0, 220.0, n)
+    return lambda: OptionBook(100.0, strikes, 0.3, -1)
+
+
+bench_option_book.params = [1000, 100000]
+bench_option_book.memory = True
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks of the stochastic processes: time and peak memory of
+`HestonProcess.paths` across paths, steps, schemes and backends.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.processes.heston import HestonProcess
+from src.engines.heston import HestonEngine
+from src import backends
+import numpy as np
+
+HESTON = dict(
+    theta=0.0398,
+    kappa=1.5768,
+    sigma=0.5751,
+    rho=-0.5711,
+    phi=0.05**2,
+    v0=0.0175,
+    risk_free_rate=0.025,
+    s0=100.0,
+)
+
+
+def bench_heston_paths(param):
+    scheme, n_paths, n_steps = param
+    engine = HestonEngine(**HESTON)
+
+    def call():
+        np.random.seed(0)
+        return HestonProcess.paths(engine, n_paths, n_steps, 1.0, scheme=scheme)
+
+    return call
+
+
+bench_heston_paths.params = [
+    ("euler", 10000, 50),
+    ("milstein", 10000, 50),
+    ("milstein", 100000, 50),
+    ("milstein", 10000, 250),
+    ("qe", 10000, 50),
+    ("qe", 100000, 50),
+]
+bench_heston_paths.memory = True
+
+
+def bench_heston_paths_backend(backend):
+    engine = HestonEngine(**HESTON, backend=backend)
+    HestonProcess.paths(engine, 2, 1, 1.0)
+
+    def call():
+        np.random.seed(0)
+        return HestonProcess.paths(engine, 100000, 50, 1.0)
+
+    return call
+
+
+bench_heston_paths_backend.params = sorted(backends.registry)
+bench_heston_paths_backend.memory = True
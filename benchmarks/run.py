@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module runs the benchmark suite and compares its results.
+Benchmarks are the `bench_*` functions of the `bench_*.py` modules of
+this directory: called with one of their `params`, they build their
+inputs and return the callable to time. Functions flagged `memory`
+also get their peak traced memory recorded, and functions with a
+`budget` (seconds, or a dict of seconds per param) fail the run when
+their best time exceeds it. With a `baseline` as well, a benchmark-like
+function without params, the budget is a multiple of the baseline's best
+time, measured right after the benchmark so that both see the same load.
+
+usage:
+    python benchmarks/run.py run [--filter TEXT] [--out FILE]
+    python benchmarks/run.py compare BASELINE RESULTS [--threshold 0.2]
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import importlib.util
+import tracemalloc
+import statistics
+import platform
+import argparse
+import datetime
+import timeit
+import typing
+import json
+import glob
+import sys
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+
+def discover(
+    pattern: str = None,
+) -> typing.Iterator[typing.Tuple[str, typing.Callable, typing.Any]]:
+    """
+    Benchmarks of the suite, as (name, function, param).
+
+    @param {str} [pattern=None] - Substring the benchmark names must contain.
+
+    @returns {Iterator[Tuple[str, Callable, Any]]} Benchmarks in file order.
+    """
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for attr, function in vars(module).items():
+            if not attr.startswith("bench_") or not callable(function):
+                continue
+            for param in getattr(function, "params", [None]):
+                name = f"{module_name[6:]}.{attr[6:]}"
+                name += "" if param is None else f"[{param}]"
+                if pattern is None or pattern in name:
+                    yield name, function, param
+
+
+def measure(function: typing.Callable, param, repeat: int) -> typing.Dict:
+    """
+    Time a benchmark and, if flagged, trace its peak memory.
+
+    The number of calls per repetition is calibrated so that a repetition
+    lasts at least 0.2 s (a single call for slower benchmarks).
+
+    @param {Callable} function - Benchmark function.
+    @param {Any} param - Parameter of the benchmark.
+    @param {int} repeat - Number of timed repetitions.
+
+    @returns {Dict} Best and median time per call, number of calls per
+    repetition and peak traced memory in bytes (None if not traced).
+    """
+    call = function() if param is None else function(param)
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    peak = None
+    if getattr(function, "memory", False):
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "time": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+        "peak_memory": peak,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the suite and write the results as JSON.
+
+    @param {argparse.Namespace} args - Command line arguments.
+
+    @returns {int} Exit code, 1 if any benchmark exceeded its budget.
+    """
+    results = {}
+    over_budget = 0
+    for name, function, param in discover(args.filter):
+        results[name] = measure(function, param, args.repeat)
+        peak = results[name]["peak_memory"]
+        budget = getattr(function, "budget", None)
+        if isinstance(budget, dict):
+            budget = budget.get(param)
+        baseline = getattr(function, "baseline", None)
+        if budget is not None and baseline is not None:
+            results[name]["baseline"] = measure(baseline, None, args.repeat)["time"]
+            budget *= results[name]["baseline"]
+        results[name]["budget"] = budget
+        over = budget is not None and results[name]["time"] > budget
+        over_budget += over
+        print(
+            f"{name:<60} {results[name]['time'] * 1e3:>12.3f} ms"
+            + ("" if peak is None else f" {peak / 2**20:>10.1f} MiB")
+            + (f" OVER BUDGET ({budget * 1e3:.0f} ms)" if over else "")
+        )
+
+    import numpy as np
+    import scipy
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.out}")
+    if over_budget:
+        print(f"{over_budget} benchmark(s) over budget")
+    return int(over_budget > 0)
+
+
+def compare(args: argparse.Namespace) -> int:
+    """
+    Compare results against a baseline and flag regressions.
+
+    A benchmark regresses when its best time, or its peak memory, exceeds
+    the baseline's by more than the threshold.
+
+    @param {argparse.Namespace} args - Command line arguments.
+
+    @returns {int} Exit code, 1 if any benchmark regressed.
+    """
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.results) as f:
+        results = json.load(f)["results"]
+
+    regressions = 0
+    for name in sorted(set(baseline) & set(results)):
+        old, new = baseline[name], results[name]
+        flags = []
+        ratio = new["time"] / old["time"]
+        if ratio > 1.0 + args.threshold:
+            flags.append("time")
+        if old["peak_memory"] and new["peak_memory"]:
+            if new["peak_memory"] / old["peak_memory"] > 1.0 + args.threshold:
+                flags.append("memory")
+        regressions += bool(flags)
+        status = "REGRESSION (" + ", ".join(flags) + ")" if flags else ""
+        print(f"{name:<60} {ratio:>8.2f}x {status}")
+
+    for name in sorted(set(baseline) ^ set(results)):
+        print(
+            f"{name:<60} {'only in ' + ('baseline' if name in baseline else 'results')}"
+        )
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return int(regressions > 0)
+
+
+def main(argv: typing.List[str] = None) -> int:
+    """
+    Command line entry point.
+
+    @param {List[str]} [argv=None] - Arguments, sys.argv[1:] by default.
+
+    @returns {int} Exit code.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--filter", default=None, help="substring of names")
+    run_parser.add_argument("--out", default="benchmarks.json", help="JSON output")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
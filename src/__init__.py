@@ -4,8 +4,49 @@
 __author__      = None
 __copyright__   = None
 
-from .engines import *
-from .instruments import *
-from .processes import *
+from ._lazy import attach
 
-__all__ = ["processes", 'engines', "instruments"]
+__all__ = ["processes", 'engines', "instruments", "calibration", "hedging", "surfaces", "instrumentation", "backends", "services"]
+
+# subpackages, and the names they export, are imported on first access
+__getattr__, __dir__ = attach(
+    __name__,
+    __all__,
+    {
+        "Backend": "backends",
+        "NumpyBackend": "backends",
+        "NumbaBackend": "backends",
+        "get_backend": "backends",
+        "Engine": "engines",
+        "ChfCache": "engines",
+        "DiskCache": "engines",
+        "BlackScholesEngine": "engines",
+        "HestonEngine": "engines",
+        "HestonFFTEngine": "engines",
+        "HestonCOSEngine": "engines",
+        "MonteCarloHestonEngine": "engines",
+        "Instrument": "instruments",
+        "EuropeanVanillaOption": "instruments",
+        "OptionBook": "instruments",
+        "OptionView": "instruments",
+        "StochasticProcess": "processes",
+        "HestonProcess": "processes",
+        "BrownianBridge": "processes",
+        "sobol_normals": "processes",
+        "sobol_increments": "processes",
+        "Reducer": "processes",
+        "TerminalReducer": "processes",
+        "MaxReducer": "processes",
+        "MinReducer": "processes",
+        "AverageReducer": "processes",
+        "Calibrator": "calibration",
+        "HestonCalibrator": "calibration",
+        "Hedger": "hedging",
+        "DeltaHedger": "hedging",
+        "Surface": "surfaces",
+        "VolSurface": "surfaces",
+        "Stats": "instrumentation",
+        "Service": "services",
+        "PricingService": "services",
+    },
+)
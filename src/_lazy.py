@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides the lazy loading of the package.
+It contains the function `attach`, which gives a package the module-level
+`__getattr__` and `__dir__` of PEP 562, so that its submodules, and the
+names they export, are only imported on first access.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import importlib
+import typing
+import sys
+
+
+def attach(
+    package: str, submodules: typing.List[str], exports: typing.Dict[str, str]
+) -> typing.Tuple[typing.Callable, typing.Callable]:
+    """
+    Lazy attributes of a package.
+
+    @param {str} package - Name of the package, its `__name__`.
+    @param {List[str]} submodules - Submodules imported on first access.
+    @param {Dict[str, str]} exports - Exported names and the submodules
+    defining them, e.g. {"HestonEngine": "heston"}.
+
+    @returns {Tuple[Callable, Callable]} The package's __getattr__ and __dir__.
+    """
+
+    def __getattr__(name: str):
+        if name in submodules:
+            return importlib.import_module(f"{package}.{name}")
+        if name in exports:
+            module = importlib.import_module(f"{package}.{exports[name]}")
+            value = getattr(module, name)
+            # later lookups find the attribute without calling __getattr__
+            setattr(sys.modules[package], name, value)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> typing.List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(submodules) | set(exports))
+
+    return __getattr__, __dir__
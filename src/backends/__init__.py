@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__      = None
+__copyright__   = None
+
+from .._lazy import attach
+from .base import Backend
+import importlib.util
+
+__all__ = ["base", "vectorized"]
+
+# backend name -> (submodule, class), imported on first use
+registry = {"numpy": ("vectorized", "NumpyBackend")}
+
+if importlib.util.find_spec("numba") is not None:  # numba is an optional dependency
+    registry["numba"] = ("jit", "NumbaBackend")
+    __all__.append("jit")
+
+__getattr__, __dir__ = attach(
+    __name__, __all__, {name: module for module, name in registry.values()}
+)
+
+
+def get_backend(backend="numpy") -> Backend:
+    """
+    Resolve a compute backend.
+
+    @param {str|Backend} [backend="numpy"] - Backend instance or registered name,
+    "numpy" or "numba" (when Numba is installed).
+
+    @returns {Backend} Backend instance.
+    """
+    if isinstance(backend, Backend):
+        return backend
+    if backend not in registry:
+        raise ValueError(f"unknown or unavailable backend {backend!r}")
+    module, name = registry[backend]
+    return getattr(importlib.import_module(f".{module}", __name__), name)()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining compute backends.
+It contains the base class `Backend`, which serves as the foundation
+for implementing the numerical kernels of the engines and processes.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+import numpy as np
+import typing
+
+
+class Backend(ABC):
+    # name under which the backend is registered, see `backends.get_backend`
+    name: str = None
+
+    def __init__(self):
+        """
+        Constructor method for Backend.
+        """
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Backend.
+
+        @returns {str} String representation of the backend.
+        """
+        pass
+
+    @abstractmethod
+    def chf_terms(self, engine, tau, z, j) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Maturity-dependent terms C and D of the Heston characteristic function.
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Terms C and D, broadcast over
+        tau, z and j.
+        """
+        pass
+
+    @abstractmethod
+    def step(
+        self,
+        engine,
+        s: np.ndarray,
+        v: np.ndarray,
+        rho_adj: np.ndarray,
+        zv: np.ndarray,
+        zs: np.ndarray,
+        dt: float,
+        scheme: str,
+        discretization: str,
+        measure: str,
+        out: typing.Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One Euler or Milstein step of the Heston paths.
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {np.ndarray} s - Asset prices.
+        @param {np.ndarray} v - Variances.
+        @param {np.ndarray} rho_adj - Adjusted correlations.
+        @param {np.ndarray} zv - Standard normals of the variance.
+        @param {np.ndarray} zs - Independent standard normals of the spot.
+        @param {float} dt - Time step.
+        @param {str} scheme - "euler" or "milstein".
+        @param {str} discretization - "truncation" or "reflection".
+        @param {str} measure - "rn" or "rw".
+        @param {Tuple[np.ndarray, np.ndarray, np.ndarray]} [out=None] - Buffers
+        of the new state, not aliasing the inputs; new arrays if None.
+
+        @returns {Tuple[np.ndarray, np.ndarray, np.ndarray]} Asset prices,
+        variances and adjusted correlations after the step, in `out` if given.
+        """
+        pass
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides the Numba compute backend.
+This class inherit methods from the parent class `Backend`,
+providing fused kernels compiled with Numba and parallel over paths.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from .base import Backend
+import numpy as np
+import typing
+import numba
+import math
+
+# integer codes of the stepping options
+_SCHEMES = {"euler": 0, "milstein": 1}
+_DISCRETIZATIONS = {"reflection": 0, "truncation": 1}
+
+
+@numba.njit(parallel=True, cache=True)
+def _chf_roots_kernel(kappa, rho, sigma, z, j, ixi, w, b_m, d, g):
+    rho_sigma = rho * sigma
+    sigma_2 = sigma * sigma
+    for k in numba.prange(z.shape[0]):
+        w[k] = 1.0 if j[k] == 1 else -1.0
+        b = kappa - rho * sigma if j[k] == 1 else kappa
+        ixi[k] = 1j * z[k]
+        c = rho_sigma * ixi[k] - b
+        d[k] = np.sqrt(c * c - sigma_2 * (w[k] * ixi[k] + ixi[k] * ixi[k]))
+        b_m[k] = -c - d[k]
+        g[k] = b_m[k] / (b_m[k] + 2.0 * d[k])
+
+
+@numba.njit(parallel=True, cache=True)
+def _chf_terms_kernel(
+    kappa, theta, sigma, phi, drift, tau, index, ixi, w, b_m, d, g, C, D
+):
+    sigma_2 = sigma * sigma
+    kappa_theta = kappa * theta
+    for i in numba.prange(C.shape[0]):
+        k = index[i]
+        t = tau[i]
+        ee = np.exp(-d[k] * t)
+        one_g_ee = 1.0 - g[k] * ee
+        C[i] = (
+            0.5 * ixi[k] * (w[k] + ixi[k]) * (phi * t)
+            + drift * ixi[k] * t
+            + kappa_theta
+            / sigma_2
+            * (b_m[k] * t - 2.0 * np.log(one_g_ee / (1.0 - g[k])))
+        )
+        D[i] = (b_m[k] / sigma_2) * (1.0 - ee) / one_g_ee
+
+
+@numba.njit(parallel=True, cache=True)
+def _step_kernel(
+    s,
+    v,
+    rho_adj,
+    zv,
+    zs,
+    s_t,
+    v_t,
+    rho_adj_t,
+    kappa,
+    theta,
+    sigma,
+    rho,
+    phi,
+    drift,
+    dt,
+    milstein,
+    scheme,
+    discretization,
+    rw,
+):
+    sqrt_dt = math.sqrt(dt)
+    for i in numba.prange(s.shape[0]):
+        v_i = v[i]
+        zv_i = zv[i]
+        v_n = (
+            v_i + kappa * (theta - v_i) * dt + sigma * math.sqrt(v_i) * (sqrt_dt * zv_i)
+        )
+        if scheme == 1:
+            v_n = v_n + milstein * (zv_i * zv_i - 1)
+        if discretization == 0:
+            v_n = abs(v_n)
+        elif v_n < 0.00001:
+            v_n = 0.00001
+        v_t[i] = v_n
+        rho_adj_t[i] = rho if phi == 0 else rho * math.sqrt(v_n / (v_n + phi))
+
+        r_i = rho_adj[i]
+        z = r_i * zv_i + math.sqrt(1 - r_i * r_i) * zs[i]
+        if rw:
+            x = (drift - (v_i + phi) / 2) * dt + math.sqrt(v_i + phi) * (sqrt_dt * z)
+        else:
+            x = (drift - (v_i + phi) / 2) * dt + math.sqrt(v_i + phi) * sqrt_dt * z
+        s_t[i] = s[i] * math.exp(x)
+
+
+class NumbaBackend(Backend):
+    """
+    Numba Backend Class
+
+    This class evaluates the kernels as fused loops compiled by Numba: every
+    element is computed in registers from its inputs, without the full-width
+    temporaries of the NumPy expressions, and the loops run multithreaded over
+    options or paths. Each kernel replays the operations of `NumpyBackend` in
+    the same order, and the path step writes the new state straight into the
+    caller's buffers, spot exponential included. Results agree with NumPy up
+    to the last bits: its SIMD exp and complex products (fused multiply-add
+    loops) round differently from the scalar code, so path steps match to a
+    relative 1e-13 and chf terms to 1e-10, as checked in tests/test_backends.py.
+    Compiled kernels are cached on disk, so only the first run pays for the
+    compilation.
+    """
+
+    name = "numba"
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Numba backend.
+
+        @returns {str} String representation of the backend.
+        """
+        params = (
+            f"{k}={repr(v)}" for k, v in {"threads": numba.get_num_threads()}.items()
+        )
+        return f"<Backend.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def chf_terms(self, engine, tau, z, j) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Maturity-dependent terms of the characteristic function, in the "little
+        Heston trap" formulation (Albrecher et al., 2007).
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Terms C and D, broadcast over
+        tau, z and j.
+        """
+        # terms independent of tau, on the (usually small) grid of z and j
+        shape = np.broadcast_shapes(np.shape(z), np.shape(j))
+        z = np.broadcast_to(np.asarray(z, dtype=np.complex128), shape)
+        j = np.broadcast_to(np.asarray(j, dtype=np.int64), shape)
+        roots = [np.empty(z.size, dtype=np.complex128) for _ in range(4)]
+        w = np.empty(z.size)
+        _chf_roots_kernel(
+            float(engine.kappa),
+            float(engine.rho),
+            float(engine.sigma),
+            z.ravel(),
+            j.ravel(),
+            roots[0],
+            w,
+            *roots[1:],
+        )
+
+        # one element per output, pointing to its (z, j) terms
+        tau = np.asarray(tau, dtype=np.float64)
+        shape = np.broadcast_shapes(tau.shape, z.shape)
+        index = np.broadcast_to(np.arange(z.size).reshape(z.shape), shape).ravel()
+        C = np.empty(shape, dtype=np.complex128)
+        D = np.empty(shape, dtype=np.complex128)
+        _chf_terms_kernel(
+            float(engine.kappa),
+            float(engine.theta),
+            float(engine.sigma),
+            float(engine.phi),
+            float(engine.risk_free_rate - engine.dividend_yield),
+            np.broadcast_to(tau, shape).ravel(),
+            index,
+            roots[0],
+            w,
+            *roots[1:],
+            C.reshape(-1),
+            D.reshape(-1),
+        )
+        return C, D
+
+    def step(
+        self,
+        engine,
+        s: np.ndarray,
+        v: np.ndarray,
+        rho_adj: np.ndarray,
+        zv: np.ndarray,
+        zs: np.ndarray,
+        dt: float,
+        scheme: str,
+        discretization: str,
+        measure: str,
+        out: typing.Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One Euler or Milstein step of the Heston paths, fused in a single loop
+        that writes the new state straight into `out`.
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {np.ndarray} s - Asset prices.
+        @param {np.ndarray} v - Variances.
+        @param {np.ndarray} rho_adj - Adjusted correlations.
+        @param {np.ndarray} zv - Standard normals of the variance.
+        @param {np.ndarray} zs - Independent standard normals of the spot.
+        @param {float} dt - Time step.
+        @param {str} scheme - "euler" or "milstein".
+        @param {str} discretization - "truncation" or "reflection".
+        @param {str} measure - "rn" or "rw".
+        @param {Tuple[np.ndarray, np.ndarray, np.ndarray]} [out=None] - Buffers
+        of the new state, not aliasing the inputs; new arrays if None.
+
+        @returns {Tuple[np.ndarray, np.ndarray, np.ndarray]} Asset prices,
+        variances and adjusted correlations after the step, in `out` if given.
+        """
+        drift = engine.risk_free_rate if measure == "rn" else engine.mu
+        if out is None:
+            out = (np.empty_like(s), np.empty_like(v), np.empty_like(v))
+        s_t, v_t, rho_adj_t = out
+        _step_kernel(
+            s,
+            v,
+            rho_adj,
+            zv,
+            zs,
+            s_t,
+            v_t,
+            rho_adj_t,
+            float(engine.kappa),
+            float(engine.theta),
+            float(engine.sigma),
+            float(engine.rho),
+            float(engine.phi),
+            float(drift - engine.dividend_yield),
+            float(dt),
+            1 / 4 * engine.sigma**2 * dt,
+            _SCHEMES[scheme],
+            _DISCRETIZATIONS[discretization],
+            measure == "rw",
+        )
+        return s_t, v_t, rho_adj_t
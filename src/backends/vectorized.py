@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides the NumPy compute backend.
+This class inherit methods from the parent class `Backend`,
+providing the reference kernels as whole-array NumPy expressions.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from .base import Backend
+import numpy as np
+import typing
+
+
+class NumpyBackend(Backend):
+    """
+    NumPy Backend Class
+
+    This class evaluates the kernels with broadcast NumPy operations. It is the
+    default backend and the reference of the other ones.
+    """
+
+    name = "numpy"
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the NumPy backend.
+
+        @returns {str} String representation of the backend.
+        """
+        return f"<Backend.{self.__class__.__qualname__}()>"
+
+    def chf_terms(self, engine, tau, z, j) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Maturity-dependent terms of the characteristic function, in the "little
+        Heston trap" formulation (Albrecher et al., 2007).
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Terms C and D, broadcast over
+        tau, z and j.
+        """
+        w = np.where(j == 1, 1.0, -1.0)
+        b = np.where(j == 1, engine.kappa - engine.rho * engine.sigma, engine.kappa)
+        ixi = 1j * np.asarray(z)
+        rho_sigma = engine.rho * engine.sigma
+        sigma_2 = engine.sigma * engine.sigma
+        c = rho_sigma * ixi - b
+        d = np.sqrt(c * c - sigma_2 * (w * ixi + ixi * ixi))
+        b_m = -c - d
+        g = b_m / (b_m + 2.0 * d)
+        ee = np.exp(-d * tau)
+        one_g_ee = 1.0 - g * ee
+        C = (
+            0.5 * ixi * (w + ixi) * (engine.phi * tau)
+            + (engine.risk_free_rate - engine.dividend_yield) * ixi * tau
+            + engine.kappa
+            * engine.theta
+            / sigma_2
+            * (b_m * tau - 2.0 * np.log(one_g_ee / (1.0 - g)))
+        )
+        D = (b_m / sigma_2) * (1.0 - ee) / one_g_ee
+        return C, D
+
+    def step(
+        self,
+        engine,
+        s: np.ndarray,
+        v: np.ndarray,
+        rho_adj: np.ndarray,
+        zv: np.ndarray,
+        zs: np.ndarray,
+        dt: float,
+        scheme: str,
+        discretization: str,
+        measure: str,
+        out: typing.Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One Euler or Milstein step of the Heston paths.
+
+        @param {HestonEngine} engine - Engine holding the model parameters.
+        @param {np.ndarray} s - Asset prices.
+        @param {np.ndarray} v - Variances.
+        @param {np.ndarray} rho_adj - Adjusted correlations.
+        @param {np.ndarray} zv - Standard normals of the variance.
+        @param {np.ndarray} zs - Independent standard normals of the spot.
+        @param {float} dt - Time step.
+        @param {str} scheme - "euler" or "milstein".
+        @param {str} discretization - "truncation" or "reflection".
+        @param {str} measure - "rn" or "rw".
+        @param {Tuple[np.ndarray, np.ndarray, np.ndarray]} [out=None] - Buffers
+        of the new state, not aliasing the inputs; new arrays if None.
+
+        @returns {Tuple[np.ndarray, np.ndarray, np.ndarray]} Asset prices,
+        variances and adjusted correlations after the step, in `out` if given.
+        """
+        sqrt_dt = np.sqrt(dt)
+        phi_t = engine.phi
+        s_out, v_out, rho_out = (None, None, None) if out is None else out
+
+        if scheme == "euler":
+            v_t = (
+                v
+                + engine.kappa * (engine.theta - v) * dt
+                + engine.sigma * np.sqrt(v) * (sqrt_dt * zv)
+            )
+        elif scheme == "milstein":
+            v_t = (
+                v
+                + engine.kappa * (engine.theta - v) * dt
+                + engine.sigma * np.sqrt(v) * (sqrt_dt * zv)
+                + 1 / 4 * engine.sigma**2 * dt * (zv**2 - 1)
+            )
+
+        if discretization == "reflection":
+            v_t = np.abs(v_t, out=v_out)
+        elif discretization == "truncation":
+            v_t = np.maximum(v_t, 0.00001, out=v_out)
+
+        if engine.phi == 0:
+            rho_adj_t = np.empty(len(v)) if rho_out is None else rho_out
+            rho_adj_t.fill(float(engine.rho))
+        else:
+            rho_adj_t = np.multiply(
+                engine.rho, np.sqrt(v_t / (v_t + phi_t)), out=rho_out
+            )
+
+        zs = rho_adj * zv + np.sqrt(1 - rho_adj**2) * zs
+        if measure == "rn":
+            s_t = np.multiply(
+                s,
+                np.exp(
+                    (engine.risk_free_rate - engine.dividend_yield - (v + phi_t) / 2)
+                    * dt
+                    + np.sqrt(v + phi_t) * sqrt_dt * zs
+                ),
+                out=s_out,
+            )
+        elif measure == "rw":
+            s_t = np.multiply(
+                s,
+                np.exp(
+                    (engine.mu - engine.dividend_yield - (v + phi_t) / 2) * dt
+                    + np.sqrt(v + phi_t) * (sqrt_dt * zs)
+                ),
+                out=s_out,
+            )
+        return s_t, v_t, rho_adj_t
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from .._lazy import attach
+
+__all__ = ["base", "heston"]
+
+__getattr__, __dir__ = attach(
+    __name__, __all__, {"Calibrator": "base", "HestonCalibrator": "heston"}
+)
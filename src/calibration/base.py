@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining various calibrators.
+It contains the base class `Calibrator`, which serves as the foundation
+for fitting any engine's parameters to quoted instruments.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+
+
+class Calibrator(ABC):
+    def __init__(self):
+        """
+        Constructor method for Calibrator.
+        """
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Calibrator.
+
+        @returns {str} String representation of the calibrator.
+        """
+        pass
+
+    @abstractmethod
+    def calibrate(self, options):
+        """
+        Fit the engine parameters to the quotes of the options.
+
+        @param {List|OptionBook} options - Quoted options.
+        """
+        pass
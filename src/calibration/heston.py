@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining Heston calibrator.
+This class inherit methods from the parent class `Calibrator`,
+providing a Levenberg-Marquardt fit of `HestonEngine` parameters.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..engines.blackscholes import BlackScholesEngine
+from ..instruments.option import OptionBook
+from ..engines.heston import HestonEngine
+from ..engines.cache import DiskCache
+from .base import Calibrator
+import numpy as np
+import typing
+
+
+class HestonCalibrator(Calibrator):
+
+    """
+    Heston Calibrator Class
+
+    This class fits kappa, theta, sigma, rho, v0 and phi of a `HestonEngine` to
+    quoted option prices with a Levenberg-Marquardt solver. Residuals and their
+    Jacobian come from `HestonEngine.npv_gradient`, i.e. from the analytic chf
+    gradients evaluated in the same pass as the prices. The engine's current
+    parameters are the starting point, so re-calibrating an engine fitted the
+    day before is a warm start. With a `DiskCache`, a calibration already run
+    from the same starting point on the same quotes is read back instead.
+    """
+
+    params = ("kappa", "theta", "sigma", "rho", "v0", "phi")
+    bounds = {
+        "kappa": (1e-4, 50.0),
+        "theta": (1e-6, 4.0),
+        "sigma": (1e-4, 10.0),
+        "rho": (-0.999, 0.999),
+        "v0": (1e-6, 4.0),
+        "phi": (0.0, 4.0),
+    }
+
+    def __init__(
+        self,
+        engine: HestonEngine,
+        objective: str = "price",
+        fit: typing.Tuple[str, ...] = params,
+        max_iter: int = 100,
+        tol: float = 1e-10,
+        store: DiskCache = None,
+    ):
+        """
+        Constructor method for HestonCalibrator.
+
+        @param {HestonEngine} engine - Engine to calibrate, updated in place; it
+        must use a fixed-node integration mode.
+        @param {str} [objective="price"] - "price" for price errors, "iv" for
+        vega-weighted price errors, a first-order proxy of implied vol errors.
+        @param {Tuple[str]} [fit=params] - Parameters to fit, the others are kept.
+        @param {int} [max_iter=100] - Maximum number of iterations.
+        @param {float} [tol=1e-10] - Relative tolerance on the cost and the step.
+        @param {DiskCache} [store=None] - Opt-in persistent store of the results.
+        """
+        super().__init__()
+        assert isinstance(engine, HestonEngine)
+        assert engine.integration in ("laguerre", "legendre")
+        assert objective in ("price", "iv")
+        assert len(fit) > 0 and all(name in self.params for name in fit)
+        assert max_iter > 0
+        self.engine = engine
+        self.objective = objective
+        self.fit = tuple(fit)
+        self.max_iter = max_iter
+        self.tol = tol
+        self.store = store
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Heston calibrator.
+
+        @returns {str} String representation of the calibrator.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "engine": self.engine,
+                "objective": self.objective,
+                "fit": self.fit,
+            }.items()
+        )
+        return f"<Calibrator.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def weights(self, book: OptionBook) -> np.ndarray:
+        """
+        Residual weights of the objective.
+
+        For "iv" the weights are the inverse Black-Scholes vegas at the market
+        implied volatilities (the book's sigma, or the quotes' implied vols where
+        sigma is not set).
+
+        @param {OptionBook} book - Quoted options.
+        @returns {np.ndarray} Weights of the price residuals.
+        """
+        if self.objective == "price":
+            return np.ones(len(book))
+
+        bs = BlackScholesEngine(
+            risk_free_rate=self.engine.risk_free_rate,
+            dividend_yield=self.engine.dividend_yield,
+        )
+        market = OptionBook(book.s0, book.strike, book.tau, book.flag, quote=book.quote)
+        market.sigma[:] = book.sigma
+        unset = market.sigma <= 0.0
+        if np.any(unset):
+            market.sigma[unset] = bs.implied_volatility(market[unset])
+        vega = np.abs(bs.vega(market))
+        return 1.0 / np.maximum(vega, 1e-3 * np.max(vega))
+
+    def residuals(self, book: OptionBook, weights: np.ndarray):
+        """
+        Weighted residuals and their Jacobian at the engine's current parameters.
+
+        @param {OptionBook} book - Quoted options.
+        @param {np.ndarray} weights - Residual weights.
+        @returns {Tuple[np.ndarray, np.ndarray]} Residuals and Jacobian with one
+        column per fitted parameter.
+        """
+        npv, gradient = self.engine.npv_gradient(book)
+        columns = self.engine.gradient_keys + ("v0",)
+        jacobian = gradient[:, [columns.index(name) for name in self.fit]]
+        return weights * (npv - book.quote), weights[:, None] * jacobian
+
+    def stationary(self, r: np.ndarray, J: np.ndarray, scale: float) -> bool:
+        """
+        First-order optimality test of the residuals.
+
+        The fit is stationary when the residuals are within tol of the quotes,
+        or when the cosine between the residuals and every Jacobian column is
+        below sqrt(tol), a scale-free measure of the gradient J^T r.
+
+        @param {np.ndarray} r - Weighted residuals.
+        @param {np.ndarray} J - Jacobian of the residuals.
+        @param {float} scale - Norm of the weighted quotes.
+        @returns {bool} Whether no step can improve the fit.
+        """
+        norm_r = np.linalg.norm(r)
+        if norm_r <= self.tol * scale:
+            return True
+        norm_J = np.linalg.norm(J, axis=0)
+        cosine = np.abs(J.T @ r) / np.maximum(norm_J * norm_r, 1e-300)
+        return bool(np.max(cosine) <= np.sqrt(self.tol))
+
+    def calibrate(self, options: typing.Union[typing.List, OptionBook]) -> typing.Dict:
+        """
+        Fit the engine parameters to the quotes of the options.
+
+        @param {List|OptionBook} options - Quoted options.
+
+        @returns {Dict} Fitted parameters, final cost 0.5 * sum(residuals^2),
+        root-mean-square residual, number of iterations and convergence flag.
+        """
+        book = self.engine._as_book(options)
+        if self.store is not None:
+            key = self.store.key(
+                "calibration",
+                self.engine.fingerprint(),
+                (self.objective, self.fit, self.max_iter, self.tol),
+                [getattr(book, name) for name in book.columns],
+            )
+            entry = self.store.get(key)
+            if entry is not None:
+                self._set(entry["x"])
+                cost, iteration, converged = entry["summary"]
+                return self._result(book, cost, int(iteration), bool(converged))
+
+        weights = self.weights(book)
+        lower = np.array([self.bounds[name][0] for name in self.fit])
+        upper = np.array([self.bounds[name][1] for name in self.fit])
+
+        x = np.clip([getattr(self.engine, name) for name in self.fit], lower, upper)
+        self._set(x)
+        r, J = self.residuals(book, weights)
+        cost = 0.5 * r @ r
+        scale = np.linalg.norm(weights * book.quote)
+        damping = 1e-3
+        # a warm start may already be at the optimum
+        converged = self.stationary(r, J, scale)
+        iteration = 0
+
+        while not converged and iteration < self.max_iter:
+            iteration += 1
+            JtJ = J.T @ J
+            g = J.T @ r
+            diagonal = np.diag(JtJ) + 1e-12
+            step = np.linalg.solve(JtJ + damping * np.diag(diagonal), -g)
+            x_new = np.clip(x + step, lower, upper)
+
+            # prices only: the Jacobian is evaluated once the step is accepted;
+            # trial prices bypass the engine's store, only the fit is stored
+            self._set(x_new)
+            r_new = weights * (self.engine._npv(book) - book.quote)
+            cost_new = 0.5 * r_new @ r_new
+
+            if cost_new < cost:
+                small_step = np.linalg.norm(x_new - x) <= self.tol * (
+                    np.linalg.norm(x) + self.tol
+                )
+                small_gain = cost - cost_new <= self.tol * cost
+                x, cost = x_new, cost_new
+                r, J = self.residuals(book, weights)
+                damping = max(damping / 3.0, 1e-12)
+                converged = small_step or small_gain or self.stationary(r, J, scale)
+            else:
+                damping *= 4.0
+                if damping > 1e12:
+                    # no descent direction left: stalled, not converged
+                    break
+
+        self._set(x)
+        if self.store is not None:
+            summary = np.array([cost, iteration, converged], dtype=np.float64)
+            self.store.put(key, {"x": x, "summary": summary})
+        return self._result(book, cost, iteration, converged)
+
+    def _result(
+        self, book: OptionBook, cost: float, iteration: int, converged: bool
+    ) -> typing.Dict:
+        """
+        Result of a calibration, at the engine's current parameters.
+
+        @param {OptionBook} book - Quoted options.
+        @param {float} cost - Final cost.
+        @param {int} iteration - Number of iterations.
+        @param {bool} converged - Convergence flag.
+        @returns {Dict} See `calibrate`.
+        """
+        return {
+            "params": {name: getattr(self.engine, name) for name in self.params},
+            "cost": float(cost),
+            "rmse": float(np.sqrt(2.0 * cost / max(len(book), 1))),
+            "iterations": iteration,
+            "converged": converged,
+        }
+
+    def _set(self, x: np.ndarray):
+        """
+        Write a vector of fitted parameters to the engine.
+
+        @param {np.ndarray} x - Values of the fitted parameters.
+        """
+        for name, value in zip(self.fit, x):
+            setattr(self.engine, name, float(value))
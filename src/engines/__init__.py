@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from .base import Engine
-from .blackscholes import BlackScholesEngine
-from .heston import HestonEngine
+from .._lazy import attach
 
-__all__ = ["base", 'blackscholes', "heston"]
+__all__ = ["base", "cache", 'blackscholes', "heston", "fft", "cos", "montecarlo"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    __all__,
+    {
+        "Engine": "base",
+        "ChfCache": "cache",
+        "DiskCache": "cache",
+        "BlackScholesEngine": "blackscholes",
+        "HestonEngine": "heston",
+        "HestonFFTEngine": "fft",
+        "HestonCOSEngine": "cos",
+        "MonteCarloHestonEngine": "montecarlo",
+    },
+)
@@ -10,10 +10,17 @@ for implementing any type of financial model.
 __author__ = None
 __copyright__ = None
 
+from ..instruments.option import EuropeanVanillaOption, OptionBook
+from ..instrumentation.base import Stats
 from abc import ABC, abstractmethod
+import contextlib
+import typing
 
 
 class Engine(ABC):
+    # opt-in instrumentation, see `instrument`
+    stats: Stats = None
+
     def __init__(self):
         """
         Constructor method for Engine.
@@ -28,3 +35,44 @@ class Engine(ABC):
         @returns {str} String representation of the engine.
         """
         pass
+
+    @staticmethod
+    def _as_book(options: typing.Union[typing.List, OptionBook]) -> OptionBook:
+        """
+        Return the options as an OptionBook, without copying if they already are one.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {OptionBook} Columnar view of the options.
+        """
+        if isinstance(options, OptionBook):
+            return options
+        assert isinstance(options, (list))
+        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        return OptionBook.from_options(options)
+
+    def instrument(self, callback: typing.Callable = None) -> Stats:
+        """
+        Attach a fresh `Stats` to the engine, enabling its instrumentation.
+
+        Set `engine.stats = None` to disable it again.
+
+        @param {Callable} [callback=None] - Called as callback(event, record) at
+        the end of every instrumented call.
+
+        @returns {Stats} The attached stats.
+        """
+        self.stats = Stats(callback)
+        return self.stats
+
+    def _stage(self, stage: str) -> typing.ContextManager:
+        """
+        Timer of a stage when instrumented, a no-op context otherwise.
+
+        @param {str} stage - Stage name.
+
+        @returns {ContextManager} Context timing the stage.
+        """
+        if self.stats is None:
+            return contextlib.nullcontext()
+        return self.stats.timer(stage)
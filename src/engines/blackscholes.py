@@ -11,13 +11,12 @@ __author__ = None
 __copyright__ = None
 
 
-from py_vollib_vectorized import vectorized_black_scholes
-from py_vollib_vectorized import vectorized_implied_volatility
-from instruments.option import EuropeanVanillaOption
-from py_vollib_vectorized import greeks
-from engines.base import Engine
+from ..instruments.option import OptionBook
+from .base import Engine
 import numpy as np
 import typing
+import scipy
+import time
 
 
 class BlackScholesEngine(Engine):
@@ -27,6 +26,9 @@ class BlackScholesEngine(Engine):
     This class represents an engine for pricing options using the Black-Scholes model.
     """
 
+    # outputs of evaluate; vega and rho are per 1% move, theta per calendar day
+    outputs = ("npv", "delta", "gamma", "vega", "theta", "rho")
+
     def __init__(self, risk_free_rate: float = 0.0, dividend_yield: float = 0.0):
         """
         Constructor method for BlackScholesEngine.
@@ -52,49 +54,107 @@ class BlackScholesEngine(Engine):
         )
         return f"<Model.{self.__class__.__qualname__}({', '.join(params)})>"
 
-    def npv(self, options: typing.List):
+    def evaluate(
+        self,
+        options: typing.Union[typing.List, OptionBook],
+        outputs: typing.Tuple[str, ...] = outputs,
+        out: typing.Dict[str, np.ndarray] = None,
+    ) -> typing.Dict[str, np.ndarray]:
         """
-        Calculate the Net Present Value (NPV) of the options.
+        Price and Greeks of the options in a single pass.
 
-        @param {List} objs - List of option objects.
+        d1, d2, the discount factors, N(+/-d1), N(+/-d2) and the normal density
+        are computed once and shared by every requested output. Rates and
+        dividends are the engine's (Black-Scholes-Merton). Vega and rho are per
+        1% move and theta per calendar day, as in py_vollib.
 
-        @returns {np.ndarray} NPV of the options.
+        @param {List|OptionBook} options - List of option objects or option book.
+        @param {Tuple[str]} [outputs=outputs] - Quantities to compute among "npv",
+        "delta", "gamma", "vega", "theta" and "rho".
+        @param {Dict[str, np.ndarray]} [out=None] - Buffers to write outputs into.
+
+        @returns {Dict[str, np.ndarray]} Requested quantities of the options.
+        """
+        assert all(name in self.outputs for name in outputs)
+        start = None if self.stats is None else time.perf_counter()
+        out = {} if out is None else out
+        book = self._as_book(options)
+        flag = book.flag
+        strike = book.strike
+        s0 = book.s0
+        tau = book.tau
+        sigma = book.sigma
+        r, q = self.risk_free_rate, self.dividend_yield
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sqrt_tau = np.sqrt(tau)
+            vol = sigma * sqrt_tau
+            d1 = (np.log(s0 / strike) + (r - q + 0.5 * sigma * sigma) * tau) / vol
+            d2 = d1 - vol
+
+        forward = s0 * np.exp(-q * tau)
+        discount = strike * np.exp(-r * tau)
+        n_d1 = scipy.special.ndtr(flag * d1)
+        n_d2 = scipy.special.ndtr(flag * d2)
+        density = forward * np.exp(-0.5 * d1 * d1) / np.sqrt(2.0 * np.pi)
+
+        results = {}
+        for name in outputs:
+            buffer = out.get(name)
+            if name == "npv":
+                value = np.multiply(flag, forward * n_d1 - discount * n_d2, out=buffer)
+            elif name == "delta":
+                value = np.multiply(flag * forward / s0, n_d1, out=buffer)
+            elif name == "gamma":
+                value = np.divide(density, s0 * s0 * vol, out=buffer)
+            elif name == "vega":
+                value = np.multiply(density, 0.01 * sqrt_tau, out=buffer)
+            elif name == "theta":
+                value = np.divide(
+                    -0.5 * density * sigma / sqrt_tau
+                    + flag * (q * forward * n_d1 - r * discount * n_d2),
+                    365.0,
+                    out=buffer,
+                )
+            elif name == "rho":
+                value = np.multiply(0.01 * flag * tau * discount, n_d2, out=buffer)
+            results[name] = value
+        if start is not None:
+            self.stats.emit(
+                "evaluate",
+                options=len(book),
+                outputs=tuple(outputs),
+                seconds=time.perf_counter() - start,
+            )
+        return results
+
+    def npv(self, options: typing.Union[typing.List, OptionBook]):
         """
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        Calculate the Net Present Value (NPV) of the options.
 
-        flag_arr = np.array(["c" if option.flag == +1 else "p" for option in options])
-        strike_arr = np.array([float(option.strike) for option in options])
-        s0_arr = np.array([float(option.s0) for option in options])
-        tau_arr = np.array([float(option.tau) for option in options])
-        sigma_arr = np.array([float(option.sigma) for option in options])
+        @param {List|OptionBook} options - List of option objects or option book.
 
-        return vectorized_black_scholes(
-            flag_arr,
-            s0_arr,
-            strike_arr,
-            tau_arr,
-            self.risk_free_rate,
-            sigma_arr,
-            return_as="numpy",
-        )
+        @returns {np.ndarray} NPV of the options.
+        """
+        return self.evaluate(options, ("npv",))["npv"]
 
-    def implied_volatility(self, options: typing.List):
+    def implied_volatility(self, options: typing.Union[typing.List, OptionBook]):
         """
         Calculate the implied volatility of the options.
 
-        @param {List} options - List of option objects.
+        @param {List|OptionBook} options - List of option objects or option book.
 
         @returns {np.ndarray} Implied volatility of the options.
         """
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        # deferred: importing py_vollib_vectorized compiles its Numba kernels
+        from py_vollib_vectorized import vectorized_implied_volatility
 
-        flag_arr = np.array(["c" if option.flag == +1 else "p" for option in options])
-        strike_arr = np.array([float(option.strike) for option in options])
-        s0_arr = np.array([float(option.s0) for option in options])
-        tau_arr = np.array([float(option.tau) for option in options])
-        quote_arr = np.array([float(option.quote) for option in options])
+        book = self._as_book(options)
+        flag_arr = book.flag_s
+        strike_arr = book.strike
+        s0_arr = book.s0
+        tau_arr = book.tau
+        quote_arr = book.quote
 
         return vectorized_implied_volatility(
             quote_arr,
@@ -108,89 +168,32 @@ class BlackScholesEngine(Engine):
             return_as="numpy",
         )
 
-    def delta(self, options: typing.List):
+    def delta(self, options: typing.Union[typing.List, OptionBook]):
         """
         Calculate the delta of the options.
 
-        @param {List} options - List of option objects.
+        @param {List|OptionBook} options - List of option objects or option book.
 
         @returns {np.ndarray} Delta of the options.
         """
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        return self.evaluate(options, ("delta",))["delta"]
 
-        flag_arr = np.array(["c" if option.flag == +1 else "p" for option in options])
-        strike_arr = np.array([float(option.strike) for option in options])
-        s0_arr = np.array([float(option.s0) for option in options])
-        tau_arr = np.array([float(option.tau) for option in options])
-        sigma_arr = np.array([float(option.sigma) for option in options])
-
-        return greeks.delta(
-            flag_arr,
-            s0_arr,
-            strike_arr,
-            tau_arr,
-            0.025,
-            sigma_arr,
-            q=None,
-            model="black_scholes",
-            return_as="numpy",
-        )
-
-    def gamma(self, options: typing.List):
+    def gamma(self, options: typing.Union[typing.List, OptionBook]):
         """
         Calculate the gamma of the options.
 
-        @param {List} options - List of option objects.
+        @param {List|OptionBook} options - List of option objects or option book.
 
         @returns {np.ndarray} Gamma of the options.
         """
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        return self.evaluate(options, ("gamma",))["gamma"]
 
-        flag_arr = np.array(["c" if option.flag == +1 else "p" for option in options])
-        strike_arr = np.array([float(option.strike) for option in options])
-        s0_arr = np.array([float(option.s0) for option in options])
-        tau_arr = np.array([float(option.tau) for option in options])
-        sigma_arr = np.array([float(option.sigma) for option in options])
-
-        return greeks.gamma(
-            flag_arr,
-            s0_arr,
-            strike_arr,
-            tau_arr,
-            0.025,
-            sigma_arr,
-            q=None,
-            model="black_scholes",
-            return_as="numpy",
-        )
-
-    def vega(self, options: typing.List):
+    def vega(self, options: typing.Union[typing.List, OptionBook]):
         """
         Calculate the vega of the options.
 
-        @param {List} options - List of option objects.
+        @param {List|OptionBook} options - List of option objects or option book.
 
         @returns {np.ndarray} Vega of the options.
         """
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
-
-        flag_arr = np.array(["c" if option.flag == +1 else "p" for option in options])
-        strike_arr = np.array([float(option.strike) for option in options])
-        s0_arr = np.array([float(option.s0) for option in options])
-        tau_arr = np.array([float(option.tau) for option in options])
-        sigma_arr = np.array([float(option.sigma) for option in options])
-
-        return greeks.vega(
-            flag_arr,
-            s0_arr,
-            strike_arr,
-            tau_arr,
-            0.025,
-            sigma_arr,
-            q=None,
-            model="black_scholes",
-            return_as="numpy",
-        )
+        return self.evaluate(options, ("vega",))["vega"]
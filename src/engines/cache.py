@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides caches shared by the pricing engines.
+It contains the class `ChfCache`, an in-memory LRU store for the
+maturity-dependent terms of characteristic functions, and the class
+`DiskCache`, a persistent content-addressed store of priced results.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from collections import OrderedDict
+import numpy as np
+import threading
+import tempfile
+import hashlib
+import sqlite3
+import typing
+import shutil
+import json
+import time
+import os
+
+
+class ChfCache(object):
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 256 * 2**20):
+        """
+        ChfCache class, a least-recently-used store of characteristic function terms.
+
+        Entries are tuples of NumPy arrays; the least recently used ones are
+        evicted as soon as either limit is exceeded.
+
+        @param {int} [max_entries=4096] - Maximum number of entries.
+        @param {int} [max_bytes=256MiB] - Maximum total size of the stored arrays.
+        """
+        assert max_entries > 0 and max_bytes > 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the ChfCache.
+
+        @returns {str} String representation of the cache.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }.items()
+        )
+        return f"<Cache.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: typing.Hashable) -> typing.Optional[typing.Tuple]:
+        """
+        Look up an entry, marking it as most recently used.
+
+        @param {Hashable} key - Entry key.
+        @returns {Tuple|None} Stored arrays, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: typing.Hashable, entry: typing.Tuple[np.ndarray, ...]):
+        """
+        Store an entry and evict least recently used ones beyond the limits.
+
+        @param {Hashable} key - Entry key.
+        @param {Tuple} entry - Arrays to store.
+        """
+        if key in self._entries:
+            self.nbytes -= sum(a.nbytes for a in self._entries.pop(key))
+        self._entries[key] = entry
+        self.nbytes += sum(a.nbytes for a in entry)
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= sum(a.nbytes for a in evicted)
+
+    def clear(self):
+        """
+        Drop every entry; the hit and miss counters are kept.
+        """
+        self._entries.clear()
+        self.nbytes = 0
+
+
+class DiskCache(object):
+    def __init__(self, path: str, max_bytes: int = 2**30):
+        """
+        DiskCache class, a persistent least-recently-used store of priced results.
+
+        Entries are dicts of NumPy arrays under a content key, see `key`: each one
+        is a directory of .npy files, read back memory-mapped, and a SQLite index
+        in the same directory records their sizes and last access times. Several
+        processes may share a directory: entries are written to a temporary
+        directory and renamed into place, so readers never see a partial one.
+        The least recently used entries are evicted once the total size exceeds
+        the limit. A pickled cache reopens its directory when unpickled, so
+        engines holding one can be sent to worker processes.
+
+        @param {str} path - Directory of the cache, created if missing.
+        @param {int} [max_bytes=1GiB] - Maximum total size of the stored files.
+        """
+        assert max_bytes > 0
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._open()
+
+    def _open(self):
+        """
+        Create the directory if missing and connect to its index.
+        """
+        os.makedirs(os.path.join(self.path, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.path, "index.sqlite"),
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+            "names TEXT NOT NULL, nbytes INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the DiskCache.
+
+        @returns {str} String representation of the cache.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "path": self.path,
+                "entries": len(self),
+                "nbytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }.items()
+        )
+        return f"<Cache.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def __getstate__(self) -> typing.Dict:
+        # the connection and the lock are per process, reopened from the path
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __setstate__(self, state: typing.Dict):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            query = "SELECT 1 FROM entries WHERE key = ?"
+            return self._db.execute(query, (key,)).fetchone() is not None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of the stored files, in bytes.
+        """
+        with self._lock:
+            query = "SELECT COALESCE(SUM(nbytes), 0) FROM entries"
+            return self._db.execute(query).fetchone()[0]
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Content key of an entry: the SHA-256 digest of its inputs.
+
+        Arrays are hashed by dtype, shape and bytes, tuples, lists and dicts
+        recursively, and other values by their repr, so equal inputs give equal
+        keys across processes.
+
+        @param {Any} parts - Inputs of the entry, e.g. a name, the engine
+        settings and the columns of a book.
+
+        @returns {str} Hexadecimal digest.
+        """
+
+        def update(part):
+            if isinstance(part, np.ndarray):
+                part = np.ascontiguousarray(part)
+                digest.update(f"array:{part.dtype.str}:{part.shape}:".encode())
+                digest.update(part.tobytes())
+            elif isinstance(part, (tuple, list)):
+                digest.update(f"{type(part).__name__}:{len(part)}:".encode())
+                for item in part:
+                    update(item)
+            elif isinstance(part, dict):
+                digest.update(f"dict:{len(part)}:".encode())
+                for name in sorted(part):
+                    update(name)
+                    update(part[name])
+            else:
+                if isinstance(part, np.generic):
+                    part = part.item()
+                digest.update(f"{type(part).__name__}:{part!r};".encode())
+
+        digest = hashlib.sha256()
+        for part in parts:
+            update(part)
+        return digest.hexdigest()
+
+    def _folder(self, key: str) -> str:
+        return os.path.join(self.path, "objects", key[:2], key)
+
+    def get(self, key: str) -> typing.Optional[typing.Dict[str, np.ndarray]]:
+        """
+        Look up an entry, marking it as most recently used.
+
+        @param {str} key - Entry key.
+        @returns {Dict[str, np.ndarray]|None} Stored arrays, memory-mapped
+        read-only, or None on a miss.
+        """
+        with self._lock:
+            query = "SELECT names FROM entries WHERE key = ?"
+            row = self._db.execute(query, (key,)).fetchone()
+            entry = None if row is None else self._load(key, json.loads(row[0]))
+            if entry is None:
+                self.misses += 1
+                return None
+            query = "UPDATE entries SET accessed = ? WHERE key = ?"
+            self._db.execute(query, (time.time(), key))
+            self.hits += 1
+            return entry
+
+    def _load(
+        self, key: str, names: typing.List[str]
+    ) -> typing.Optional[typing.Dict[str, np.ndarray]]:
+        """
+        Read the arrays of an entry, or None if its files are gone.
+
+        @param {str} key - Entry key.
+        @param {List[str]} names - Names of the arrays.
+        @returns {Dict[str, np.ndarray]|None} Stored arrays.
+        """
+        entry = {}
+        for name in names:
+            file = os.path.join(self._folder(key), f"{name}.npy")
+            try:
+                entry[name] = np.load(file, mmap_mode="r")
+            except ValueError:
+                # empty arrays cannot be mapped
+                entry[name] = np.load(file)
+            except FileNotFoundError:
+                # evicted by another process since the lookup
+                return None
+        return entry
+
+    def put(self, key: str, entry: typing.Dict[str, np.ndarray]):
+        """
+        Store an entry and evict least recently used ones beyond the limit.
+
+        @param {str} key - Entry key.
+        @param {Dict[str, np.ndarray]} entry - Numeric arrays to store.
+        """
+        folder = self._folder(key)
+        os.makedirs(os.path.dirname(folder), exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".put-", dir=os.path.dirname(folder))
+        nbytes = 0
+        for name, array in entry.items():
+            file = os.path.join(staging, f"{name}.npy")
+            np.save(file, np.asarray(array), allow_pickle=False)
+            nbytes += os.path.getsize(file)
+        shutil.rmtree(folder, ignore_errors=True)
+        try:
+            os.rename(staging, folder)
+        except OSError:
+            # stored concurrently by another process, with the same content
+            shutil.rmtree(staging, ignore_errors=True)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(entry)), nbytes, time.time()),
+            )
+            self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        """
+        Drop least recently used entries until the total size fits the limit.
+
+        @param {str} keep - Key of the entry just stored, never evicted.
+        """
+        query = "SELECT COALESCE(SUM(nbytes), 0) FROM entries"
+        total = self._db.execute(query).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        query = "SELECT key, nbytes FROM entries WHERE key != ? ORDER BY accessed"
+        for key, nbytes in self._db.execute(query, (keep,)).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            shutil.rmtree(self._folder(key), ignore_errors=True)
+            total -= nbytes
+
+    def clear(self):
+        """
+        Drop every entry; the hit and miss counters are kept.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            shutil.rmtree(os.path.join(self.path, "objects"), ignore_errors=True)
+            os.makedirs(os.path.join(self.path, "objects"), exist_ok=True)
+
+    def close(self):
+        """
+        Close the index; the stored entries are kept on disk.
+        """
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining Heston COS engine.
+This class inherit methods from the parent class `HestonEngine`,
+providing Fourier-cosine (Fang-Oosterlee) pricing of strike vectors.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..instruments.option import OptionBook
+from ..backends.base import Backend
+from .heston import HestonEngine
+from .cache import DiskCache
+import numpy as np
+import typing
+import time
+
+
+class HestonCOSEngine(HestonEngine):
+
+    """
+    Heston COS Engine Class
+
+    This class represents an engine pricing options with the COS method: the
+    density of log(S_T / s0) is expanded on a fixed number of cosine terms over
+    a range given by the Heston cumulants, and all strikes sharing a maturity
+    are priced by one matrix-vector product.
+    """
+
+    # attributes determining the results kept in a disk store
+    store_keys = HestonEngine.cache_keys + ("s0", "mu", "n_terms", "truncation")
+
+    def __init__(
+        self,
+        theta: float,
+        kappa: float,
+        sigma: float,
+        rho: float,
+        phi: float,
+        v0: float,
+        s0: float,
+        mu: float = 0.0,
+        risk_free_rate: float = 0.0,
+        dividend_yield: float = 0.0,
+        n_terms: int = 256,
+        truncation: float = 16.0,
+        backend: typing.Union[str, Backend] = "numpy",
+        store: DiskCache = None,
+    ):
+        """
+        Constructor method for HestonCOSEngine.
+
+        @param {float} theta - Heston model parameter.
+        @param {float} kappa - Heston model parameter.
+        @param {float} sigma - Heston model parameter.
+        @param {float} rho - Heston model parameter.
+        @param {float} phi - Heston model parameter.
+        @param {float} v0 - Initial volatility.
+        @param {float} s0 - Initial asset price.
+        @param {float} [mu=0.0] - Drift term.
+        @param {float} [risk_free_rate=0.0] - Risk-free interest rate.
+        @param {float} [dividend_yield=0.0] - Dividend yield.
+        @param {int} [n_terms=256] - Number of cosine terms.
+        @param {float} [truncation=16.0] - Width of the integration range in
+        standard deviations (sqrt of the second cumulant).
+        @param {str|Backend} [backend="numpy"] - Compute backend of the chf terms
+        and path steps, see `backends.get_backend`.
+        @param {DiskCache} [store=None] - Opt-in persistent store `npv` reads
+        through, shared by every engine with the same `fingerprint`.
+        """
+        super().__init__(
+            theta=theta,
+            kappa=kappa,
+            sigma=sigma,
+            rho=rho,
+            phi=phi,
+            v0=v0,
+            s0=s0,
+            mu=mu,
+            risk_free_rate=risk_free_rate,
+            dividend_yield=dividend_yield,
+            backend=backend,
+            store=store,
+        )
+        assert n_terms > 0 and truncation > 0.0
+
+        # cos settings
+        self.n_terms = n_terms
+        self.truncation = truncation
+
+    def cumulants(self, tau, v0) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        First and second cumulants of log(S_T / s0).
+
+        Uses the second cumulant of Le Floc'h (2018), which corrects the one of
+        Fang-Oosterlee (2008). The deterministic displacement phi adds
+        -phi * tau / 2 to the mean and phi * tau to the variance.
+
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {float|np.ndarray} v0 - Initial variance.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Cumulants c1 and c2.
+        """
+        kappa, theta, sigma, rho = self.kappa, self.theta, self.sigma, self.rho
+        e = np.exp(-kappa * tau)
+        rho_sigma_tau = rho * sigma * tau
+        c1 = (
+            (self.risk_free_rate - self.dividend_yield) * tau
+            + (1.0 - e) * (theta - v0) / (2.0 * kappa)
+            - 0.5 * theta * tau
+            - 0.5 * self.phi * tau
+        )
+        c2 = (
+            v0
+            / (4.0 * kappa**3)
+            * (
+                4.0 * kappa**2 * (1.0 + (rho_sigma_tau - 1.0) * e)
+                + kappa * (4.0 * rho * sigma * (e - 1.0) - 2.0 * sigma**2 * tau * e)
+                + sigma**2 * (1.0 - e * e)
+            )
+            + theta
+            / (8.0 * kappa**3)
+            * (
+                8.0 * kappa**3 * tau
+                - 8.0 * kappa**2 * (1.0 + rho_sigma_tau + (rho_sigma_tau - 1.0) * e)
+                + 2.0
+                * kappa
+                * ((1.0 + 2.0 * e) * sigma**2 * tau + 8.0 * (1.0 - e) * rho * sigma)
+                + sigma**2 * (e * e + 4.0 * e - 5.0)
+            )
+            + self.phi * tau
+        )
+        return c1, c2
+
+    def coefficients(self, tau: float, v0: float, x: np.ndarray):
+        """
+        Truncation range and weighted cosine coefficients of a put for one maturity.
+
+        The range covers log(S_T / K) for every log-moneyness in `x`, so all the
+        strikes of the maturity share the same coefficients.
+
+        @param {float} tau - Time to expiration.
+        @param {float} v0 - Initial variance.
+        @param {np.ndarray} x - Log-moneyness log(s0 / K) of the options.
+
+        @returns {Tuple[float, np.ndarray, np.ndarray]} Lower bound a, frequencies
+        u_k and coefficients such that put / (K exp(-r tau)) equals
+        Re(exp(i u_k (x - a)) @ coefficients) with x = log(s0 / K).
+        """
+        c1, c2 = self.cumulants(tau, v0)
+        width = self.truncation * np.sqrt(np.abs(c2))
+        a = min(c1 + np.min(x) - width, -1e-8)
+        b = max(c1 + np.max(x) + width, 1e-8)
+
+        k = np.arange(self.n_terms)
+        u = k * np.pi / (b - a)
+
+        # put payoff coefficients on [a, 0]
+        chi = (np.cos(-u * a) - np.exp(a) + u * np.sin(-u * a)) / (1.0 + u * u)
+        psi = np.empty(self.n_terms)
+        psi[0] = -a
+        psi[1:] = np.sin(-u[1:] * a) / u[1:]
+        payoff = 2.0 / (b - a) * (psi - chi)
+
+        coefficients = self.chf(tau, 1.0, v0, u, 2) * payoff
+        coefficients[0] *= 0.5
+        return a, u, coefficients
+
+    def _npv(self, book: OptionBook) -> np.ndarray:
+        """
+        Net Present Value (NPV) of the options, bypassing the store.
+
+        @param {OptionBook} book - Option book.
+
+        @returns {np.ndarray} NPV of the options.
+        """
+        start = None if self.stats is None else time.perf_counter()
+        v0 = np.where(np.isnan(book.v0), self.v0, book.v0)
+
+        keys, inverse = np.unique(
+            np.stack([book.tau, v0], axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        x = np.log(book.s0 / book.strike)
+
+        put = np.empty(len(book))
+        for g, (tau, v0_g) in enumerate(keys):
+            idx = np.flatnonzero(inverse == g)
+            a, u, coefficients = self.coefficients(tau, v0_g, x[idx])
+            put[idx] = np.real(np.exp(1j * np.outer(x[idx] - a, u)) @ coefficients)
+
+        discount = book.strike * np.exp(-self.risk_free_rate * book.tau)
+        put *= discount
+        spot = book.s0 * np.exp(-self.dividend_yield * book.tau)
+        npv = np.where(book.flag == 1, put + spot - discount, put)
+        if start is not None:
+            self.stats.emit(
+                "npv", options=len(book), seconds=time.perf_counter() - start
+            )
+        return npv
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining Heston FFT engine.
+This class inherit methods from the parent class `HestonEngine`,
+providing Carr-Madan pricing of whole strike grids per maturity.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..instruments.option import OptionBook
+from ..backends.base import Backend
+from .heston import HestonEngine
+from .cache import DiskCache
+import numpy as np
+import typing
+import time
+
+
+class HestonFFTEngine(HestonEngine):
+
+    """
+    Heston FFT Engine Class
+
+    This class represents an engine pricing options with the Carr-Madan FFT
+    method: every unique (tau, s0, v0) of the book is priced on a full
+    log-strike grid with one FFT and interpolated onto the requested strikes.
+    """
+
+    # attributes determining the results kept in a disk store
+    store_keys = HestonEngine.cache_keys + ("s0", "mu", "alpha", "n_grid", "eta")
+
+    def __init__(
+        self,
+        theta: float,
+        kappa: float,
+        sigma: float,
+        rho: float,
+        phi: float,
+        v0: float,
+        s0: float,
+        mu: float = 0.0,
+        risk_free_rate: float = 0.0,
+        dividend_yield: float = 0.0,
+        alpha: float = 1.5,
+        n_grid: int = 4096,
+        eta: float = 0.25,
+        backend: typing.Union[str, Backend] = "numpy",
+        store: DiskCache = None,
+    ):
+        """
+        Constructor method for HestonFFTEngine.
+
+        @param {float} theta - Heston model parameter.
+        @param {float} kappa - Heston model parameter.
+        @param {float} sigma - Heston model parameter.
+        @param {float} rho - Heston model parameter.
+        @param {float} phi - Heston model parameter.
+        @param {float} v0 - Initial volatility.
+        @param {float} s0 - Initial asset price.
+        @param {float} [mu=0.0] - Drift term.
+        @param {float} [risk_free_rate=0.0] - Risk-free interest rate.
+        @param {float} [dividend_yield=0.0] - Dividend yield.
+        @param {float} [alpha=1.5] - Damping factor of the call price.
+        @param {int} [n_grid=4096] - Number of FFT points, a power of two.
+        @param {float} [eta=0.25] - Spacing of the frequency grid; the log-strike
+        spacing is 2 * pi / (n_grid * eta).
+        @param {str|Backend} [backend="numpy"] - Compute backend of the chf terms
+        and path steps, see `backends.get_backend`.
+        @param {DiskCache} [store=None] - Opt-in persistent store `npv` reads
+        through, shared by every engine with the same `fingerprint`.
+        """
+        super().__init__(
+            theta=theta,
+            kappa=kappa,
+            sigma=sigma,
+            rho=rho,
+            phi=phi,
+            v0=v0,
+            s0=s0,
+            mu=mu,
+            risk_free_rate=risk_free_rate,
+            dividend_yield=dividend_yield,
+            backend=backend,
+            store=store,
+        )
+        assert alpha > 0.0 and eta > 0.0
+        assert n_grid > 0 and n_grid & (n_grid - 1) == 0
+
+        # fft settings
+        self.alpha = alpha
+        self.n_grid = n_grid
+        self.eta = eta
+
+    def grid(
+        self, tau: np.ndarray, s0: np.ndarray, v0: np.ndarray
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Call prices on the FFT log-strike grid, one row per (tau, s0, v0).
+
+        The grid of each row is centred on log(s0).
+
+        @param {np.ndarray} tau - Times to expiration.
+        @param {np.ndarray} s0 - Initial asset prices.
+        @param {np.ndarray} v0 - Initial variances.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} First log-strike of each row and
+        call prices of shape (len(tau), n_grid).
+        """
+        tau = np.asarray(tau, dtype=np.float64)[:, None]
+        s0 = np.asarray(s0, dtype=np.float64)[:, None]
+        v0 = np.asarray(v0, dtype=np.float64)[:, None]
+
+        n = np.arange(self.n_grid)
+        v = self.eta * n
+        lambda_ = 2.0 * np.pi / (self.n_grid * self.eta)
+        k_0 = np.log(s0) - 0.5 * self.n_grid * lambda_
+
+        # damped call transform (Carr-Madan) with Simpson weights
+        alpha = self.alpha
+        psi = (
+            np.exp(-self.risk_free_rate * tau)
+            * self.chf(tau, s0, v0, v - (alpha + 1.0) * 1j, 2)
+            / (alpha * alpha + alpha - v * v + 1j * (2.0 * alpha + 1.0) * v)
+        )
+        simpson = (3.0 + (-1.0) ** (n + 1)) / 3.0
+        simpson[0] = 1.0 / 3.0
+        x = np.exp(-1j * k_0 * v) * psi * self.eta * simpson
+
+        calls = np.real(np.fft.fft(x, axis=1))
+        calls *= np.exp(-alpha * (k_0 + lambda_ * n)) / np.pi
+        return k_0[:, 0], calls
+
+    def _npv(self, book: OptionBook) -> np.ndarray:
+        """
+        Net Present Value (NPV) of the options, bypassing the store.
+
+        @param {OptionBook} book - Option book.
+
+        @returns {np.ndarray} NPV of the options.
+        """
+        start = None if self.stats is None else time.perf_counter()
+        v0 = np.where(np.isnan(book.v0), self.v0, book.v0)
+
+        keys, inverse = np.unique(
+            np.stack([book.tau, book.s0, v0], axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        k_0, calls = self.grid(keys[:, 0], keys[:, 1], keys[:, 2])
+
+        # cubic (4-point Lagrange) interpolation on the uniform log-strike grid
+        lambda_ = 2.0 * np.pi / (self.n_grid * self.eta)
+        x = (np.log(book.strike) - k_0[inverse]) / lambda_
+        i = np.clip(np.floor(x).astype(np.int64), 1, self.n_grid - 3)
+        t = x - i
+        call = (
+            -t * (t - 1.0) * (t - 2.0) / 6.0 * calls[inverse, i - 1]
+            + (t + 1.0) * (t - 1.0) * (t - 2.0) / 2.0 * calls[inverse, i]
+            - (t + 1.0) * t * (t - 2.0) / 2.0 * calls[inverse, i + 1]
+            + (t + 1.0) * t * (t - 1.0) / 6.0 * calls[inverse, i + 2]
+        )
+
+        discount = book.strike * np.exp(-self.risk_free_rate * book.tau)
+        spot = book.s0 * np.exp(-self.dividend_yield * book.tau)
+        npv = np.where(book.flag == 1, call, call - spot + discount)
+        if start is not None:
+            self.stats.emit(
+                "npv", options=len(book), seconds=time.perf_counter() - start
+            )
+        return npv
@@ -11,12 +11,14 @@ __author__ = None
 __copyright__ = None
 
 
-from instruments.option import EuropeanVanillaOption
-from scipy.integrate import quad_vec
-from engines.base import Engine
+from ..backends import Backend, get_backend
+from ..instruments.option import OptionBook
+from .cache import ChfCache, DiskCache
+from .base import Engine
 import numpy as np
-import cmath
 import typing
+import scipy
+import time
 
 
 class HestonEngine(Engine):
@@ -27,6 +29,30 @@ class HestonEngine(Engine):
     This class represents an engine for pricing options using the Heston model.
     """
 
+    # parameters of chf_gradient, in order
+    gradient_keys = ("kappa", "theta", "sigma", "rho", "phi")
+
+    # attributes whose change invalidates the characteristic function cache
+    cache_keys = (
+        "kappa",
+        "theta",
+        "sigma",
+        "rho",
+        "phi",
+        "v0",
+        "risk_free_rate",
+        "dividend_yield",
+    )
+
+    # attributes determining the results kept in a disk store
+    store_keys = cache_keys + (
+        "s0",
+        "mu",
+        "integration",
+        "n_nodes",
+        "upper",
+    )
+
     def __init__(
         self,
         theta: float,
@@ -39,6 +65,12 @@ class HestonEngine(Engine):
         mu: float = 0.0,
         risk_free_rate: float = 0.0,
         dividend_yield: float = 0.0,
+        integration: str = "quad_vec",
+        n_nodes: int = 128,
+        upper: float = 500.0,
+        cache: ChfCache = None,
+        backend: typing.Union[str, Backend] = "numpy",
+        store: DiskCache = None,
     ):
         """
         Constructor method for HestonEngine.
@@ -53,7 +85,19 @@ class HestonEngine(Engine):
         @param {float} [mu=0.0] - Drift term.
         @param {float} [risk_free_rate=0.0] - Risk-free interest rate.
         @param {float} [dividend_yield=0.0] - Dividend yield.
+        @param {str} [integration="quad_vec"] - Fourier integration mode: "quad_vec"
+        (adaptive), "laguerre" or "legendre" (fixed nodes).
+        @param {int} [n_nodes=128] - Number of nodes of the fixed-node modes.
+        @param {float} [upper=500.0] - Truncation of the integral in "legendre" mode.
+        @param {ChfCache} [cache=None] - Opt-in cache of the chf terms used by the
+        fixed-node modes.
+        @param {str|Backend} [backend="numpy"] - Compute backend of the chf terms
+        and path steps, see `backends.get_backend`.
+        @param {DiskCache} [store=None] - Opt-in persistent store `npv` reads
+        through, shared by every engine with the same `fingerprint`.
         """
+        assert integration in ("quad_vec", "laguerre", "legendre")
+
         # Heston++ params
         self.dividend_yield = dividend_yield
         self.risk_free_rate = risk_free_rate
@@ -66,6 +110,28 @@ class HestonEngine(Engine):
         self.s0 = s0
         self.v0 = v0
 
+        # integration settings
+        self.integration = integration
+        self.n_nodes = n_nodes
+        self.upper = upper
+        self._nodes = {}
+        self.cache = cache
+        self.backend = get_backend(backend)
+        self.store = store
+
+    def __setattr__(self, name: str, value):
+        """
+        Set an attribute, clearing the chf cache when a model parameter changes.
+
+        @param {str} name - Attribute name.
+        @param {Any} value - Attribute value.
+        """
+        if name in self.cache_keys:
+            cache = self.__dict__.get("cache")
+            if cache is not None and self.__dict__.get(name) != value:
+                cache.clear()
+        super().__setattr__(name, value)
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the Heston model.
@@ -87,79 +153,637 @@ class HestonEngine(Engine):
         )
         return f"<Engine.{self.__class__.__qualname__}({', '.join(params)})>"
 
-    def chf(self, tau, s0, v0, z, j):
+    def fingerprint(self) -> typing.Tuple:
         """
-        Characteristic function of the Heston model.
+        Settings determining the engine's prices, the engine part of disk keys.
+
+        @returns {Tuple} Class name and (name, value) pairs of `store_keys`.
+        """
+        return (self.__class__.__qualname__,) + tuple(
+            (name, getattr(self, name)) for name in self.store_keys
+        )
+
+    def chf_terms(self, tau, z, j) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Maturity-dependent terms of the characteristic function.
+
+        The characteristic function is exp(C + D * v0 + i * z * log(s0)), so C
+        and D do not depend on s0 nor v0. They are computed by the engine's
+        backend in the "little Heston trap" formulation (Albrecher et al., 2007):
+        with Re(d) >= 0 the terms only involve exp(-d * tau), which stays bounded
+        and keeps the logarithm on its principal branch for long maturities.
 
         @param {float|np.ndarray} tau - Time to expiration.
-        @param {float|np.ndarray} s0 - Initial asset price.
-        @param {float|np.ndarray} v0 - Initial volatility.
-        @param {complex} z - Complex number.
-        @param {int} j - Index.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Terms C and D, broadcast over
+        tau, z and j.
+        """
+        if self.stats is not None:
+            self.stats.count("chf_evaluations", np.broadcast(tau, z, j).size)
+        return self.backend.chf_terms(self, tau, z, j)
+
+    def chf_gradient(self, tau, z, j):
+        """
+        Terms of the characteristic function with their analytic parameter gradients.
+
+        Forward-mode differentiation of `chf_terms` with respect to kappa, theta,
+        sigma, rho and phi (see `gradient_keys`); the v0 derivative of the
+        characteristic function is D itself.
+
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
 
-        @returns {complex} Characteristic function value.
+        @returns {Tuple[np.ndarray, ...]} Terms C and D and their gradients dC and
+        dD, stacked on a leading axis of length 5.
         """
-        w = 1.0 if j == 1 else -1
-        b = self.kappa - self.rho * self.sigma if j == 1 else self.kappa
-        ixi = 1j * z
+        if self.stats is not None:
+            self.stats.count("chf_evaluations", np.broadcast(tau, z, j).size)
+        one_j = np.where(j == 1, 1.0, 0.0)
+        w = np.where(j == 1, 1.0, -1.0)
+        b = self.kappa - self.rho * self.sigma * one_j
+        ixi = 1j * np.asarray(z)
         rho_sigma = self.rho * self.sigma
         sigma_2 = self.sigma * self.sigma
+        e = w * ixi + ixi * ixi
         c = rho_sigma * ixi - b
-        d = cmath.sqrt(c * c - sigma_2 * (w * ixi - z * z))
-        b_m = b - rho_sigma * ixi - d
-        b_p = b - rho_sigma * ixi + d
+        d = np.sqrt(c * c - sigma_2 * e)
+        b_m = -c - d
+        b_p = b_m + 2.0 * d
         g = b_m / b_p
-        ee = cmath.e ** (-d * tau)
-        C = (
-            0.5 * z * (w * 1j - z) * (self.phi * tau)
-            + self.risk_free_rate * ixi * tau
-            + self.kappa
-            * self.theta
-            / sigma_2
-            * (b_m * tau - 2.0 * np.log((1.0 - g * ee) / (1.0 - g)))
+        ee = np.exp(-d * tau)
+        one_g_ee = 1.0 - g * ee
+        A = self.kappa * self.theta / sigma_2
+        L = np.log(one_g_ee / (1.0 - g))
+        Q = (1.0 - ee) / one_g_ee
+        drift = self.risk_free_rate - self.dividend_yield
+        C = 0.5 * e * (self.phi * tau) + drift * ixi * tau
+        C = C + A * (b_m * tau - 2.0 * L)
+        D = (b_m / sigma_2) * Q
+
+        shape = (5,) + np.broadcast_shapes(C.shape, np.shape(one_j))
+
+        def stack(*xs):
+            return np.stack([np.broadcast_to(x, shape[1:]) for x in xs])
+
+        # seeds: derivatives of b, rho * sigma, sigma^2, A and phi
+        d_b = stack(1.0, 0.0, -self.rho * one_j, -self.sigma * one_j, 0.0)
+        d_rho_sigma = stack(0.0, 0.0, self.rho, self.sigma, 0.0)
+        d_sigma_2 = stack(0.0, 0.0, 2.0 * self.sigma, 0.0, 0.0)
+        d_A = stack(
+            self.theta / sigma_2, self.kappa / sigma_2, -2.0 * A / self.sigma, 0.0, 0.0
+        )
+        d_phi = stack(0.0, 0.0, 0.0, 0.0, 1.0)
+
+        d_c = d_rho_sigma * ixi - d_b
+        d_d = (c * d_c - 0.5 * d_sigma_2 * e) / d
+        d_b_m = -d_c - d_d
+        d_b_p = -d_c + d_d
+        d_g = (d_b_m * b_p - b_m * d_b_p) / (b_p * b_p)
+        d_ee = -tau * d_d * ee
+        d_g_ee = d_g * ee + g * d_ee
+        d_L = d_g / (1.0 - g) - d_g_ee / one_g_ee
+        d_Q = (-d_ee * one_g_ee + (1.0 - ee) * d_g_ee) / (one_g_ee * one_g_ee)
+        dC = 0.5 * e * tau * d_phi + d_A * (b_m * tau - 2.0 * L)
+        dC += A * (d_b_m * tau - 2.0 * d_L)
+        dD = (d_b_m - b_m * d_sigma_2 / sigma_2) / sigma_2 * Q + b_m / sigma_2 * d_Q
+        return C, D, dC, dD
+
+    def chf(self, tau, s0, v0, z, j, out: np.ndarray = None):
+        """
+        Characteristic function of the Heston model.
+
+        Inputs broadcast against each other following NumPy rules.
+
+        @param {float|np.ndarray} tau - Time to expiration.
+        @param {float|np.ndarray} s0 - Initial asset price.
+        @param {float|np.ndarray} v0 - Initial volatility.
+        @param {complex|np.ndarray} z - Complex number.
+        @param {int|np.ndarray} j - Index, 1 or 2.
+        @param {np.ndarray} [out=None] - Preallocated complex buffer of the
+        broadcast shape.
+
+        @returns {complex|np.ndarray} Characteristic function value.
+        """
+        C, D = self.chf_terms(tau, z, j)
+        ixi_log_s0 = 1j * np.asarray(z) * np.log(s0)
+        if out is None:
+            out = np.empty(
+                np.broadcast_shapes(C.shape, np.shape(v0), ixi_log_s0.shape),
+                dtype=np.complex128,
+            )
+        np.multiply(D, v0, out=out)
+        out += C
+        out += ixi_log_s0
+        return np.exp(out, out=out)[()]
+
+    def chf_tensor(self, z, tau, v0, s0: float = None, j=2, out: np.ndarray = None):
+        """
+        Characteristic function on the outer grid of frequencies, maturities and
+        initial variances.
+
+        C and D are evaluated once on the (n_z, n_tau) grid; the v0 axis is then
+        a broadcast multiplication.
+
+        @param {np.ndarray} z - Frequencies, shape (n_z,).
+        @param {np.ndarray} tau - Times to expiration, shape (n_tau,).
+        @param {np.ndarray} v0 - Initial variances, shape (n_v0,).
+        @param {float} [s0=None] - Initial asset price, defaults to the engine's.
+        @param {int} [j=2] - Index, 1 or 2.
+        @param {np.ndarray} [out=None] - Preallocated complex buffer of shape
+        (n_z, n_tau, n_v0).
+
+        @returns {np.ndarray} Characteristic function values, shape (n_z, n_tau, n_v0).
+        """
+        z = np.asarray(z).reshape(-1, 1, 1)
+        tau = np.asarray(tau, dtype=np.float64).reshape(1, -1, 1)
+        v0 = np.asarray(v0, dtype=np.float64).reshape(1, 1, -1)
+        s0 = self.s0 if s0 is None else s0
+        return self.chf(tau, s0, v0, z, j, out=out)
+
+    @staticmethod
+    def laguerre_rule(n_nodes: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Gauss-Laguerre nodes and weights rescaled by exp(z), for the plain
+        integral over [0, inf).
+
+        `np.polynomial.laguerre.laggauss` overflows from about 180 nodes on, and
+        w * exp(z) from about 200. Here the nodes are the eigenvalues of the
+        Jacobi matrix, refined by one Newton step, and the weights
+        z / (n L_{n-1}(z))^2 come from the three-term recurrence rescaled at
+        every step, so the rescaled weights are assembled in log space.
+
+        @param {int} n_nodes - Number of nodes.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Nodes and rescaled weights.
+        """
+        assert n_nodes > 0
+        k = np.arange(1, n_nodes)
+        jacobi = np.diag(2.0 * np.arange(n_nodes) + 1.0)
+        z = np.linalg.eigvalsh(jacobi - np.diag(k, 1) - np.diag(k, -1))
+
+        def recurrence(z):
+            # L_n(z) and L_{n-1}(z) over a common scale, and its log
+            p_prev, p, log_scale = np.ones_like(z), 1.0 - z, np.zeros_like(z)
+            for k in range(1, n_nodes):
+                p_prev, p = p, ((2 * k + 1 - z) * p - k * p_prev) / (k + 1)
+                scale = np.maximum(np.abs(p), 1.0)
+                p_prev, p = p_prev / scale, p / scale
+                log_scale += np.log(scale)
+            return p, p_prev, log_scale
+
+        p, p_prev, _ = recurrence(z)
+        z = z - z * p / (n_nodes * (p - p_prev))
+        _, p_prev, log_scale = recurrence(z)
+        log_w = np.log(z) - 2.0 * (np.log(n_nodes * np.abs(p_prev)) + log_scale)
+        return z, np.exp(log_w + z)
+
+    def nodes(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Nodes and weights of the fixed-node integration mode.
+
+        The tables are built once per setting and cached on the engine; the
+        Laguerre weights are rescaled by exp(z) so both modes integrate
+        the plain integrand over [0, inf), see `laguerre_rule`.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Quadrature nodes and weights.
+        """
+        key = (self.integration, self.n_nodes, self.upper)
+        if key not in self._nodes:
+            if self.integration == "laguerre":
+                z, w = self.laguerre_rule(self.n_nodes)
+            elif self.integration == "legendre":
+                z, w = np.polynomial.legendre.leggauss(self.n_nodes)
+                z, w = 0.5 * self.upper * (z + 1.0), 0.5 * self.upper * w
+            else:
+                raise ValueError(f"no fixed nodes for integration={self.integration!r}")
+            self._nodes[key] = (z, w)
+        return self._nodes[key]
+
+    def node_terms(self, taus: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        C and D terms on the fixed nodes for j = 1, 2 and the given maturities.
+
+        With a cache attached, terms are looked up per (parameters, tau, node set,
+        j) and only the missing maturities are evaluated, in a single call.
+
+        @param {np.ndarray} taus - Unique times to expiration, shape (n_tau,).
+
+        @returns {Tuple[np.ndarray, np.ndarray]} Terms C and D of shape
+        (n_nodes, 2, n_tau).
+        """
+        z = self.nodes()[0][:, None, None]
+        j = np.array([1, 2])[None, :, None]
+        if self.cache is None:
+            return self.chf_terms(taus, z, j)
+
+        params = (
+            self.kappa,
+            self.theta,
+            self.sigma,
+            self.rho,
+            self.phi,
+            self.risk_free_rate,
+            self.dividend_yield,
+        )
+        node_set = (self.integration, self.n_nodes, self.upper)
+        keys = [[(params, float(tau), node_set, jj) for jj in (1, 2)] for tau in taus]
+        entries = [[self.cache.get(key) for key in row] for row in keys]
+        missing = [i for i, row in enumerate(entries) if None in row]
+        if missing:
+            C_m, D_m = self.chf_terms(np.asarray(taus)[missing], z, j)
+            for n, i in enumerate(missing):
+                for jj in (0, 1):
+                    entry = (C_m[:, jj, n].copy(), D_m[:, jj, n].copy())
+                    self.cache.put(keys[i][jj], entry)
+                    entries[i][jj] = entry
+
+        C = np.empty((z.shape[0], 2, len(taus)), dtype=np.complex128)
+        D = np.empty_like(C)
+        for i, row in enumerate(entries):
+            for jj, (C_ij, D_ij) in enumerate(row):
+                C[:, jj, i], D[:, jj, i] = C_ij, D_ij
+        return C, D
+
+    def _quad_vec(self, f: typing.Callable) -> np.ndarray:
+        """
+        Adaptive integral of a vector-valued integrand over [0, 1000].
+
+        When instrumented, the number of integrand evaluations and the error
+        estimate of `quad_vec` are recorded as "quad_nfev" and "quad_error".
+
+        @param {Callable} f - Integrand of z.
+
+        @returns {np.ndarray} Integral.
+        """
+        if self.stats is None:
+            return scipy.integrate.quad_vec(f, 0.0, 1000.0)[0]
+        res, err, info = scipy.integrate.quad_vec(f, 0.0, 1000.0, full_output=True)
+        self.stats.count("quad_nfev", info.neval)
+        self.stats.gauge("quad_error", float(err))
+        return res
+
+    def _keys(self, book: OptionBook) -> typing.Tuple[np.ndarray, ...]:
+        """
+        Index a book by its unique (tau, s0, v0) keys.
+
+        All the options of a key share the characteristic function, and all the
+        keys of a maturity share its C and D terms: mixed books evaluate each of
+        them once and scatter the results back. v0 is the option's, or the
+        engine's where the option carries none.
+
+        @param {OptionBook} book - Option book.
+
+        @returns {Tuple[np.ndarray, ...]} Unique maturities; maturity index, s0
+        and v0 of every key; key index of every option.
+        """
+        v0 = np.where(np.isnan(book.v0), self.v0, book.v0)
+        keys = np.stack([book.tau, book.s0, v0])
+        if len(book) and np.all(keys == keys[:, :1]):
+            # single key, e.g. a strike strip
+            inverse = np.zeros(len(book), dtype=np.int64)
+            return (
+                keys[0, :1],
+                np.zeros(1, dtype=np.int64),
+                keys[1, :1],
+                v0[:1],
+                inverse,
+            )
+        keys, inverse = np.unique(keys, axis=1, return_inverse=True)
+        taus, tau_index = np.unique(keys[0], return_inverse=True)
+        return taus, tau_index, keys[1], keys[2], inverse.reshape(-1)
+
+    def npv(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Net Present Value (NPV) of the options.
+
+        With a store attached, the prices are read through it, keyed by the
+        `fingerprint` and the book; a hit is counted as "store_hits" and emitted
+        as an "npv" call like the pricings of `_npv`.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {np.ndarray} NPV of the options.
+        """
+        book = self._as_book(options)
+        if self.store is None:
+            return self._npv(book)
+
+        start = None if self.stats is None else time.perf_counter()
+        key = self.store.key(
+            "npv",
+            self.fingerprint(),
+            book.s0,
+            book.strike,
+            book.tau,
+            book.flag,
+            book.v0,
         )
-        D = (b_m / sigma_2) * (1.0 - ee) / (1.0 - g * ee)
-        return cmath.e ** (C + D * v0 + ixi * np.log(s0))
+        entry = self.store.get(key)
+        if entry is not None:
+            npv = np.array(entry["npv"])
+            if start is not None:
+                self.stats.count("store_hits")
+                self.stats.emit(
+                    "npv", options=len(book), seconds=time.perf_counter() - start
+                )
+            return npv
 
-    def npv(self, options: typing.List):
+        npv = self._npv(book)
+        self.store.put(key, {"npv": npv})
+        return npv
+
+    def _npv(self, book: OptionBook) -> np.ndarray:
         """
-        Net Present Value (NPV) of the option.
+        Price the options with the engine's method, bypassing the store.
+
+        Options may carry their own s0, v0 and tau; the characteristic function
+        is evaluated once per unique (tau, s0, v0) key of the book and shifted to
+        every strike of the key.
 
-        @param {List} options - List of option objects.
+        @param {OptionBook} book - Option book.
 
         @returns {np.ndarray} NPV of the options.
         """
 
         def integrad(z, j):
-            return np.real(
-                ((np.exp(-1j * z * np.log(k_arr))) * self.chf(tau, s0, v0, z, j))
-                / (1j * z)
-            )
+            # Re(chf * exp(-iz log(k)) / (iz)) = exp(re) * sin(im - z log(k)) / z
+            C, D = self.chf_terms(taus, z, j)
+            re = C.real[tau_index] + D.real[tau_index] * v0
+            im = C.imag[tau_index] + D.imag[tau_index] * v0 + z * log_s0
+            return np.exp(re)[pick] * np.sin(im[pick] - z * log_k) / z
 
         def q_j(j):
-            return (
-                0.5 + (1.0 / np.pi) * quad_vec(lambda z: integrad(z, j), 0.0, 1000.0)[0]
+            return 0.5 + (1.0 / np.pi) * self._quad_vec(lambda z: integrad(z, j))
+
+        def q_fixed():
+            # same integrand on the nodes, 1/z is folded into w
+            z, w = self.nodes()
+            z = z[:, None, None]
+            C, D = self.node_terms(taus)
+            re = C.real[..., tau_index] + D.real[..., tau_index] * v0
+            im = C.imag[..., tau_index] + D.imag[..., tau_index] * v0 + z * log_s0
+            integrand = np.subtract(im[..., pick], z * log_k)
+            np.sin(integrand, out=integrand)
+            integrand *= np.exp(re)[..., pick]
+            return 0.5 + (1.0 / np.pi) * np.tensordot(
+                w / z[:, 0, 0], integrand, axes=(0, 0)
+            )
+
+        start = None if self.stats is None else time.perf_counter()
+        with self._stage("npv.marshal"):
+            taus, tau_index, s0, v0, inverse = self._keys(book)
+            # a single key broadcasts against the strikes instead of being gathered
+            pick = inverse if len(s0) > 1 else slice(None)
+            log_s0 = np.log(s0)
+            log_k = np.log(book.strike)
+
+        with self._stage("npv.integrate"):
+            if self.integration == "quad_vec":
+                q_1, q_2 = q_j(1), q_j(2)
+            else:
+                q_1, q_2 = q_fixed()
+
+        discount = book.strike * np.exp(-self.risk_free_rate * book.tau)
+        spot = book.s0 * np.exp(-self.dividend_yield * book.tau)
+        call = spot * q_1 - discount * q_2
+        npv = np.where(book.flag == 1, call, call - spot + discount)
+        if start is not None:
+            self.stats.emit(
+                "npv", options=len(book), seconds=time.perf_counter() - start
             )
+        return npv
+
+    def price_and_greeks(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Net Present Value (NPV) of the options with delta, gamma and vega.
+
+        The Greeks differentiate the Fourier integrands under the integral:
+        with C = s0 * P1 - K * exp(-r * tau) * P2, delta is P1 (P1 - 1 for puts),
+        gamma is dP1/ds0 and vega, taken with respect to v0, combines dPj/dv0,
+        whose integrands are the price integrands times D. All of them reuse the
+        chf evaluations of the price, made once per (tau, s0, v0) key as in `npv`.
 
-        assert isinstance(options, (list))
-        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
-
-        tau = np.array([option.tau for option in options])
-        if len(set(tau)) == 1:
-            tau = float(tau[0])
-        s0 = np.array([option.s0 for option in options])
-        if len(set(s0)) == 1:
-            s0 = float(s0[0])
-        flag_arr = np.array([option.flag for option in options])
-        k_arr = np.array([option.strike for option in options])
-        v0 = self.v0
-        if all("v0" in option.kwargs for option in options):
-            v0 = np.array([option.kwargs["v0"] for option in options])
-
-        a = self.s0 * q_j(1)
-        b = k_arr * np.exp(-self.risk_free_rate * tau) * q_j(2)
-        return np.where(
-            flag_arr == 1,
-            a - b,
-            a - b - self.s0 + k_arr * np.exp(-self.risk_free_rate * tau),
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {Tuple[np.ndarray, ...]} NPV, delta, gamma and vega of the options.
+        """
+
+        def integrand(z):
+            # rows: P1, P2, dP1/ds0 * s0, dP1/dv0, dP2/dv0 integrands
+            C, D = self.chf_terms(taus, z, j)
+            chf = np.exp(C[:, tau_index] + D[:, tau_index] * v0 + 1j * z * log_s0)
+            g = chf[:, pick] * np.exp(-1j * z * log_k) / (1j * z)
+            D = D[:, tau_index][:, pick]
+            return np.concatenate([g.real, (1j * z * g[:1]).real, (D * g).real])
+
+        def integrals_fixed():
+            z, w = self.nodes()
+            z = z[:, None, None]
+            C, D = self.node_terms(taus)
+            D = D[..., tau_index]
+            re = C.real[..., tau_index] + D.real * v0
+            im = C.imag[..., tau_index] + D.imag * v0 + z * log_s0
+            D = D[..., pick]
+            im = im[..., pick] - z * log_k
+            e, sin, cos = np.exp(re)[..., pick], np.sin(im), np.cos(im)
+            w_z = (w / z[:, 0, 0])[:, None, None]
+            integrands = np.concatenate(
+                [
+                    w_z * e * sin,
+                    w[:, None, None] * e[:, :1] * cos[:, :1],
+                    w_z * e * (D.real * sin + D.imag * cos),
+                ],
+                axis=1,
+            )
+            return integrands.sum(axis=0)
+
+        start = None if self.stats is None else time.perf_counter()
+        with self._stage("greeks.marshal"):
+            book = self._as_book(options)
+            taus, tau_index, s0, v0, inverse = self._keys(book)
+            pick = inverse if len(s0) > 1 else slice(None)
+            log_s0 = np.log(s0)
+            log_k = np.log(book.strike)
+            j = np.array([[1], [2]])
+
+        with self._stage("greeks.integrate"):
+            if self.integration == "quad_vec":
+                m = len(book)
+                integrals = self._quad_vec(lambda z: integrand(z).reshape(-1))
+                integrals = integrals.reshape(5, m)
+            else:
+                integrals = integrals_fixed()
+        integrals = integrals / np.pi
+
+        p_1, p_2 = 0.5 + integrals[0], 0.5 + integrals[1]
+        discount = book.strike * np.exp(-self.risk_free_rate * book.tau)
+        carry = np.exp(-self.dividend_yield * book.tau)
+        spot = book.s0 * carry
+        call = spot * p_1 - discount * p_2
+        npv = np.where(book.flag == 1, call, call - spot + discount)
+        delta = carry * np.where(book.flag == 1, p_1, p_1 - 1.0)
+        gamma = carry * integrals[2] / book.s0
+        vega = spot * integrals[3] - discount * integrals[4]
+        if start is not None:
+            self.stats.emit(
+                "greeks", options=len(book), seconds=time.perf_counter() - start
+            )
+        return npv, delta, gamma, vega
+
+    def delta(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Calculate the delta of the options.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {np.ndarray} Delta of the options.
+        """
+        return self.price_and_greeks(options)[1]
+
+    def gamma(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Calculate the gamma of the options.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {np.ndarray} Gamma of the options.
+        """
+        return self.price_and_greeks(options)[2]
+
+    def vega(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Calculate the vega of the options, with respect to the initial variance v0.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {np.ndarray} Vega of the options.
+        """
+        return self.price_and_greeks(options)[3]
+
+    def npv_gradient(self, options: typing.Union[typing.List, OptionBook]):
+        """
+        Net Present Value (NPV) of the options and its analytic parameter gradient.
+
+        Prices and derivatives come from the same chf evaluations on the fixed
+        nodes, so the engine must use a fixed-node integration mode.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} NPV of the options and its
+        gradient of shape (len(options), 6) with respect to kappa, theta, sigma,
+        rho, phi and v0.
+        """
+        book = self._as_book(options)
+        v0 = np.where(np.isnan(book.v0), self.v0, book.v0)
+
+        z, w = self.nodes()
+        z = z[:, None, None]
+        j = np.array([1, 2])[None, :, None]
+        taus, inverse = np.unique(book.tau, return_inverse=True)
+        C, D, dC, dD = self.chf_gradient(taus, z, j)
+
+        # w * f / (iz) on the (node, j, option) grid
+        f = np.exp(
+            C[..., inverse]
+            + D[..., inverse] * v0
+            + 1j * z * (np.log(book.s0) - np.log(book.strike))
         )
+        f *= w[:, None, None] / (1j * z)
+        q = 0.5 + (1.0 / np.pi) * f.real.sum(axis=0)
+
+        # derivatives share a maturity's chf terms: one matmul per (tau, j)
+        dq = np.empty((6, 2, len(book)))
+        for g in range(len(taus)):
+            idx = np.flatnonzero(inverse == g)
+            for jj in range(2):
+                f_g = f[:, jj, idx]
+                dq[:5, jj, idx] = (dC[:, :, jj, g] @ f_g).real
+                dq[:5, jj, idx] += (dD[:, :, jj, g] @ (f_g * v0[idx])).real
+                dq[5, jj, idx] = (D[:, jj, g] @ f_g).real
+        dq *= 1.0 / np.pi
+
+        discount = book.strike * np.exp(-self.risk_free_rate * book.tau)
+        spot = book.s0 * np.exp(-self.dividend_yield * book.tau)
+        npv = spot * q[0] - discount * q[1]
+        npv = np.where(book.flag == 1, npv, npv - spot + discount)
+        gradient = spot * dq[:, 0] - discount * dq[:, 1]
+        return npv, gradient.T
+
+    def scenarios(
+        self,
+        options: typing.Union[typing.List, OptionBook],
+        spot_shifts: np.ndarray = (0.0,),
+        v0_shifts: np.ndarray = (0.0,),
+        time_decay: np.ndarray = (0.0,),
+    ) -> np.ndarray:
+        """
+        Net Present Value (NPV) of the options on a ladder of spot, variance and
+        time scenarios.
+
+        s0 enters the characteristic function only through exp(i * z * log(s0)),
+        so the chf terms are evaluated once per decayed maturity and the integrands
+        once per variance shift; the spot shifts are then a single complex matrix
+        product with the factors exp(i * z * log(1 + shift)) on the fixed nodes.
+        The engine must use a fixed-node integration mode. Options expiring within
+        the time decay are worth their intrinsic value.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+        @param {np.ndarray} [spot_shifts=(0.0,)] - Relative spot shifts, the
+        shifted price being s0 * (1 + shift).
+        @param {np.ndarray} [v0_shifts=(0.0,)] - Absolute shifts of the initial
+        variance, floored at zero.
+        @param {np.ndarray} [time_decay=(0.0,)] - Elapsed times, subtracted from the
+        times to expiration.
+
+        @returns {np.ndarray} NPV of shape (n_spot_shifts, n_v0_shifts,
+        n_time_decay, len(options)).
+        """
+        start = None if self.stats is None else time.perf_counter()
+        book = self._as_book(options)
+        d_s = np.atleast_1d(np.asarray(spot_shifts, dtype=np.float64))
+        d_v = np.atleast_1d(np.asarray(v0_shifts, dtype=np.float64))
+        d_t = np.atleast_1d(np.asarray(time_decay, dtype=np.float64))
+        assert np.all(d_s > -1.0) and np.all(d_t >= 0.0)
+        n_s, n_v, n_t, m = len(d_s), len(d_v), len(d_t), len(book)
+
+        # maturity-dependent terms, once per decayed maturity
+        tau = book.tau - d_t[:, None]
+        live = tau > 0.0
+        tau = np.where(live, tau, book.tau)
+        z, w = self.nodes()
+        with self._stage("scenarios.terms"):
+            taus, inverse = np.unique(tau, return_inverse=True)
+            C, D = self.node_terms(taus)
+        C = C[..., inverse].reshape(-1, 2, 1, n_t, m)
+        D = D[..., inverse].reshape(-1, 2, 1, n_t, m)
+
+        # integrands at the book's spots, once per variance shift
+        with self._stage("scenarios.integrate"):
+            v0 = np.where(np.isnan(book.v0), self.v0, book.v0)
+            v0 = np.maximum(v0 + d_v[:, None, None], 0.0)
+            f = C + D * v0
+            f += 1j * z[:, None, None, None, None] * np.log(book.s0 / book.strike)
+            np.exp(f, out=f)
+
+            # Re(f * e / (iz)) = Im(f * e) / z, 1/z is folded into the spot factors
+            e = np.exp(1j * np.log1p(d_s)[:, None] * z) * (w / z)
+            q = 0.5 + (1.0 / np.pi) * (e @ f.reshape(len(z), -1)).imag
+            q = q.reshape(n_s, 2, n_v, n_t, m)
+
+        s0 = book.s0 * (1.0 + d_s[:, None, None, None])
+        discount = book.strike * np.exp(-self.risk_free_rate * tau)
+        spot = s0 * np.exp(-self.dividend_yield * tau)
+        call = spot * q[:, 0] - discount * q[:, 1]
+        npv = np.where(book.flag == 1, call, call - spot + discount)
+        npv = np.where(live, npv, np.maximum(book.flag * (s0 - book.strike), 0.0))
+        if start is not None:
+            self.stats.emit(
+                "scenarios",
+                options=m,
+                scenarios=n_s * n_v * n_t,
+                seconds=time.perf_counter() - start,
+            )
+        return npv
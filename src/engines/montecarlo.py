@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining Monte Carlo Heston engine.
+This class inherit methods from the parent class `HestonEngine`,
+providing simulation pricing of option books without storing paths.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..processes.base import StochasticProcess
+from .blackscholes import BlackScholesEngine
+from ..instruments.option import OptionBook
+from ..backends.base import Backend
+from .heston import HestonEngine
+from .cache import DiskCache
+import numpy as np
+import typing
+import time
+
+
+class MonteCarloHestonEngine(HestonEngine):
+
+    """
+    Monte Carlo Heston Engine Class
+
+    This class represents an engine pricing options by simulating the
+    `HestonProcess` dynamics under the risk-neutral measure. Payoffs of the
+    whole book are accumulated while the paths are generated, block by block,
+    so memory scales with the block size and not with paths x steps. Blocks
+    double as batches for the standard error.
+    """
+
+    # attributes determining the results kept in a disk store
+    store_keys = HestonEngine.cache_keys + (
+        "s0",
+        "mu",
+        "n_paths",
+        "n_steps",
+        "n_batches",
+        "antithetic",
+        "control_variate",
+        "scheme",
+        "discretization",
+        "qmc",
+        "seed",
+    )
+
+    def __init__(
+        self,
+        theta: float,
+        kappa: float,
+        sigma: float,
+        rho: float,
+        phi: float,
+        v0: float,
+        s0: float,
+        mu: float = 0.0,
+        risk_free_rate: float = 0.0,
+        dividend_yield: float = 0.0,
+        n_paths: int = 2**16,
+        n_steps: int = 200,
+        n_batches: int = 16,
+        antithetic: bool = True,
+        control_variate: str = None,
+        scheme: str = "milstein",
+        discretization: str = "truncation",
+        qmc: bool = False,
+        seed: typing.Union[int, np.random.SeedSequence] = None,
+        backend: typing.Union[str, Backend] = "numpy",
+        store: DiskCache = None,
+    ):
+        """
+        Constructor method for MonteCarloHestonEngine.
+
+        @param {float} theta - Heston model parameter.
+        @param {float} kappa - Heston model parameter.
+        @param {float} sigma - Heston model parameter.
+        @param {float} rho - Heston model parameter.
+        @param {float} phi - Heston model parameter.
+        @param {float} v0 - Initial volatility.
+        @param {float} s0 - Initial asset price.
+        @param {float} [mu=0.0] - Drift term.
+        @param {float} [risk_free_rate=0.0] - Risk-free interest rate.
+        @param {float} [dividend_yield=0.0] - Dividend yield.
+        @param {int} [n_paths=65536] - Number of simulated paths.
+        @param {int} [n_steps=200] - Number of time steps up to the longest
+        maturity; shorter maturities are read at the nearest step.
+        @param {int} [n_batches=16] - Number of path blocks, simulated one after
+        the other and used as batches of the standard error.
+        @param {bool} [antithetic=True] - Pair every path with its antithetic.
+        @param {str} [control_variate=None] - None, "spot" (discounted terminal
+        spot) or "blackscholes" (the option on a GBM driven by the same spot
+        shocks, priced by `BlackScholesEngine`).
+        @param {str} [scheme="milstein"] - Variance scheme of `HestonProcess`; "qe"
+        does not support the "blackscholes" control.
+        @param {str} [discretization="truncation"] - Variance fix of `HestonProcess`.
+        @param {bool} [qmc=False] - Drive each batch with scrambled Sobol points and
+        Brownian-bridge increments; batches are then independent randomizations
+        and the standard error is the randomized QMC one. Excludes antithetic.
+        @param {int|np.random.SeedSequence} [seed=None] - Root seed of the batch
+        streams; without it the batches draw from the global NumPy state.
+        @param {str|Backend} [backend="numpy"] - Compute backend of the chf terms
+        and path steps, see `backends.get_backend`.
+        @param {DiskCache} [store=None] - Opt-in persistent store `npv` reads
+        through, shared by every engine with the same `fingerprint`. Only
+        for seeded engines, as the prices of the others are random draws.
+        """
+        super().__init__(
+            theta=theta,
+            kappa=kappa,
+            sigma=sigma,
+            rho=rho,
+            phi=phi,
+            v0=v0,
+            s0=s0,
+            mu=mu,
+            risk_free_rate=risk_free_rate,
+            dividend_yield=dividend_yield,
+            backend=backend,
+            store=store,
+        )
+        assert n_steps > 0 and n_batches > 1
+        assert n_paths % (2 * n_batches if antithetic else n_batches) == 0
+        assert control_variate in (None, "spot", "blackscholes")
+        assert not (qmc and antithetic)
+        assert store is None or seed is not None
+        # the Black-Scholes control recovers the spot shocks of the Euler step
+        assert control_variate != "blackscholes" or scheme in ("milstein", "euler")
+
+        # simulation settings
+        self.n_paths = n_paths
+        self.n_steps = n_steps
+        self.n_batches = n_batches
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.scheme = scheme
+        self.discretization = discretization
+        self.qmc = qmc
+        self.seed = seed
+
+    def control_sigma(self, tau: np.ndarray) -> np.ndarray:
+        """
+        Volatility of the Black-Scholes control: the root of the expected average
+        variance over [0, tau], plus the displacement phi.
+
+        @param {np.ndarray} tau - Times to expiration.
+
+        @returns {np.ndarray} Control volatilities.
+        """
+        kappa_tau = np.maximum(self.kappa * tau, 1e-12)
+        mean_v = self.theta + (self.v0 - self.theta) * -np.expm1(-kappa_tau) / kappa_tau
+        return np.sqrt(np.maximum(mean_v + self.phi, 1e-12))
+
+    def npv_and_error(
+        self, options: typing.Union[typing.List, OptionBook]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Net Present Value (NPV) of the options and its standard error.
+
+        Options are read at the simulation step nearest to their maturity. The
+        control variate coefficient is estimated over all paths; the standard
+        error is `StochasticProcess.std_error` of the controlled batch means.
+
+        @param {List|OptionBook} options - List of option objects or option book.
+
+        @returns {Tuple[np.ndarray, np.ndarray]} NPV and standard error.
+        """
+        # deferred: processes.heston imports engines.heston
+        from ..processes.heston import HestonProcess
+
+        start = None if self.stats is None else time.perf_counter()
+        book = self._as_book(options)
+        assert np.all(np.isnan(book.v0) | (book.v0 == self.v0))
+        n_options = len(book)
+
+        horizon = float(np.max(book.tau)) if n_options else 0.0
+        horizon = horizon if horizon > 0.0 else 1.0
+        dt = horizon / self.n_steps
+        step = np.rint(book.tau / dt).astype(np.int64)
+        maturities = {k: np.flatnonzero(step == k) for k in np.unique(step)}
+
+        discount = np.exp(-self.risk_free_rate * book.tau)
+        scale = book.s0 / self.s0
+        flag = book.flag.astype(np.float64)
+        sigma_cv = self.control_sigma(step * dt)
+        drift = self.risk_free_rate - self.dividend_yield
+
+        block_size = self.n_paths // self.n_batches
+        # independent samples of a block: antithetic pairs, or single paths
+        n_units = block_size // 2 if self.antithetic else block_size
+        y_mean = np.empty((self.n_batches, n_options))
+        x_mean = np.zeros((self.n_batches, n_options))
+        sums = np.zeros((2, n_options))
+
+        if self.seed is None:
+            streams = [None] * self.n_batches
+        else:
+            # not spawned from the stored seed, so every call draws the same paths
+            streams = [
+                np.random.default_rng(child)
+                for child in StochasticProcess.child_seeds(self.seed, self.n_batches)
+            ]
+
+        for b in range(self.n_batches):
+            s_prev = v_prev = None
+            w = np.zeros(block_size)
+            for t_step, s, v, _ in HestonProcess.steps(
+                self,
+                block_size,
+                self.n_steps,
+                horizon,
+                scheme=self.scheme,
+                discretization=self.discretization,
+                antithetic=self.antithetic,
+                qmc=self.qmc,
+                rng=streams[b],
+            ):
+                if self.control_variate == "blackscholes" and t_step > 0:
+                    # spot shocks recovered from the log-return of the step
+                    w += (
+                        np.log(s / s_prev) - (drift - (v_prev + self.phi) / 2) * dt
+                    ) / np.sqrt(v_prev + self.phi)
+                s_prev, v_prev = s, v
+
+                idx = maturities.get(t_step)
+                if idx is None:
+                    continue
+                s_t = scale[idx, None] * s
+                y = discount[idx, None] * np.maximum(
+                    flag[idx, None] * (s_t - book.strike[idx, None]), 0.0
+                )
+                y_mean[b, idx] = y.mean(axis=1)
+
+                if self.control_variate is None:
+                    continue
+                if self.control_variate == "spot":
+                    x = discount[idx, None] * s_t
+                else:
+                    tau = t_step * dt
+                    g_t = scale[idx, None] * np.exp(
+                        (drift - sigma_cv[idx, None] ** 2 / 2) * tau
+                        + sigma_cv[idx, None] * w
+                    )
+                    x = discount[idx, None] * np.maximum(
+                        flag[idx, None] * (self.s0 * g_t - book.strike[idx, None]),
+                        0.0,
+                    )
+                x_mean[b, idx] = x.mean(axis=1)
+                if self.antithetic:
+                    # a path and its mirror are one sample: average the pairs
+                    x = 0.5 * (x[:, :n_units] + x[:, n_units:])
+                    y = 0.5 * (y[:, :n_units] + y[:, n_units:])
+                x_c = x - x_mean[b, idx, None]
+                y_c = y - y_mean[b, idx, None]
+                sums[0, idx] += np.sum(x_c * y_c, axis=1)
+                sums[1, idx] += np.sum(x_c * x_c, axis=1)
+
+        if self.control_variate is not None:
+            # pooled within-batch covariances plus the between-batch part
+            x_c = x_mean - x_mean.mean(axis=0)
+            y_c = y_mean - y_mean.mean(axis=0)
+            cov = sums[0] + n_units * np.sum(x_c * y_c, axis=0)
+            var = sums[1] + n_units * np.sum(x_c * x_c, axis=0)
+            beta = np.where(var > 0.0, cov / np.where(var > 0.0, var, 1.0), 0.0)
+            y_mean = y_mean - beta * (x_mean - self.control_mean(book, step * dt))
+
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            self.stats.count("paths", self.n_paths)
+            self.stats.count("path_steps", self.n_paths * self.n_steps)
+            self.stats.gauge("path_throughput", self.n_paths * self.n_steps / elapsed)
+            self.stats.emit(
+                "npv", options=n_options, paths=self.n_paths, seconds=elapsed
+            )
+        return y_mean.mean(axis=0), StochasticProcess.std_error(y_mean)
+
+    def control_mean(self, book: OptionBook, tau: np.ndarray) -> np.ndarray:
+        """
+        Expectation of the control variate of each option.
+
+        @param {OptionBook} book - Priced options.
+        @param {np.ndarray} tau - Simulated maturities of the options.
+
+        @returns {np.ndarray} Exact mean of the control.
+        """
+        discount = np.exp(-self.risk_free_rate * (book.tau - tau))
+        if self.control_variate == "spot":
+            return discount * book.s0 * np.exp(-self.dividend_yield * tau)
+
+        # the dividend yield is folded into the spot (forward-adjusted price)
+        bs = BlackScholesEngine(risk_free_rate=self.risk_free_rate)
+        control = OptionBook(
+            book.s0 * np.exp(-self.dividend_yield * tau),
+            book.strike,
+            tau,
+            book.flag,
+            sigma=self.control_sigma(tau),
+        )
+        intrinsic = np.maximum(book.flag * (control.s0 - book.strike), 0.0)
+        return discount * np.where(tau > 0.0, bs.npv(control), intrinsic)
+
+    def _npv(self, book: OptionBook) -> np.ndarray:
+        """
+        Net Present Value (NPV) of the options, bypassing the store.
+
+        @param {OptionBook} book - Option book.
+
+        @returns {np.ndarray} NPV of the options.
+        """
+        return self.npv_and_error(book)[0]
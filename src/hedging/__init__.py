@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from .._lazy import attach
+
+__all__ = ["base", "delta"]
+
+__getattr__, __dir__ = attach(
+    __name__, __all__, {"Hedger": "base", "DeltaHedger": "delta"}
+)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining various hedgers.
+It contains the base class `Hedger`, which serves as the foundation
+for backtesting hedging strategies over simulated paths.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+
+
+class Hedger(ABC):
+    def __init__(self):
+        """
+        Constructor method for Hedger.
+        """
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Hedger.
+
+        @returns {str} String representation of the hedger.
+        """
+        pass
+
+    @abstractmethod
+    def backtest(self, s, vol, horizon, strike, tau, flag):
+        """
+        Run the hedging strategy of an option along every simulated path.
+
+        @param {np.ndarray} s - Asset prices of shape (n_paths, n_steps + 1).
+        @param {np.ndarray} vol - Volatilities of shape (n_paths, n_steps + 1).
+        @param {float} horizon - Time horizon of the paths.
+        @param {float} strike - Strike price of the option.
+        @param {float} tau - Time to expiration of the option.
+        @param {int} flag - Option type, +1 for a call and -1 for a put.
+        """
+        pass
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining delta hedger.
+This class inherit methods from the parent class `Hedger`,
+providing a vectorized delta-hedging backtest over simulated paths.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..processes.base import StochasticProcess
+from ..instruments.option import OptionBook
+from ..engines.base import Engine
+from .base import Hedger
+import numpy as np
+import typing
+import copy
+
+
+class DeltaHedger(Hedger):
+
+    """
+    Delta Hedger Class
+
+    This class backtests the delta hedge of a short European option: the option
+    is sold at the engine's price, the hedge is rebalanced to the engine's delta
+    every `rebalance` steps of the paths, cash accrues at the risk-free rate and
+    the position is unwound at maturity. Every rebalance date prices all the
+    paths at once through one option book, so the cost of a backtest is one
+    vectorized `delta` call per date.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        cost: float = 0.0,
+        fixed_cost: float = 0.0,
+        rebalance: int = 1,
+        sigma: float = None,
+        grid: typing.Union[str, typing.Tuple[int, int]] = "auto",
+    ):
+        """
+        Constructor method for DeltaHedger.
+
+        @param {Engine} engine - Engine giving the premium and the hedge ratios,
+        e.g. `BlackScholesEngine` or `HestonEngine`.
+        @param {float} [cost=0.0] - Proportional transaction cost, as a fraction of
+        the traded notional.
+        @param {float} [fixed_cost=0.0] - Fixed cost of every non-zero trade.
+        @param {int} [rebalance=1] - Number of path steps between rebalances.
+        @param {float} [sigma=None] - Volatility of the books passed to the engine
+        (the Black-Scholes hedging volatility); the paths' volatilities if None.
+        @param {str|Tuple[int, int]} [grid="auto"] - Numbers of log-spot and
+        volatility nodes: if set, the deltas of each date are computed on this
+        grid and interpolated bilinearly onto the paths, instead of one option
+        per path. "auto" is (64, 16) for the Fourier engines (`HestonEngine` and
+        its subclasses), so every date prices 1024 options whatever the number
+        of paths, and one option per path for the others; None always prices
+        one option per path. The grid deltas of an engine integrating with
+        "quad_vec" are computed on the engine's "laguerre" nodes instead, the
+        adaptive quadrature making a backtest several times slower.
+        """
+        # deferred: importing engines.heston loads scipy
+        from ..engines.heston import HestonEngine
+
+        super().__init__()
+        assert isinstance(engine, Engine)
+        assert cost >= 0.0 and fixed_cost >= 0.0 and rebalance > 0
+        if isinstance(grid, str):
+            assert grid == "auto"
+            grid = (64, 16) if isinstance(engine, HestonEngine) else None
+        assert grid is None or (grid[0] > 1 and grid[1] > 0)
+        self.engine = engine
+        self.cost = cost
+        self.fixed_cost = fixed_cost
+        self.rebalance = rebalance
+        self.sigma = sigma
+        self.grid = grid
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the delta hedger.
+
+        @returns {str} String representation of the hedger.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "engine": self.engine,
+                "cost": self.cost,
+                "fixed_cost": self.fixed_cost,
+                "rebalance": self.rebalance,
+                "sigma": self.sigma,
+            }.items()
+        )
+        return f"<Hedger.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def _book(
+        self, s: np.ndarray, vol: np.ndarray, strike: float, tau: float, flag: int
+    ) -> OptionBook:
+        """
+        Option book of one rebalance date, one option per state.
+
+        @param {np.ndarray} s - Asset prices.
+        @param {np.ndarray} vol - Volatilities, or None.
+        @param {float} strike - Strike price.
+        @param {float} tau - Remaining time to expiration.
+        @param {int} flag - Option type.
+
+        @returns {OptionBook} Book carrying the hedging volatility as sigma and
+        the variance of the paths as v0.
+        """
+        sigma = self.sigma if self.sigma is not None else vol
+        v0 = np.nan if vol is None else vol * vol
+        return OptionBook(s, strike, tau, flag, sigma=sigma, v0=v0)
+
+    def hedge_ratios(
+        self, s: np.ndarray, vol: np.ndarray, strike: float, tau: float, flag: int
+    ) -> np.ndarray:
+        """
+        Deltas of the option at one rebalance date, for all the paths.
+
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} vol - Volatilities of the paths, or None.
+        @param {float} strike - Strike price.
+        @param {float} tau - Remaining time to expiration.
+        @param {int} flag - Option type.
+
+        @returns {np.ndarray} Hedge ratios.
+        """
+        if self.grid is None:
+            return self.engine.delta(self._book(s, vol, strike, tau, flag))
+
+        engine = self.engine
+        if getattr(engine, "integration", None) == "quad_vec":
+            # shares the node tables and the chf cache of the engine
+            engine = copy.copy(engine)
+            engine.integration = "laguerre"
+
+        n_x, n_v = self.grid
+        x = np.log(s)
+        if np.ptp(x) == 0.0:
+            x_nodes = x[:1]
+        else:
+            x_nodes = np.linspace(x.min(), x.max(), n_x)
+        if vol is None or n_v == 1 or np.ptp(vol) == 0.0:
+            vol_nodes = None if vol is None else np.array([np.mean(vol)])
+        else:
+            vol_nodes = np.linspace(vol.min(), vol.max(), n_v)
+
+        n_x, n_v = len(x_nodes), 1 if vol_nodes is None else len(vol_nodes)
+        book = self._book(
+            np.repeat(np.exp(x_nodes), n_v),
+            None if vol_nodes is None else np.tile(vol_nodes, n_x),
+            strike,
+            tau,
+            flag,
+        )
+        nodes = engine.delta(book).reshape(n_x, n_v)
+        if n_v == 1:
+            return np.interp(x, x_nodes, nodes[:, 0])
+        if n_x == 1:
+            return np.interp(vol, vol_nodes, nodes[0])
+
+        # bilinear interpolation on the uniform grid
+        u = (x - x_nodes[0]) / (x_nodes[1] - x_nodes[0])
+        w = (vol - vol_nodes[0]) / (vol_nodes[1] - vol_nodes[0])
+        i = np.clip(np.floor(u).astype(np.int64), 0, n_x - 2)
+        j = np.clip(np.floor(w).astype(np.int64), 0, n_v - 2)
+        u, w = u - i, w - j
+        return (1.0 - u) * ((1.0 - w) * nodes[i, j] + w * nodes[i, j + 1]) + u * (
+            (1.0 - w) * nodes[i + 1, j] + w * nodes[i + 1, j + 1]
+        )
+
+    def backtest(
+        self,
+        s: np.ndarray,
+        vol: np.ndarray,
+        horizon: float,
+        strike: float,
+        tau: float,
+        flag: int = 1,
+    ) -> typing.Dict:
+        """
+        Delta-hedge a short option along every path.
+
+        Rebalance dates are every `rebalance` steps before the maturity step,
+        the step nearest to tau. Between dates the cash account accrues at the
+        risk-free rate and the shares earn the dividend yield.
+
+        @param {np.ndarray} s - Asset prices of shape (n_paths, n_steps + 1), as
+        returned by `HestonProcess.paths`.
+        @param {np.ndarray} vol - Volatilities of the same shape, or None when the
+        hedger has a fixed sigma and the engine needs no variance.
+        @param {float} horizon - Time horizon of the paths.
+        @param {float} strike - Strike price of the option.
+        @param {float} tau - Time to expiration of the option, at most horizon.
+        @param {int} [flag=1] - Option type, +1 for a call and -1 for a put.
+
+        @returns {Dict} Hedging P&L per path at maturity, premium received,
+        transaction costs per path, number of rebalances, and the mean, standard
+        deviation and standard error of the P&L.
+        """
+        assert s.ndim == 2 and (vol is None or vol.shape == s.shape)
+        assert vol is not None or self.sigma is not None
+        assert flag in (1, -1)
+        n_steps = s.shape[1] - 1
+        dt = horizon / n_steps
+        maturity = int(round(tau / dt))
+        assert 0 < maturity <= n_steps
+
+        r = getattr(self.engine, "risk_free_rate", 0.0)
+        q = getattr(self.engine, "dividend_yield", 0.0)
+        dates = np.arange(0, maturity, self.rebalance)
+
+        vol_0 = None if vol is None else vol[:, 0]
+        premium = self.engine.npv(self._book(s[:, 0], vol_0, strike, tau, flag))
+        cash = np.array(premium, dtype=np.float64)
+        costs = np.zeros(s.shape[0])
+        position = np.zeros(s.shape[0])
+        previous = 0
+
+        for i in list(dates) + [maturity]:
+            # carry from the previous date
+            period = (i - previous) * dt
+            cash *= np.exp(r * period)
+            cash += position * s[:, previous] * np.expm1(q * period)
+            previous = i
+
+            if i == maturity:
+                delta = np.zeros(s.shape[0])
+            else:
+                vol_i = None if vol is None else vol[:, i]
+                delta = self.hedge_ratios(s[:, i], vol_i, strike, tau - i * dt, flag)
+            trade = delta - position
+            cost = self.cost * np.abs(trade) * s[:, i] + self.fixed_cost * (trade != 0)
+            cash -= trade * s[:, i] + cost
+            costs += cost
+            position = delta
+
+        pnl = cash - np.maximum(flag * (s[:, maturity] - strike), 0.0)
+        return {
+            "pnl": pnl,
+            "premium": premium,
+            "costs": costs,
+            "rebalances": len(dates),
+            "mean": float(np.mean(pnl)),
+            "std": float(np.std(pnl)),
+            "std_error": float(StochasticProcess.std_error(pnl)),
+        }
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides the instrumentation of engines and processes.
+It contains the class `Stats`, which accumulates per-stage wall times,
+evaluation counters and gauges, and forwards per-call records to an
+optional callback.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import contextlib
+import typing
+import time
+
+
+class Stats(object):
+    def __init__(self, callback: typing.Callable[[str, typing.Dict], None] = None):
+        """
+        Stats class, the opt-in instrumentation attached to an engine or a process.
+
+        Instrumented code only touches it when attached, so a detached engine or
+        process pays a single `is None` check per call.
+
+        @param {Callable} [callback=None] - Called as callback(event, record) at
+        the end of every instrumented call, e.g. to export to a metrics pipeline.
+        """
+        self.callback = callback
+        self.calls = {}
+        self.seconds = {}
+        self.counts = {}
+        self.gauges = {}
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Stats.
+
+        @returns {str} String representation of the stats.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "calls": self.calls,
+                "seconds": self.seconds,
+                "counts": self.counts,
+                "gauges": self.gauges,
+            }.items()
+        )
+        return f"<Stats.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    @contextlib.contextmanager
+    def timer(self, stage: str):
+        """
+        Context manager adding its wall time to a stage.
+
+        @param {str} stage - Stage name, e.g. "npv.integrate".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def count(self, name: str, n: int = 1):
+        """
+        Increment a counter.
+
+        @param {str} name - Counter name, e.g. "chf_evaluations".
+        @param {int} [n=1] - Increment.
+        """
+        self.counts[name] = self.counts.get(name, 0) + int(n)
+
+    def gauge(self, name: str, value: float):
+        """
+        Set a gauge to its latest value.
+
+        @param {str} name - Gauge name, e.g. "quad_error".
+        @param {float} value - Latest value.
+        """
+        self.gauges[name] = value
+
+    def emit(self, event: str, **record):
+        """
+        Close an instrumented call: count it and pass its record to the callback.
+
+        @param {str} event - Event name, e.g. "npv".
+        @param {Dict} record - Fields of the call.
+        """
+        self.calls[event] = self.calls.get(event, 0) + 1
+        if self.callback is not None:
+            self.callback(event, record)
+
+    def reset(self):
+        """
+        Clear every accumulated value; the callback is kept.
+        """
+        self.calls.clear()
+        self.seconds.clear()
+        self.counts.clear()
+        self.gauges.clear()
+
+    def to_dict(self) -> typing.Dict:
+        """
+        Snapshot of the accumulated values.
+
+        @returns {Dict} Calls, seconds per stage, counters and gauges.
+        """
+        return {
+            "calls": dict(self.calls),
+            "seconds": dict(self.seconds),
+            "counts": dict(self.counts),
+            "gauges": dict(self.gauges),
+        }
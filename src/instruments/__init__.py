@@ -2,4 +2,4 @@
 # -*- coding: utf-8 -*-
 
 from .base import Instrument
-from .option import EuropeanVanillaOption
\ No newline at end of file
+from .option import EuropeanVanillaOption, OptionBook, OptionView
@@ -11,7 +11,7 @@ __author__ = None
 __copyright__ = None
 
 
-from instruments.base import Instrument
+from .base import Instrument
 import numpy as np
 import typing
 
@@ -200,7 +200,7 @@ class EuropeanVanillaOption(Instrument):
         @param {Object} engine - The engine used for delta calculation.
         """
         assert hasattr(engine, "delta")
-        self.delta = engine.npv([self])[0]
+        self.delta = engine.delta([self])[0]
 
     def set_vega(self, engine: object):
         """
@@ -265,12 +265,12 @@ class EuropeanVanillaOptions(object):
 
     def set_delta(self, engine: object):
         """
-        Set the delta greek (Gamma) for each option using the provided engine.
+        Set the delta greek (Delta) for each option using the provided engine.
 
         @param {Object} engine - The engine used for delta calculation.
         """
         assert hasattr(engine, "delta")
-        deltas = engine.npv(self.options)
+        deltas = engine.delta(self.options)
         for option, delta in zip(self.options, deltas):
             option.delta = delta
 
@@ -295,3 +295,336 @@ class EuropeanVanillaOptions(object):
         gammas = engine.gamma(self.options)
         for option, gamma in zip(self.options, gammas):
             option.gamma = gamma
+
+
+class OptionView(object):
+    __slots__ = ("_book", "_i")
+
+    def __init__(self, book: "OptionBook", i: int):
+        """
+        OptionView class representing a single row of an OptionBook.
+
+        Reads and writes go straight to the book's columns, no data is copied.
+
+        @param {OptionBook} book - The option book owning the data.
+        @param {int} i - Row index inside the book.
+        """
+        self._book = book
+        self._i = i
+
+    @property
+    def s0(self):
+        return float(self._book.s0[self._i])
+
+    @property
+    def strike(self):
+        return float(self._book.strike[self._i])
+
+    @property
+    def tau(self):
+        return float(self._book.tau[self._i])
+
+    @property
+    def flag(self):
+        return int(self._book.flag[self._i])
+
+    @property
+    def flag_s(self):
+        return "c" if self.flag == +1 else "p"
+
+    @property
+    def sigma(self):
+        return float(self._book.sigma[self._i])
+
+    @property
+    def quote(self):
+        return float(self._book.quote[self._i])
+
+    @property
+    def delta(self):
+        return float(self._book.delta[self._i])
+
+    @property
+    def gamma(self):
+        return float(self._book.gamma[self._i])
+
+    @property
+    def vega(self):
+        return float(self._book.vega[self._i])
+
+    @property
+    def kwargs(self):
+        v0 = self._book.v0[self._i]
+        return {} if np.isnan(v0) else {"v0": float(v0)}
+
+    @s0.setter
+    def s0(self, x):
+        assert isinstance(x, (float, int)) and x >= 0.0
+        self._book.s0[self._i] = x
+
+    @strike.setter
+    def strike(self, x):
+        assert isinstance(x, (float, int)) and x >= 0.0
+        self._book.strike[self._i] = x
+
+    @tau.setter
+    def tau(self, x):
+        assert isinstance(x, (float, int)) and x >= 0.0
+        self._book.tau[self._i] = x
+
+    @flag.setter
+    def flag(self, x):
+        assert isinstance(x, int) and x in (1, -1)
+        self._book.flag[self._i] = x
+
+    @sigma.setter
+    def sigma(self, x):
+        assert isinstance(x, float) and x >= 0.0
+        self._book.sigma[self._i] = x
+
+    @quote.setter
+    def quote(self, x):
+        assert isinstance(x, (float, int)) and x >= 0.0
+        self._book.quote[self._i] = x
+
+    @delta.setter
+    def delta(self, x):
+        self._book.delta[self._i] = x
+
+    @gamma.setter
+    def gamma(self, x):
+        self._book.gamma[self._i] = x
+
+    @vega.setter
+    def vega(self, x):
+        self._book.vega[self._i] = x
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the OptionView.
+
+        @returns {str} String representation of the option.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "s0": self.s0,
+                "strike": self.strike,
+                "tau": self.tau,
+                "flag": self.flag_s,
+                "sigma": self.sigma,
+                "quote": self.quote,
+            }.items()
+        )
+        return f"<Instrument.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def to_option(self) -> EuropeanVanillaOption:
+        """
+        Materialize the row as a standalone EuropeanVanillaOption.
+
+        @returns {EuropeanVanillaOption} Copy of the row.
+        """
+        option = EuropeanVanillaOption(
+            s0=self.s0,
+            strike=self.strike,
+            tau=self.tau,
+            flag=self.flag,
+            sigma=self.sigma,
+            quote=self.quote,
+            **self.kwargs,
+        )
+        option.delta, option.gamma, option.vega = self.delta, self.gamma, self.vega
+        return option
+
+
+class OptionBook(object):
+    columns = ("s0", "strike", "tau", "flag", "sigma", "quote", "v0")
+    greeks = ("delta", "gamma", "vega")
+
+    def __init__(
+        self,
+        s0,
+        strike,
+        tau,
+        flag=+1,
+        sigma=0.0,
+        quote=0.0,
+        v0=np.nan,
+    ):
+        """
+        OptionBook class holding European vanilla options as contiguous columns.
+
+        Scalars are broadcast to the book length; float64 (int64 for `flag`)
+        contiguous arrays of the right length are stored without copying.
+
+        @param {float|np.ndarray} s0 - Initial prices of the underlying asset.
+        @param {float|np.ndarray} strike - Strike prices of the options.
+        @param {float|np.ndarray} tau - Times to expiration in years.
+        @param {int|np.ndarray} [flag=+1] - Option type flags: +1 for call, -1 for put.
+        @param {float|np.ndarray} [sigma=0.0] - Implied volatilities of the options.
+        @param {float|np.ndarray} [quote=0.0] - Quote values of the options.
+        @param {float|np.ndarray} [v0=nan] - Initial variances, nan falls back to the engine's.
+        """
+        n = np.broadcast(s0, strike, tau, flag, sigma, quote, v0).size
+        self.s0 = self._column(s0, n, np.float64)
+        self.strike = self._column(strike, n, np.float64)
+        self.tau = self._column(tau, n, np.float64)
+        self.flag = self._column(flag, n, np.int64)
+        self.sigma = self._column(sigma, n, np.float64)
+        self.quote = self._column(quote, n, np.float64)
+        self.v0 = self._column(v0, n, np.float64)
+        self.delta = np.zeros(n)
+        self.gamma = np.zeros(n)
+        self.vega = np.zeros(n)
+
+        assert np.all(np.isin(self.flag, (1, -1)))
+        assert np.all(self.s0 >= 0.0) and np.all(self.strike >= 0.0)
+        assert np.all(self.tau >= 0.0)
+
+    @staticmethod
+    def _column(x, n: int, dtype) -> np.ndarray:
+        """
+        Return `x` as a writable contiguous column of length `n`.
+
+        @param {float|np.ndarray} x - Column values or scalar fill value.
+        @param {int} n - Length of the book.
+        @param {np.dtype} dtype - Column dtype.
+        @returns {np.ndarray} Column array, `x` itself when no conversion is needed.
+        """
+        if np.ndim(x) == 0:
+            return np.full(n, x, dtype=dtype)
+        x = np.ascontiguousarray(x, dtype=dtype)
+        assert x.shape == (n,)
+        return x
+
+    @classmethod
+    def from_options(cls, options: typing.List[EuropeanVanillaOption]):
+        """
+        Build an OptionBook from a list of option objects.
+
+        @param {List} options - List of European vanilla options.
+        @returns {OptionBook} Columnar copy of the options.
+        """
+        assert isinstance(options, list)
+        assert all(isinstance(option, EuropeanVanillaOption) for option in options)
+        n = len(options)
+        book = cls(
+            s0=np.fromiter((option.s0 for option in options), np.float64, n),
+            strike=np.fromiter((option.strike for option in options), np.float64, n),
+            tau=np.fromiter((option.tau for option in options), np.float64, n),
+            flag=np.fromiter((option.flag for option in options), np.int64, n),
+            sigma=np.fromiter((option.sigma for option in options), np.float64, n),
+            quote=np.fromiter((option.quote for option in options), np.float64, n),
+            v0=np.fromiter(
+                (option.kwargs.get("v0", np.nan) for option in options), np.float64, n
+            ),
+        )
+        book.delta[:] = np.fromiter((option.delta for option in options), np.float64, n)
+        book.gamma[:] = np.fromiter((option.gamma for option in options), np.float64, n)
+        book.vega[:] = np.fromiter((option.vega for option in options), np.float64, n)
+        return book
+
+    @property
+    def flag_s(self) -> np.ndarray:
+        return np.where(self.flag == +1, "c", "p")
+
+    def __len__(self) -> int:
+        return self.strike.shape[0]
+
+    def __getitem__(self, key):
+        """
+        Return a row view for an integer key, or a sub-book for a slice or mask.
+
+        Slices share memory with this book, fancy indexes and masks copy.
+
+        @param {int|slice|np.ndarray} key - Row selector.
+        @returns {OptionView|OptionBook} Selected row(s).
+        """
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("OptionBook index out of range")
+            return OptionView(self, int(key))
+        book = object.__new__(self.__class__)
+        for name in self.columns + self.greeks:
+            setattr(book, name, getattr(self, name)[key])
+        return book
+
+    def __iter__(self):
+        return (OptionView(self, i) for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the OptionBook.
+
+        @returns {str} String representation of the book.
+        """
+        params = (f"{k}={repr(v)}" for k, v in {"options": len(self)}.items())
+        return f"<Instrument.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def to_options(self) -> typing.List[EuropeanVanillaOption]:
+        """
+        Materialize the book as a list of EuropeanVanillaOption objects.
+
+        @returns {List} List of European vanilla options.
+        """
+        return [view.to_option() for view in self]
+
+    def set_npv(self, engine: object):
+        """
+        Set the net present value (NPV) for each option using the provided engine.
+
+        @param {Object} engine - The engine used for NPV calculation.
+        """
+        assert hasattr(engine, "npv")
+        self.quote[:] = engine.npv(self)
+
+    def set_sigma(self, engine: object):
+        """
+        Set the implied volatility (sigma) for each option using the provided engine.
+
+        @param {Object} engine - The engine used for implied volatility calculation.
+        """
+        assert hasattr(engine, "implied_volatility")
+        self.sigma[:] = engine.implied_volatility(self)
+
+    def set_delta(self, engine: object):
+        """
+        Set the delta greek (Delta) for each option using the provided engine.
+
+        @param {Object} engine - The engine used for delta calculation.
+        """
+        assert hasattr(engine, "delta")
+        self.delta[:] = engine.delta(self)
+
+    def set_vega(self, engine: object):
+        """
+        Set the vega greek (Vega) for each option using the provided engine.
+
+        @param {Object} engine - The engine used for vega calculation.
+        """
+        assert hasattr(engine, "vega")
+        self.vega[:] = engine.vega(self)
+
+    def set_gamma(self, engine: object):
+        """
+        Set the gamma greek (Gamma) for each option using the provided engine.
+
+        @param {Object} engine - The engine used for gamma calculation.
+        """
+        assert hasattr(engine, "gamma")
+        self.gamma[:] = engine.gamma(self)
+
+    def set_greeks(self, engine: object):
+        """
+        Set the NPV, delta, gamma and vega for each option in one engine call.
+
+        @param {Object} engine - The engine used for the calculation.
+        """
+        assert hasattr(engine, "price_and_greeks")
+        npv, delta, gamma, vega = engine.price_and_greeks(self)
+        self.quote[:] = npv
+        self.delta[:] = delta
+        self.gamma[:] = gamma
+        self.vega[:] = vega
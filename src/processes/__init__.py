@@ -4,4 +4,23 @@
 __author__      = None
 __copyright__   = None
 
-from .base import StochasticProcess
+from .._lazy import attach
+
+__all__ = ["base", "heston", "qmc", "reducers"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    __all__,
+    {
+        "StochasticProcess": "base",
+        "HestonProcess": "heston",
+        "BrownianBridge": "qmc",
+        "sobol_normals": "qmc",
+        "sobol_increments": "qmc",
+        "Reducer": "reducers",
+        "TerminalReducer": "reducers",
+        "MaxReducer": "reducers",
+        "MinReducer": "reducers",
+        "AverageReducer": "reducers",
+    },
+)
@@ -11,12 +11,16 @@ __author__ = None
 __copyright__ = None
 
 
+from ..instrumentation.base import Stats
 from abc import ABC, abstractmethod
 import numpy as np
-import scipy
+import typing
 
 
 class StochasticProcess(ABC):
+    # opt-in instrumentation, see `instrument`
+    stats: Stats = None
+
     def __init__(self):
         """
         Constructor method for StochasticProcess.
@@ -31,6 +35,22 @@ class StochasticProcess(ABC):
         """
         pass
 
+    @classmethod
+    def instrument(cls, callback: typing.Callable = None) -> Stats:
+        """
+        Attach a fresh `Stats` to the process class, enabling its instrumentation.
+
+        The processes are used through static methods, so the stats are shared
+        by every caller in this interpreter; blocks simulated by worker processes
+        (`n_workers` > 1) are not recorded. Set `cls.stats = None` to disable it.
+
+        @param {Callable} [callback=None] - Called as callback(event, record) at
+        the end of every instrumented call.
+        @returns {Stats} The attached stats.
+        """
+        cls.stats = Stats(callback)
+        return cls.stats
+
     @staticmethod
     def std_error(arr: np.ndarray) -> float:
         """
@@ -39,4 +59,44 @@ class StochasticProcess(ABC):
         @param {np.ndarray} arr - Input array.
         @returns {float} Standard error of the array.
         """
-        return scipy.stats.sem(arr)
+        # scipy.stats.sem, without importing scipy.stats
+        return np.std(arr, axis=0, ddof=1) / np.sqrt(np.shape(arr)[0])
+
+    @staticmethod
+    def child_seeds(
+        seed: typing.Union[int, np.random.SeedSequence], n_children: int
+    ) -> typing.List[np.random.SeedSequence]:
+        """
+        Child streams of a root seed, the ones `spawn` gives on a fresh
+        `np.random.SeedSequence(seed)`. A caller's sequence is not advanced, so
+        the same seed always gives the same children.
+
+        @param {int|np.random.SeedSequence} seed - Root seed.
+        @param {int} n_children - Number of child streams.
+        @returns {List[np.random.SeedSequence]} Child seed sequences.
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        return [
+            np.random.SeedSequence(
+                seed.entropy,
+                spawn_key=seed.spawn_key + (i,),
+                pool_size=seed.pool_size,
+            )
+            for i in range(n_children)
+        ]
+
+    @staticmethod
+    def batch_error(arr: np.ndarray, block_size: int) -> np.ndarray:
+        """
+        Calculate the standard error of the mean of an array from the means of
+        its consecutive blocks, e.g. the independent randomizations of a
+        randomized quasi-Monte Carlo run (`HestonProcess.simulate` with `qmc`).
+
+        @param {np.ndarray} arr - Input array, blocks along the first axis.
+        @param {int} block_size - Number of entries per block.
+        @returns {np.ndarray} Standard error of the mean.
+        """
+        assert len(arr) % block_size == 0 and len(arr) > block_size
+        means = np.reshape(arr, (-1, block_size) + np.shape(arr)[1:]).mean(axis=1)
+        return StochasticProcess.std_error(means)
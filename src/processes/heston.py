@@ -11,97 +11,494 @@ __author__ = None
 __copyright__ = None
 
 
-from processes.base import StochasticProcess
-from engines.heston import HestonEngine
+from .qmc import sobol_increments, sobol_block_size
+from concurrent.futures import ProcessPoolExecutor
+from ..engines.heston import HestonEngine
+from .base import StochasticProcess
+from .reducers import Reducer
+import multiprocessing
 import numpy as np
+import typing
+import scipy
+import copy
+import time
+import sys
 
 
 class HestonProcess(StochasticProcess):
+    # paths per block of `simulate`: the unit of its random streams and tasks
+    default_block_size = 2**14
+
     @staticmethod
-    def paths(
+    def steps(
         engine: HestonEngine, n_paths: int, n_steps: int, horizon: float, **kwargs
-    ):
+    ) -> typing.Iterator[typing.Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
         """
-        Simulate paths for the Heston process.
+        Stream the Heston process one time slice at a time.
+
+        Only the current state is held. Euler and Milstein steps are computed by
+        the engine's backend, which writes them alternately into two sets of
+        state buffers allocated once: the arrays of a slice stay valid while the
+        next one is used and are overwritten by the one after, so copy them to
+        keep them longer. The QE scheme allocates fresh arrays. The exception is
+        qmc: a Sobol point covers every step of its path, so the Brownian paths
+        of all the points, 2 * (n_steps + 1) * n_paths floats, are held for the
+        whole stream; `simulate` bounds them with blocks of paths.
 
         @param (HestonEngine) engine - The Heston engine instance.
         @param (int) n_paths - Number of paths to simulate.
         @param (int) n_steps - Number of time steps.
         @param (float) horizon - Time horizon for the simulation.
-        **kwargs: Additional keyword arguments.
+        **kwargs: Additional keyword arguments (discretization; scheme: "euler",
+        "milstein" or "qe", the quadratic-exponential scheme, which ignores the
+        discretization; measure; antithetic: pair every path with its mirror,
+        drawn with negated normals; rng: np.random.Generator to draw from
+        instead of the global state; qmc: drive the paths with one scrambled
+        Sobol point per path and Brownian-bridge increments, scrambled by rng).
 
-        @returns Tuple[np.ndarray, np.ndarray, np.ndarray] Transposed arrays of asset prices,
-        volatilities, and adjusted correlations.
+        @returns Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] Time step
+        index (0 for the initial state), asset prices, variances and adjusted
+        correlations of the paths.
+        """
+        if HestonProcess.stats is not None:
+            return HestonProcess._timed(
+                HestonProcess._steps(engine, n_paths, n_steps, horizon, **kwargs),
+                n_paths,
+            )
+        return HestonProcess._steps(engine, n_paths, n_steps, horizon, **kwargs)
+
+    @staticmethod
+    def _steps(
+        engine: HestonEngine, n_paths: int, n_steps: int, horizon: float, **kwargs
+    ) -> typing.Iterator[typing.Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Generator behind `steps`, see its documentation.
         """
         dt = horizon / n_steps
-        sqrt_dt = np.sqrt(dt)
 
         # Get optional parameters or use defaults
         discretization = kwargs.get("discretization", "truncation")
         scheme = kwargs.get("scheme", "milstein")
         measure = kwargs.get("measure", "rn")
+        antithetic = kwargs.get("antithetic", False)
+        rng = kwargs.get("rng", None)
+        draw = np.random.randn if rng is None else rng.standard_normal
+        quasi = kwargs.get("qmc", False)
 
         # Validate parameters
         assert discretization in ("truncation", "reflection")
-        assert scheme in ("milstein", "euler")
+        assert scheme in ("milstein", "euler", "qe")
         assert measure in ("rn", "rw")
         assert isinstance(engine, HestonEngine)
+        assert not antithetic or n_paths % 2 == 0
+        assert not (antithetic and quasi)
+
+        if quasi:
+            if rng is None:
+                rng = np.random.default_rng(np.random.randint(2**32, dtype=np.uint64))
+            # zv and zs of each step, in the order they are drawn
+            increments = sobol_increments(n_paths, n_steps, 2, rng)
+            normals = (z for step in increments for z in step)
 
-        zs = np.zeros((n_steps + 1, n_paths))
-        s = np.zeros((n_steps + 1, n_paths))
-        v = np.zeros((n_steps + 1, n_paths))
-        rho_adj = np.zeros((n_steps + 1, n_paths))
+            def draw(size):
+                return next(normals)
+
+        if scheme == "qe":
+            yield from HestonProcess._steps_qe(
+                engine, n_paths, n_steps, horizon, measure, antithetic, draw
+            )
+            return
 
         # Initialize starting values
-        rho_adj[0, :] = engine.rho
-        v[0, :] = engine.v0
-        s[0, :] = engine.s0
+        rho_adj = np.full(n_paths, float(engine.rho))
+        v = np.full(n_paths, float(engine.v0))
+        s = np.full(n_paths, float(engine.s0))
+        yield 0, s, v, rho_adj
+
+        spare = (np.empty(n_paths), np.empty(n_paths), np.empty(n_paths))
+        for t_step in range(1, n_steps + 1):
+            if antithetic:
+                zv_t = draw(n_paths // 2)
+                zs_t = draw(n_paths // 2)
+                zv_t = np.concatenate([zv_t, -zv_t])
+                zs_t = np.concatenate([zs_t, -zs_t])
+            else:
+                zv_t = draw(n_paths)
+                zs_t = draw(n_paths)
+
+            state = (s, v, rho_adj)
+            s, v, rho_adj = engine.backend.step(
+                engine,
+                s,
+                v,
+                rho_adj,
+                zv_t,
+                zs_t,
+                dt,
+                scheme,
+                discretization,
+                measure,
+                out=spare,
+            )
+            spare = state
+            yield t_step, s, v, rho_adj
+
+    @staticmethod
+    def _timed(
+        steps: typing.Iterator[typing.Tuple], n_paths: int
+    ) -> typing.Iterator[typing.Tuple]:
+        """
+        Forward the slices of `steps`, timing their generation for the stats.
+
+        Only the time spent inside the generator is counted, not the caller's
+        work between slices. The stats are updated when the stream ends or is
+        closed early: "paths" and "path_steps" counters, "steps.generate" stage
+        and "path_throughput" gauge in path steps per second.
+
+        @param (Iterator[Tuple]) steps - Stream of `_steps`.
+        @param (int) n_paths - Number of simulated paths.
+
+        @returns Iterator[Tuple] The same slices.
+        """
+        stats = HestonProcess.stats
+        elapsed = 0.0
+        n_slices = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(steps)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                n_slices += 1
+                yield item
+        finally:
+            n_path_steps = n_paths * max(n_slices - 1, 0)
+            stats.count("paths", n_paths)
+            stats.count("path_steps", n_path_steps)
+            stats.seconds["steps.generate"] = (
+                stats.seconds.get("steps.generate", 0.0) + elapsed
+            )
+            if elapsed > 0.0:
+                stats.gauge("path_throughput", n_path_steps / elapsed)
+            stats.emit("steps", paths=n_paths, steps=n_slices - 1, seconds=elapsed)
+
+    @staticmethod
+    def _steps_qe(
+        engine: HestonEngine,
+        n_paths: int,
+        n_steps: int,
+        horizon: float,
+        measure: str,
+        antithetic: bool,
+        draw: typing.Callable,
+    ) -> typing.Iterator[typing.Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Stream the Heston process with the quadratic-exponential scheme.
+
+        The variance is sampled from the moment-matched quadratic or exponential
+        law of Andersen (2008), and the log spot with the central discretization
+        (gamma_1 = gamma_2 = 1/2) of the integrated variance plus the martingale
+        correction of K_0, so that E[S_{t+dt} | S_t] is exact. The displacement
+        phi adds phi * dt of variance to the part of the spot shock independent
+        of the variance, which keeps the covariance of log spot and variance at
+        rho * sigma * v as in the model; rho_adj is the resulting correlation.
+
+        @param (HestonEngine) engine - The Heston engine instance.
+        @param (int) n_paths - Number of paths to simulate.
+        @param (int) n_steps - Number of time steps.
+        @param (float) horizon - Time horizon for the simulation.
+        @param (str) measure - "rn" or "rw".
+        @param (bool) antithetic - Pair every path with its mirror.
+        @param (Callable) draw - Standard normal sampler.
+
+        @returns Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] Time step
+        index, asset prices, variances and adjusted correlations of the paths.
+        """
+        kappa, theta, sigma, rho, phi = (
+            engine.kappa,
+            engine.theta,
+            engine.sigma,
+            engine.rho,
+            engine.phi,
+        )
+        dt = horizon / n_steps
+        drift = engine.risk_free_rate if measure == "rn" else engine.mu
+        drift = (drift - engine.dividend_yield) * dt
+
+        psi_c = 1.5
+        e = np.exp(-kappa * dt)
+        k1 = 0.5 * dt * (kappa * rho / sigma - 0.5) - rho / sigma
+        k2 = 0.5 * dt * (kappa * rho / sigma - 0.5) + rho / sigma
+        k3 = 0.5 * dt * (1.0 - rho**2)
+        a_ = k2 + 0.5 * k3
 
-        zv_adj = 0.0
-        zs_adj = 0.0
+        rho_adj = np.full(n_paths, float(rho))
+        v = np.full(n_paths, float(engine.v0))
+        s = np.full(n_paths, float(engine.s0))
+        yield 0, s, v, rho_adj
 
         for t_step in range(1, n_steps + 1):
-            zv_t = np.random.randn(n_paths)
-            zs_t = np.random.randn(n_paths)
-
-            if scheme == "euler":
-                v[t_step] = (
-                    v[t_step - 1]
-                    + engine.kappa * (engine.theta - v[t_step - 1]) * dt
-                    + engine.sigma * np.sqrt(v[t_step - 1]) * (sqrt_dt * zv_t + zv_adj)
-                )
-            elif scheme == "milstein":
-                v[t_step] = (
-                    v[t_step - 1]
-                    + engine.kappa * (engine.theta - v[t_step - 1]) * dt
-                    + engine.sigma * np.sqrt(v[t_step - 1]) * (sqrt_dt * zv_t + zv_adj)
-                    + 1 / 4 * engine.sigma**2 * dt * ((zv_t + zv_adj) ** 2 - 1)
+            if antithetic:
+                zv_t = draw(n_paths // 2)
+                zs_t = draw(n_paths // 2)
+                zv_t = np.concatenate([zv_t, -zv_t])
+                zs_t = np.concatenate([zs_t, -zs_t])
+            else:
+                zv_t = draw(n_paths)
+                zs_t = draw(n_paths)
+
+            # moments of v_{t+dt} given v_t
+            m = theta + (v - theta) * e
+            s2 = v * sigma**2 * e * (1.0 - e) / kappa + theta * sigma**2 * (
+                1.0 - e
+            ) ** 2 / (2.0 * kappa)
+            psi = s2 / (m * m)
+
+            # quadratic branch
+            quad = psi <= psi_c
+            inv_psi = 2.0 / np.where(quad, psi, psi_c)
+            b2 = inv_psi - 1.0 + np.sqrt(inv_psi * (inv_psi - 1.0))
+            a = m / (1.0 + b2)
+            b = np.sqrt(b2)
+
+            # exponential branch
+            p = np.where(quad, 0.0, (psi - 1.0) / (psi + 1.0))
+            beta = (1.0 - p) / m
+            u = scipy.special.ndtr(zv_t)
+            v_exp = np.where(
+                u > p, np.log((1.0 - p) / np.maximum(1.0 - u, 1e-300)) / beta, 0.0
+            )
+            v_t = np.where(quad, a * (b + zv_t) ** 2, v_exp)
+
+            # martingale correction of K_0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                k0 = (
+                    np.where(
+                        quad,
+                        -a_ * b2 * a / (1.0 - 2.0 * a_ * a)
+                        + 0.5 * np.log(1.0 - 2.0 * a_ * a),
+                        -np.log(p + beta * (1.0 - p) / (beta - a_)),
+                    )
+                    - (k1 + 0.5 * k3) * v
                 )
 
-            if discretization == "reflection":
-                v[t_step] = np.abs(v[t_step])
-            elif discretization == "truncation":
-                v[t_step] = np.maximum(v[t_step], 0.00001)
+            s = s * np.exp(
+                drift
+                + k0
+                + k1 * v
+                + k2 * v_t
+                + np.sqrt(k3 * (v + v_t) + phi * dt) * zs_t
+                - 0.5 * phi * dt
+            )
 
-            phi_t = engine.phi
-            if engine.phi == 0:
-                rho_adj[t_step] = engine.rho
+            if phi == 0:
+                rho_adj_t = np.full(n_paths, float(rho))
             else:
-                rho_adj[t_step] = engine.rho * np.sqrt(v[t_step] / (v[t_step] + phi_t))
-
-            zs[t_step] = (rho_adj[t_step - 1]) * zv_t + np.sqrt(
-                1 - (rho_adj[t_step - 1]) ** 2
-            ) * zs_t
-            if measure == "rn":
-                s[t_step] = s[t_step - 1] * np.exp(
-                    (engine.risk_free_rate - engine.dividend_yield - v[t_step - 1] / 2)
-                    * dt
-                    + np.sqrt(v[t_step - 1] + phi_t) * sqrt_dt * zs[t_step]
+                rho_adj_t = rho * np.sqrt(v_t / (v_t + phi))
+            v, rho_adj = v_t, rho_adj_t
+            yield t_step, s, v, rho_adj
+
+    @staticmethod
+    def simulate(
+        engine: HestonEngine,
+        n_paths: int,
+        n_steps: int,
+        horizon: float,
+        reducers: typing.Dict[str, Reducer],
+        block_size: int = None,
+        seed: typing.Union[int, np.random.SeedSequence] = None,
+        n_workers: int = 1,
+        **kwargs,
+    ) -> typing.Dict[str, np.ndarray]:
+        """
+        Run the Heston process through running reducers without storing paths.
+
+        Paths are simulated in blocks of `block_size`; each block feeds fresh
+        copies of the reducers, merged in block order. The default block is
+        `default_block_size` paths, whatever the number of workers; with qmc it
+        is at most the largest power of two whose Brownian paths fit in 128 MiB,
+        see `sobol_block_size`, and each block is an independent randomization.
+
+        Without a seed the blocks draw one after the other from the global
+        NumPy state. With a seed every block draws from its own child stream of
+        `np.random.SeedSequence(seed)`, see `child_seeds`, so the blocks are
+        independent tasks: they are mapped onto `n_workers` processes and the
+        result only depends on the seed and the block size, never on the number
+        of workers. A SeedSequence passed as seed is not advanced, so the same
+        seed always gives the same paths. Once Numba is loaded the workers are
+        started by a fork server, as its thread pool does not survive a fork:
+        scripts then run `simulate` under `if __name__ == "__main__":`.
+
+        @param (HestonEngine) engine - The Heston engine instance.
+        @param (int) n_paths - Number of paths to simulate.
+        @param (int) n_steps - Number of time steps.
+        @param (float) horizon - Time horizon for the simulation.
+        @param (Dict[str, Reducer]) reducers - Named reducers, used as prototypes.
+        @param (int) block_size - Paths per block, `default_block_size` by
+        default (bounded with qmc).
+        @param (int|np.random.SeedSequence) seed - Root seed of the block streams.
+        @param (int) n_workers - Number of worker processes, seeded runs only.
+        **kwargs: Additional keyword arguments passed to `steps`.
+
+        @returns Dict[str, np.ndarray] Result of each reducer.
+        """
+        assert all(isinstance(reducer, Reducer) for reducer in reducers.values())
+        if block_size is None:
+            block_size = HestonProcess.default_block_size
+            if kwargs.get("qmc", False):
+                block_size = min(block_size, sobol_block_size(n_steps))
+        assert block_size > 0 and n_workers > 0
+        assert seed is not None or n_workers == 1
+
+        starts = range(0, n_paths, block_size)
+        sizes = [min(block_size, n_paths - start) for start in starts]
+        if seed is None:
+            streams = [None] * len(sizes)
+        else:
+            streams = HestonProcess.child_seeds(seed, len(sizes))
+        tasks = [
+            (engine, n_block, n_steps, horizon, reducers, stream, kwargs)
+            for n_block, stream in zip(sizes, streams)
+        ]
+
+        if n_workers == 1 or len(tasks) == 1:
+            blocks = map(_simulate_block, tasks)
+            merged = HestonProcess._merge(reducers, blocks)
+        else:
+            context = None
+            if "numba" in sys.modules:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                )
+            with ProcessPoolExecutor(
+                max_workers=min(n_workers, len(tasks)), mp_context=context
+            ) as pool:
+                merged = HestonProcess._merge(
+                    reducers, pool.map(_simulate_block, tasks)
                 )
-            elif measure == "rw":
-                s[t_step] = s[t_step - 1] * np.exp(
-                    (engine.mu - engine.dividend_yield - v[t_step - 1] / 2) * dt
-                    + np.sqrt(v[t_step - 1] + phi_t) * (sqrt_dt * zs[t_step] + zs_adj)
+
+        return {name: reducer.result() for name, reducer in merged.items()}
+
+    @staticmethod
+    def _merge(
+        reducers: typing.Dict[str, Reducer],
+        blocks: typing.Iterable[typing.Dict[str, Reducer]],
+    ) -> typing.Dict[str, Reducer]:
+        """
+        Merge the reducers of consecutive blocks, in block order.
+
+        @param (Dict[str, Reducer]) reducers - Named reducers, used as prototypes.
+        @param (Iterable[Dict[str, Reducer]]) blocks - Reducers of each block.
+
+        @returns Dict[str, Reducer] Reducers over all the paths.
+        """
+        merged = {name: copy.deepcopy(reducer) for name, reducer in reducers.items()}
+        for block in blocks:
+            for name, reducer in block.items():
+                merged[name].merge(reducer)
+        return merged
+
+    @staticmethod
+    def paths(
+        engine: HestonEngine,
+        n_paths: int,
+        n_steps: int,
+        horizon: float,
+        dtype: typing.Union[str, np.dtype] = np.float64,
+        fields: typing.Tuple[str, ...] = ("s", "vol", "rho"),
+        layout: str = "path",
+        out: typing.Dict[str, np.ndarray] = None,
+        memmap: str = None,
+        **kwargs,
+    ):
+        """
+        Simulate paths for the Heston process.
+
+        Every time slice of `steps` is written straight into the output arrays,
+        so nothing beyond the requested fields is allocated. When phi is 0 the
+        adjusted correlation is constant and "rho" is returned as a read-only
+        broadcast of it, unless an output array is supplied for it.
+
+        @param (HestonEngine) engine - The Heston engine instance.
+        @param (int) n_paths - Number of paths to simulate.
+        @param (int) n_steps - Number of time steps.
+        @param (float) horizon - Time horizon for the simulation.
+        @param (str|np.dtype) dtype - Output dtype, e.g. float32; the simulation
+        itself runs in float64.
+        @param (Tuple[str]) fields - Fields to materialize, in the returned order,
+        among "s" (asset prices), "vol" (volatilities), "v" (variances) and
+        "rho" (adjusted correlations).
+        @param (str) layout - "path" for arrays of shape (n_paths, n_steps + 1),
+        "time" for (n_steps + 1, n_paths).
+        @param (Dict[str, np.ndarray]) out - Arrays, e.g. np.memmap, to write the
+        fields into, with the shape of the layout.
+        @param (str) memmap - Path prefix of .npy files, one per field not in
+        `out`, created with np.lib.format.open_memmap and written out of core.
+        **kwargs: Additional keyword arguments passed to `steps`.
+
+        @returns Tuple[np.ndarray, ...] Arrays of the fields, by default asset
+        prices, volatilities and adjusted correlations of shape (n_paths, n_steps + 1).
+        """
+        assert layout in ("path", "time")
+        assert len(fields) > 0 and all(f in ("s", "vol", "v", "rho") for f in fields)
+        out = {} if out is None else dict(out)
+        shape = (n_paths, n_steps + 1) if layout == "path" else (n_steps + 1, n_paths)
+
+        arrays = {}
+        for field in fields:
+            if field in out:
+                assert out[field].shape == shape
+                arrays[field] = out[field]
+            elif field == "rho" and engine.phi == 0:
+                arrays[field] = np.broadcast_to(np.asarray(engine.rho, dtype), shape)
+            elif memmap is not None:
+                arrays[field] = np.lib.format.open_memmap(
+                    f"{memmap}_{field}.npy", mode="w+", dtype=dtype, shape=shape
                 )
+            else:
+                arrays[field] = np.empty(shape, dtype=dtype)
+        written = [f for f in arrays if arrays[f].flags.writeable]
+
+        for t_step, s_t, v_t, rho_adj_t in HestonProcess.steps(
+            engine, n_paths, n_steps, horizon, **kwargs
+        ):
+            slices = {"s": s_t, "v": v_t, "rho": rho_adj_t}
+            for field in written:
+                x = np.sqrt(v_t) if field == "vol" else slices[field]
+                if layout == "path":
+                    arrays[field][:, t_step] = x
+                else:
+                    arrays[field][t_step] = x
+
+        for field in written:
+            if isinstance(arrays[field], np.memmap):
+                arrays[field].flush()
+        return tuple(arrays[field] for field in fields)
+
 
-        return np.transpose(s), np.transpose(np.sqrt(v)), np.transpose(rho_adj)
+def _simulate_block(task: typing.Tuple) -> typing.Dict[str, Reducer]:
+    """
+    Feed one block of paths to fresh copies of the reducers.
+
+    Module-level so that it can be sent to worker processes.
+
+    @param (Tuple) task - Engine, number of paths, number of steps, horizon,
+    prototype reducers, seed sequence of the block (or None) and `steps` kwargs.
+
+    @returns Dict[str, Reducer] Reducers over the block.
+    """
+    engine, n_paths, n_steps, horizon, reducers, stream, kwargs = task
+    if stream is not None:
+        kwargs = dict(kwargs, rng=np.random.default_rng(stream))
+
+    block = {name: copy.deepcopy(reducer) for name, reducer in reducers.items()}
+    for t_step, s, v, _ in HestonProcess.steps(
+        engine, n_paths, n_steps, horizon, **kwargs
+    ):
+        for reducer in block.values():
+            reducer.update(t_step, s, v)
+    return block
@@ -88,9 +88,9 @@ cpdef paths \
         zs[t_step] = (rho_adj[t_step-1])*zv_t + np.sqrt(1-(rho_adj[t_step-1])**2)*zs_t
         if measure == 'rn':
             s[t_step] = s[t_step-1] * np.exp((risk_free_rate - dividend_yield - \
-                v[t_step-1]/2)*dt + np.sqrt(v[t_step-1] + phi_t)*sqrt_dt*zs[t_step])
+                (v[t_step-1] + phi_t)/2)*dt + np.sqrt(v[t_step-1] + phi_t)*sqrt_dt*zs[t_step])
         elif measure == 'rw':
             s[t_step] = s[t_step-1] * np.exp((mu - dividend_yield - \
-                v[t_step-1]/2)*dt + np.sqrt(v[t_step-1] + phi_t)*(sqrt_dt*zs[t_step] + zs_adj))
+                (v[t_step-1] + phi_t)/2)*dt + np.sqrt(v[t_step-1] + phi_t)*(sqrt_dt*zs[t_step] + zs_adj))
 
     return np.transpose(s), np.transpose(np.sqrt(v)), np.transpose(rho_adj)
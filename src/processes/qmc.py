@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides quasi-random drivers for the simulated processes.
+It contains the class `BrownianBridge` and the functions `sobol_increments`
+and `sobol_normals`, which turn scrambled Sobol points into Brownian increments.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import numpy as np
+import typing
+import scipy
+
+
+class BrownianBridge(object):
+    def __init__(self, n_steps: int):
+        """
+        BrownianBridge class, building Brownian paths on a uniform grid of
+        `n_steps` unit steps from the terminal value inwards.
+
+        The first normal fixes W(n_steps), the next ones the midpoints of the
+        known intervals in breadth-first order, so the leading (best distributed)
+        coordinates of a low-discrepancy point drive the coarse shape of the path.
+
+        @param {int} n_steps - Number of time steps.
+        """
+        assert n_steps > 0
+        self.n_steps = n_steps
+
+        # (index, left, right, left weight, right weight, std) per normal
+        schedule = [(n_steps, 0, 0, 0.0, 0.0, np.sqrt(n_steps))]
+        intervals = [(0, n_steps)]
+        while intervals:
+            left, right = intervals.pop(0)
+            mid = (left + right) // 2
+            if mid == left:
+                continue
+            schedule.append(
+                (
+                    mid,
+                    left,
+                    right,
+                    (right - mid) / (right - left),
+                    (mid - left) / (right - left),
+                    np.sqrt((mid - left) * (right - mid) / (right - left)),
+                )
+            )
+            intervals += [(left, mid), (mid, right)]
+        self.schedule = schedule
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the BrownianBridge.
+
+        @returns {str} String representation of the bridge.
+        """
+        params = (f"{k}={repr(v)}" for k, v in {"n_steps": self.n_steps}.items())
+        return f"<Bridge.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def path(self, z: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Standard Brownian paths built from `z`, on the grid 0, 1, ..., n_steps.
+
+        @param {np.ndarray} z - Normals of shape (n_steps, ...), in bridge order.
+        @param {np.ndarray} [out=None] - Array of shape (n_steps + 1, ...) to
+        write the paths into.
+
+        @returns {np.ndarray} Paths W(t) of shape (n_steps + 1, ...), W(0) = 0.
+        """
+        assert z.shape[0] == self.n_steps
+        if out is None:
+            out = np.empty((self.n_steps + 1,) + z.shape[1:])
+        out[0] = 0.0
+        for k, (index, left, right, w_left, w_right, std) in enumerate(self.schedule):
+            out[index] = w_left * out[left] + w_right * out[right] + std * z[k]
+        return out
+
+    def increments(self, z: np.ndarray) -> np.ndarray:
+        """
+        Standard normal increments of the paths built from `z`.
+
+        @param {np.ndarray} z - Normals of shape (n_steps, ...), in bridge order.
+
+        @returns {np.ndarray} Increments W(t + 1) - W(t) of shape (n_steps, ...).
+        """
+        return np.diff(self.path(z), axis=0)
+
+
+def sobol_block_size(n_steps: int, n_drivers: int = 2, max_bytes: int = 2**27) -> int:
+    """
+    Largest power of two of paths whose Brownian paths fit in `max_bytes`.
+
+    A Sobol point covers every step of its path, so `sobol_increments` holds
+    the paths of all its points, (n_steps + 1) * n_drivers floats each, for as
+    long as the increments are streamed.
+
+    @param {int} n_steps - Number of time steps.
+    @param {int} [n_drivers=2] - Number of independent Brownian drivers.
+    @param {int} [max_bytes=2**27] - Memory budget of the paths, 128 MiB.
+
+    @returns {int} Number of paths, at least 1.
+    """
+    n_paths = max_bytes // ((n_steps + 1) * n_drivers * 8)
+    return 1 << max(int(n_paths).bit_length() - 1, 0)
+
+
+def sobol_increments(
+    n_paths: int,
+    n_steps: int,
+    n_drivers: int = 2,
+    rng: typing.Optional[np.random.Generator] = None,
+    chunk_size: int = 4096,
+) -> typing.Iterator[np.ndarray]:
+    """
+    Brownian increments driven by one scrambled Sobol point per path, streamed
+    one time step at a time.
+
+    The point has n_steps * n_drivers coordinates, interleaved so that every
+    driver gets the same share of the leading ones; they are mapped through the
+    inverse normal CDF and assigned to the time steps by Brownian bridge.
+
+    The points are drawn and bridged `chunk_size` paths at a time, so only the
+    Brownian paths, (n_steps + 1) * n_drivers * n_paths floats, are held while
+    the increments are streamed; `sobol_block_size` bounds n_paths for a budget.
+
+    @param {int} n_paths - Number of paths, ideally a power of two.
+    @param {int} n_steps - Number of time steps.
+    @param {int} [n_drivers=2] - Number of independent Brownian drivers.
+    @param {np.random.Generator} [rng=None] - Source of the scrambling.
+    @param {int} [chunk_size=4096] - Paths drawn and bridged at once.
+
+    @returns {Iterator[np.ndarray]} Standard normal increments of each time step,
+    of shape (n_drivers, n_paths).
+    """
+    assert chunk_size > 0
+    sobol = scipy.stats.qmc.Sobol(d=n_steps * n_drivers, scramble=True, seed=rng)
+    bridge = BrownianBridge(n_steps)
+    w = np.empty((n_steps + 1, n_drivers, n_paths))
+    for start in range(0, n_paths, chunk_size):
+        n_chunk = min(chunk_size, n_paths - start)
+        u = sobol.random(n_chunk)
+        z = scipy.special.ndtri(np.clip(u, 1e-16, 1.0 - 1e-16, out=u), out=u)
+        z = z.T.reshape(n_steps, n_drivers, n_chunk)
+        bridge.path(z, out=w[:, :, start : start + n_chunk])
+
+    for t_step in range(n_steps):
+        yield w[t_step + 1] - w[t_step]
+
+
+def sobol_normals(
+    n_paths: int,
+    n_steps: int,
+    n_drivers: int = 2,
+    rng: typing.Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Brownian increments driven by one scrambled Sobol point per path, see
+    `sobol_increments`.
+
+    @param {int} n_paths - Number of paths, ideally a power of two.
+    @param {int} n_steps - Number of time steps.
+    @param {int} [n_drivers=2] - Number of independent Brownian drivers.
+    @param {np.random.Generator} [rng=None] - Source of the scrambling.
+
+    @returns {np.ndarray} Standard normal increments of shape
+    (n_steps, n_drivers, n_paths).
+    """
+    return np.stack(list(sobol_increments(n_paths, n_steps, n_drivers, rng)))
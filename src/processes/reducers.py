@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides running reducers over simulated paths.
+It contains the base class `Reducer` and reducers which summarise
+paths step by step without storing them.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class Reducer(ABC):
+    def __init__(self, field: str = "s"):
+        """
+        Constructor method for Reducer.
+
+        A reducer receives every time slice of a simulation and keeps a running
+        summary per path; its state starts empty and is created on the first
+        update, so unused copies of a reducer are cheap.
+
+        @param {str} [field="s"] - State to reduce: "s" for the asset price, "v"
+        for the variance.
+        """
+        assert field in ("s", "v")
+        self.field = field
+        self.state = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Reducer.
+
+        @returns {str} String representation of the reducer.
+        """
+        params = (f"{k}={repr(v)}" for k, v in {"field": self.field}.items())
+        return f"<Reducer.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    @abstractmethod
+    def update(self, t_step: int, s: np.ndarray, v: np.ndarray):
+        """
+        Fold one time slice into the running state.
+
+        @param {int} t_step - Index of the time step, 0 for the initial state.
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} v - Variances of the paths.
+        """
+        pass
+
+    def merge(self, other: "Reducer"):
+        """
+        Append the state of a reducer run on the next block of paths.
+
+        @param {Reducer} other - Reducer of the same type over other paths.
+        """
+        assert type(other) is type(self) and other.field == self.field
+        if self.state is None:
+            self.state = other.state
+        elif other.state is not None:
+            self.state = np.concatenate([self.state, other.state])
+
+    def result(self) -> np.ndarray:
+        """
+        Returns the per-path summary.
+
+        @returns {np.ndarray} Reduced values, one per path.
+        """
+        return self.state
+
+    def _select(self, s: np.ndarray, v: np.ndarray) -> np.ndarray:
+        return s if self.field == "s" else v
+
+
+class TerminalReducer(Reducer):
+    def update(self, t_step: int, s: np.ndarray, v: np.ndarray):
+        """
+        Keep the latest slice, the terminal distribution once the run ends.
+
+        @param {int} t_step - Index of the time step, 0 for the initial state.
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} v - Variances of the paths.
+        """
+        self.state = self._select(s, v)
+
+
+class MaxReducer(Reducer):
+    def update(self, t_step: int, s: np.ndarray, v: np.ndarray):
+        """
+        Keep the running maximum of each path.
+
+        @param {int} t_step - Index of the time step, 0 for the initial state.
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} v - Variances of the paths.
+        """
+        x = self._select(s, v)
+        if self.state is None:
+            self.state = np.array(x, dtype=np.float64)
+        else:
+            np.maximum(self.state, x, out=self.state)
+
+
+class MinReducer(Reducer):
+    def update(self, t_step: int, s: np.ndarray, v: np.ndarray):
+        """
+        Keep the running minimum of each path.
+
+        @param {int} t_step - Index of the time step, 0 for the initial state.
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} v - Variances of the paths.
+        """
+        x = self._select(s, v)
+        if self.state is None:
+            self.state = np.array(x, dtype=np.float64)
+        else:
+            np.minimum(self.state, x, out=self.state)
+
+
+class AverageReducer(Reducer):
+    def __init__(self, field: str = "s", start: int = 0):
+        """
+        Constructor method for AverageReducer.
+
+        @param {str} [field="s"] - State to reduce: "s" or "v".
+        @param {int} [start=0] - First time step included in the average.
+        """
+        super().__init__(field)
+        self.start = start
+        self.count = 0
+
+    def update(self, t_step: int, s: np.ndarray, v: np.ndarray):
+        """
+        Accumulate the running sum of each path from the `start` step on.
+
+        @param {int} t_step - Index of the time step, 0 for the initial state.
+        @param {np.ndarray} s - Asset prices of the paths.
+        @param {np.ndarray} v - Variances of the paths.
+        """
+        if t_step < self.start:
+            return
+        x = self._select(s, v)
+        if self.state is None:
+            self.state = np.array(x, dtype=np.float64)
+        else:
+            self.state += x
+        self.count += 1
+
+    def merge(self, other: "AverageReducer"):
+        """
+        Append the state of a reducer run on the next block of paths.
+
+        @param {AverageReducer} other - Reducer of the same type over other paths.
+        """
+        assert self.state is None or other.count in (0, self.count)
+        count = max(self.count, other.count)
+        super().merge(other)
+        self.count = count
+
+    def result(self) -> np.ndarray:
+        """
+        Returns the arithmetic average of each path.
+
+        @returns {np.ndarray} Averages, one per path.
+        """
+        return None if self.state is None else self.state / self.count
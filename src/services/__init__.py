@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__      = None
+__copyright__   = None
+
+from .._lazy import attach
+
+__all__ = ["base", "pricing"]
+
+__getattr__, __dir__ = attach(
+    __name__, __all__, {"Service": "base", "PricingService": "pricing"}
+)
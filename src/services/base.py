@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining various services.
+It contains the base class `Service`, which serves as the foundation
+for serving the engines to other processes.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+
+
+class Service(ABC):
+    def __init__(self):
+        """
+        Constructor method for Service.
+        """
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Service.
+
+        @returns {str} String representation of the service.
+        """
+        pass
+
+    @abstractmethod
+    async def start(self, *args, **kwargs):
+        """
+        Start listening for requests.
+        """
+        pass
+
+    @abstractmethod
+    async def stop(self):
+        """
+        Stop listening and complete the pending requests.
+        """
+        pass
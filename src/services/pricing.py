@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining pricing service.
+This class inherit methods from the parent class `Service`,
+providing micro-batched pricing of concurrent requests over asyncio.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from concurrent.futures import ThreadPoolExecutor
+from ..instruments.option import OptionBook
+from ..engines.heston import HestonEngine
+from ..instrumentation.base import Stats
+from collections import OrderedDict
+from .base import Service
+import numpy as np
+import asyncio
+import typing
+import json
+import time
+
+# option book columns of the requests, besides the optional v0
+COLUMNS = ("s0", "strike", "tau", "flag")
+
+
+class PricingService(Service):
+    """
+    Pricing Service Class
+
+    This class prices the options of concurrent requests in batches. Requests
+    are queued per engine parameter set; a queue is flushed into one `npv`
+    call (`price_and_greeks` if any request asks for Greeks) as soon as it
+    holds `max_batch_size` options or its oldest request has waited
+    `max_latency` seconds, and the results are sliced back to the requests.
+    Batches are priced one at a time on a worker thread, so the event loop
+    keeps accepting requests meanwhile.
+
+    Requests come from `price` in-process, or as JSON lines over a unix socket
+    or a localhost TCP port (see `start`):
+
+        {"id": 1, "params": {"theta": 0.04, ...}, "greeks": false,
+         "options": {"s0": [...], "strike": [...], "tau": [...], "flag": [...]}}
+
+    answered by {"id": 1, "npv": [...]} (plus "delta", "gamma" and "vega"), or
+    {"id": 1, "error": "..."}; {"id": 2, "method": "metrics"} returns `metrics`.
+    """
+
+    def __init__(
+        self,
+        engine_type: type = HestonEngine,
+        engine_options: typing.Dict = None,
+        max_batch_size: int = 4096,
+        max_latency: float = 0.005,
+        max_engines: int = 64,
+        callback: typing.Callable = None,
+    ):
+        """
+        Constructor method for PricingService.
+
+        @param {type} [engine_type=HestonEngine] - Engine class, built from the
+        parameters of the requests.
+        @param {Dict} [engine_options=None] - Keyword arguments added to the
+        parameters of every engine, e.g. the integration mode.
+        @param {int} [max_batch_size=4096] - Number of queued options flushing a
+        batch without waiting.
+        @param {float} [max_latency=0.005] - Longest wait of a request before its
+        batch is flushed, in seconds.
+        @param {int} [max_engines=64] - Number of engines kept for reuse, the
+        least recently used being dropped.
+        @param {Callable} [callback=None] - Called as callback(event, record)
+        after every batch, see `Stats`.
+        """
+        super().__init__()
+        assert max_batch_size > 0 and max_latency >= 0.0 and max_engines > 0
+        self.engine_type = engine_type
+        self.engine_options = dict(engine_options or {})
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_engines = max_engines
+        self.stats = Stats(callback)
+        self._engines = OrderedDict()
+        self._queues = {}
+        self._timers = {}
+        self._since = {}
+        self._tasks = set()
+        self._connections = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._server = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the pricing service.
+
+        @returns {str} String representation of the service.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "engine_type": self.engine_type.__qualname__,
+                "max_batch_size": self.max_batch_size,
+                "max_latency": self.max_latency,
+                "queue_depth": self.queue_depth,
+            }.items()
+        )
+        return f"<Service.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of options waiting for their batch.
+
+        @returns {int} Queued options over all parameter sets.
+        """
+        return sum(len(book) for queue in self._queues.values() for book, _, _ in queue)
+
+    def metrics(self) -> typing.Dict:
+        """
+        Snapshot of the service metrics.
+
+        @returns {Dict} Current queue depth and requests, the stats of the
+        batches: "requests", "options" and "batches" counters, "batch_size",
+        "batch_requests", "batch_wait" and "max_queue_depth" gauges, and
+        "price" wall time.
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "queued_requests": sum(len(queue) for queue in self._queues.values()),
+            **self.stats.to_dict(),
+        }
+
+    def _engine(self, key: typing.Tuple):
+        """
+        Engine of a parameter set, built on first use.
+
+        @param {Tuple} key - Sorted (name, value) pairs of the parameters.
+
+        @returns {Engine} Engine pricing the batches of the key.
+        """
+        engine = self._engines.pop(key, None)
+        if engine is None:
+            engine = self.engine_type(**dict(key), **self.engine_options)
+        self._engines[key] = engine
+        while len(self._engines) > self.max_engines:
+            self._engines.popitem(last=False)
+        return engine
+
+    async def price(
+        self,
+        params: typing.Dict,
+        options: typing.Union[typing.List, OptionBook],
+        greeks: bool = False,
+    ) -> typing.Dict[str, np.ndarray]:
+        """
+        Price options within the next batch of their parameter set.
+
+        @param {Dict} params - Engine parameters, e.g. theta, kappa, sigma, rho,
+        phi, v0, s0 and risk_free_rate for `HestonEngine`.
+        @param {List|OptionBook} options - List of option objects or option book.
+        @param {bool} [greeks=False] - Also return delta, gamma and vega.
+
+        @returns {Dict[str, np.ndarray]} NPV, and Greeks if asked, of the options.
+        """
+        book = HestonEngine._as_book(options)
+        key = tuple(sorted(params.items()))
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(key, [])
+        self._since.setdefault(key, time.perf_counter())
+        queue.append((book, greeks, future))
+
+        depth = self.queue_depth
+        self.stats.count("requests")
+        self.stats.gauge("queue_depth", depth)
+        self.stats.gauge(
+            "max_queue_depth", max(depth, self.stats.gauges.get("max_queue_depth", 0))
+        )
+        if sum(len(b) for b, _, _ in queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.max_latency, self._flush, key
+            )
+        return await future
+
+    def _flush(self, key: typing.Tuple):
+        """
+        Send the queue of a parameter set to pricing as one batch.
+
+        @param {Tuple} key - Sorted (name, value) pairs of the parameters.
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._queues.pop(key, [])
+        since = self._since.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(key, batch, since))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: typing.Tuple, batch: typing.List, since: float):
+        """
+        Price a batch on the worker thread and resolve its requests.
+
+        @param {Tuple} key - Sorted (name, value) pairs of the parameters.
+        @param {List} batch - Queued (book, greeks, future) requests.
+        @param {float} since - Time the oldest request was queued.
+        """
+        start = time.perf_counter()
+        books = [book for book, _, _ in batch]
+        book = OptionBook(
+            *(np.concatenate([getattr(b, name) for b in books]) for name in COLUMNS),
+            v0=np.concatenate([b.v0 for b in books]),
+        )
+        greeks = any(g for _, g, _ in batch)
+        loop = asyncio.get_running_loop()
+        try:
+            engine = self._engine(key)
+            results = await loop.run_in_executor(
+                self._executor, self._evaluate, engine, book, greeks
+            )
+        except Exception as error:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        stop = 0
+        for b, g, future in batch:
+            start_b, stop = stop, stop + len(b)
+            if not future.done():
+                names = results if g else ("npv",)
+                future.set_result({k: results[k][start_b:stop] for k in names})
+
+        seconds = time.perf_counter() - start
+        self.stats.count("batches")
+        self.stats.count("options", len(book))
+        self.stats.seconds["price"] = self.stats.seconds.get("price", 0.0) + seconds
+        self.stats.gauge("batch_size", len(book))
+        self.stats.gauge("batch_requests", len(batch))
+        self.stats.gauge("batch_wait", start - since)
+        self.stats.gauge("queue_depth", self.queue_depth)
+        self.stats.emit(
+            "batch",
+            requests=len(batch),
+            options=len(book),
+            greeks=greeks,
+            wait=start - since,
+            seconds=seconds,
+        )
+
+    @staticmethod
+    def _evaluate(engine, book: OptionBook, greeks: bool) -> typing.Dict:
+        """
+        Price a batch, on the worker thread.
+
+        @param {Engine} engine - Engine of the batch.
+        @param {OptionBook} book - Options of all the requests, in order.
+        @param {bool} greeks - Compute delta, gamma and vega as well.
+
+        @returns {Dict[str, np.ndarray]} NPV, and Greeks if asked.
+        """
+        if not greeks:
+            return {"npv": engine.npv(book)}
+        return dict(
+            zip(("npv", "delta", "gamma", "vega"), engine.price_and_greeks(book))
+        )
+
+    async def start(self, path: str = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Serve JSON-line requests on a unix socket, or on a localhost TCP port.
+
+        @param {str} [path=None] - Unix socket path; TCP is used when None.
+        @param {str} [host="127.0.0.1"] - TCP host.
+        @param {int} [port=0] - TCP port, 0 for any free port.
+
+        @returns {asyncio.AbstractServer} Listening server, whose `sockets` give
+        the bound address.
+        """
+        assert self._server is None
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def stop(self):
+        """
+        Stop listening, flush and complete the pending requests, then close the
+        connections.
+        """
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for key in list(self._queues):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        handlers = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        if handlers:
+            await asyncio.gather(*handlers, return_exceptions=True)
+        if server is not None:
+            await server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one connection; its requests are answered as they complete.
+
+        @param {asyncio.StreamReader} reader - Incoming JSON lines.
+        @param {asyncio.StreamWriter} writer - Outgoing JSON lines.
+        """
+        pending = set()
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self._connections.pop(handler, None)
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        """
+        Answer one JSON-line request.
+
+        @param {bytes} line - Request.
+        @param {asyncio.StreamWriter} writer - Connection of the request.
+        """
+        response = {}
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+            if request.get("method", "price") == "metrics":
+                response.update(self.metrics())
+            else:
+                options = request["options"]
+                book = OptionBook(
+                    *(np.asarray(options[name], dtype=float) for name in COLUMNS),
+                    v0=np.asarray(options.get("v0", np.nan), dtype=float),
+                )
+                results = await self.price(
+                    request["params"], book, bool(request.get("greeks", False))
+                )
+                response.update({k: v.tolist() for k, v in results.items()})
+        except Exception as error:
+            response["error"] = f"{type(error).__name__}: {error}"
+        if not writer.is_closing():
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
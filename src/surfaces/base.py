@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining various surfaces.
+It contains the base class `Surface`, which serves as the foundation
+for grids of model outputs queried by interpolation.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from abc import ABC, abstractmethod
+
+
+class Surface(ABC):
+    def __init__(self):
+        """
+        Constructor method for Surface.
+        """
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the Surface.
+
+        @returns {str} String representation of the surface.
+        """
+        pass
+
+    @abstractmethod
+    def refresh(self):
+        """
+        Recompute the parts of the surface whose inputs changed.
+        """
+        pass
+
+    @abstractmethod
+    def __call__(self, strike, tau):
+        """
+        Interpolate the surface.
+
+        @param {float|np.ndarray} strike - Strike prices.
+        @param {float|np.ndarray} tau - Times to expiration.
+        """
+        pass
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+This module provides a framework for defining volatility surface.
+This class inherit methods from the parent class `Surface`,
+providing Heston implied volatilities on a strike x maturity grid.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from ..engines.blackscholes import BlackScholesEngine
+from ..instruments.option import OptionBook
+from ..engines.heston import HestonEngine
+from ..engines.cache import DiskCache
+from .base import Surface
+import numpy as np
+import typing
+
+
+class VolSurface(Surface):
+
+    """
+    Volatility Surface Class
+
+    This class holds the Black-Scholes implied volatilities of the prices of a
+    `HestonEngine` on a strike x maturity grid. The grid is priced with one
+    `npv` call and inverted with one `implied_volatility` call; every maturity
+    row remembers the inputs it was built from, so `refresh` only recomputes
+    the rows whose inputs changed and is a no-op otherwise; an engine change
+    rebuilds every row, see `refresh`. Queries interpolate
+    the total implied variance bilinearly in log-strike and maturity. With a
+    `DiskCache`, rows are also read from and written to the store, keyed by
+    the engine's fingerprint, the strikes and the maturity.
+    """
+
+    def __init__(
+        self,
+        engine: HestonEngine,
+        strikes: np.ndarray,
+        taus: np.ndarray,
+        store: DiskCache = None,
+    ):
+        """
+        Constructor method for VolSurface.
+
+        @param {HestonEngine} engine - Engine pricing the grid, at its s0.
+        @param {np.ndarray} strikes - Strike prices of the grid, at least two.
+        @param {np.ndarray} taus - Maturities of the grid, at least two.
+        @param {DiskCache} [store=None] - Opt-in persistent store of the rows.
+        """
+        super().__init__()
+        assert isinstance(engine, HestonEngine)
+        self.engine = engine
+        self.store = store
+        self.strikes = np.empty(0)
+        self.taus = np.empty(0)
+        self.quotes = np.empty((0, 0))
+        self.vols = np.empty((0, 0))
+        self._keys = []
+        self.set_grid(strikes, taus)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the volatility surface.
+
+        @returns {str} String representation of the surface.
+        """
+        params = (
+            f"{k}={repr(v)}"
+            for k, v in {
+                "engine": self.engine,
+                "strikes": len(self.strikes),
+                "taus": len(self.taus),
+            }.items()
+        )
+        return f"<Surface.{self.__class__.__qualname__}({', '.join(params)})>"
+
+    def _model_key(self) -> typing.Tuple:
+        """
+        Engine inputs shared by every row of the surface.
+
+        @returns {Tuple} Fingerprint of the engine: parameters, initial price,
+        rates and integration settings.
+        """
+        return self.engine.fingerprint()
+
+    def set_grid(self, strikes: np.ndarray = None, taus: np.ndarray = None):
+        """
+        Change the grid, keeping the rows of maturities already built.
+
+        @param {np.ndarray} [strikes=None] - New strike prices; all rows are
+        rebuilt if they change.
+        @param {np.ndarray} [taus=None] - New maturities.
+
+        @returns {np.ndarray} Indices of the recomputed maturities.
+        """
+        strikes = self.strikes if strikes is None else np.unique(strikes).astype(float)
+        taus = self.taus if taus is None else np.unique(taus).astype(float)
+        assert len(strikes) > 1 and len(taus) > 1 and np.all(strikes > 0.0)
+        assert np.all(taus > 0.0)
+
+        keep = np.array_equal(strikes, self.strikes)
+        old = {tau: i for i, tau in enumerate(self.taus)} if keep else {}
+        quotes = np.full((len(taus), len(strikes)), np.nan)
+        vols = np.full((len(taus), len(strikes)), np.nan)
+        keys = [None] * len(taus)
+        for i, tau in enumerate(taus):
+            if tau in old:
+                quotes[i] = self.quotes[old[tau]]
+                vols[i] = self.vols[old[tau]]
+                keys[i] = self._keys[old[tau]]
+
+        self.strikes, self.taus = strikes, taus
+        self.quotes, self.vols, self._keys = quotes, vols, keys
+        self._log_strikes = np.log(strikes)
+        return self.refresh()
+
+    def refresh(self) -> np.ndarray:
+        """
+        Recompute the maturities whose inputs changed since they were built.
+
+        A row's inputs are its maturity, the strikes and the engine's
+        `fingerprint`. Every row prices with every model parameter, so any
+        change of the engine, even to a setting that leaves some prices
+        unchanged such as mu, rebuilds all the rows: only grid edits are
+        incremental. With a store, rows built earlier with the same settings
+        are read back instead of priced, so returning to a previous set of
+        parameters is cheap.
+
+        All stale rows are priced in one `npv` call and inverted in one
+        `implied_volatility` call, out-of-the-money options (puts below s0,
+        calls above) being used for the inversion.
+
+        @returns {np.ndarray} Indices of the recomputed maturities.
+        """
+        model = self._model_key()
+        stale = np.array(
+            [i for i, tau in enumerate(self.taus) if self._keys[i] != (model, tau)],
+            dtype=np.int64,
+        )
+        if len(stale):
+            self._build(model, stale)
+        self._total = self.vols**2 * self.taus[:, None]
+        return stale
+
+    def _build(self, model: typing.Tuple, rows: np.ndarray):
+        """
+        Price and invert the given maturity rows in one batch.
+
+        @param {Tuple} model - Engine inputs the rows are built from.
+        @param {np.ndarray} rows - Indices of the maturities to build.
+        """
+        if self.store is not None:
+            keys = {
+                i: self.store.key("vol_surface", model, self.strikes, self.taus[i])
+                for i in rows
+            }
+            missing = []
+            for i in rows:
+                entry = self.store.get(keys[i])
+                if entry is None:
+                    missing.append(i)
+                    continue
+                self.quotes[i] = entry["quotes"]
+                self.vols[i] = entry["vols"]
+                self._keys[i] = (model, self.taus[i])
+            rows = np.array(missing, dtype=np.int64)
+            if not len(rows):
+                return
+
+        n_k = len(self.strikes)
+        strike = np.tile(self.strikes, len(rows))
+        book = OptionBook(
+            self.engine.s0,
+            strike,
+            np.repeat(self.taus[rows], n_k),
+            np.where(strike >= self.engine.s0, 1, -1),
+        )
+        book.quote[:] = self.engine.npv(book)
+        bs = BlackScholesEngine(
+            risk_free_rate=self.engine.risk_free_rate,
+            dividend_yield=self.engine.dividend_yield,
+        )
+        self.quotes[rows] = book.quote.reshape(-1, n_k)
+        self.vols[rows] = bs.implied_volatility(book).reshape(-1, n_k)
+        for i in rows:
+            self._keys[i] = (model, self.taus[i])
+            if self.store is not None:
+                self.store.put(
+                    keys[i], {"quotes": self.quotes[i], "vols": self.vols[i]}
+                )
+
+    def __call__(self, strike, tau):
+        """
+        Implied volatilities interpolated on the surface.
+
+        Total implied variance is interpolated bilinearly in log-strike and
+        maturity; beyond the grid the volatility is extrapolated flat.
+
+        @param {float|np.ndarray} strike - Strike prices.
+        @param {float|np.ndarray} tau - Times to expiration.
+
+        @returns {float|np.ndarray} Implied volatilities.
+        """
+        x, tau = np.broadcast_arrays(np.log(strike), np.asarray(tau, dtype=float))
+        tau = np.clip(tau, self.taus[0], self.taus[-1])
+        log_k = self._log_strikes
+
+        i = np.clip(np.searchsorted(log_k, x) - 1, 0, len(log_k) - 2)
+        j = np.clip(np.searchsorted(self.taus, tau) - 1, 0, len(self.taus) - 2)
+        u = np.clip((x - log_k[i]) / (log_k[i + 1] - log_k[i]), 0.0, 1.0)
+        w = (tau - self.taus[j]) / (self.taus[j + 1] - self.taus[j])
+
+        total = self._total
+        variance = (1.0 - w) * ((1.0 - u) * total[j, i] + u * total[j, i + 1]) + w * (
+            (1.0 - u) * total[j + 1, i] + u * total[j + 1, i + 1]
+        )
+        return np.sqrt(variance / tau)[()]
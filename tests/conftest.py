@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Shared fixtures of the test suite: a Heston parameter set with a dividend
+yield and a displacement, and a small book of calls and puts over several
+strikes and maturities.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.instruments.option import OptionBook
+
+
+@pytest.fixture
+def params():
+    return dict(
+        theta=0.04,
+        kappa=1.5,
+        sigma=0.5,
+        rho=-0.7,
+        phi=0.0025,
+        v0=0.04,
+        s0=100.0,
+        mu=0.05,
+        risk_free_rate=0.03,
+        dividend_yield=0.01,
+    )
+
+
+@pytest.fixture
+def book():
+    strike = np.tile([80.0, 90.0, 100.0, 110.0, 120.0], 3)
+    tau = np.repeat([0.25, 1.0, 2.0], 5)
+    flag = np.tile([-1, -1, 1, 1, 1], 3)
+    return OptionBook(np.full(15, 100.0), strike, tau, flag)
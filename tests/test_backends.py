@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Parity of the compute backends: the Numba kernels against the NumPy ones,
+for the chf terms and every path-stepping option.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.processes.heston import HestonProcess
+from src.engines.heston import HestonEngine
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+
+def test_chf_terms_match_numpy(params):
+    z = np.linspace(1e-3, 200.0, 2001)[:, None]
+    j = np.array([1, 2])[None, :]
+    tau = np.array([0.1, 1.0, 5.0])[:, None, None]
+    expected = HestonEngine(**params).chf_terms(tau, z, j)
+    actual = HestonEngine(**params, backend="numba").chf_terms(tau, z, j)
+    for a, e in zip(actual, expected):
+        np.testing.assert_allclose(a, e, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("scheme", ["euler", "milstein"])
+@pytest.mark.parametrize("discretization", ["truncation", "reflection"])
+@pytest.mark.parametrize("measure", ["rn", "rw"])
+@pytest.mark.parametrize("phi", [0.0, 0.0025])
+def test_steps_match_numpy(params, scheme, discretization, measure, phi):
+    kwargs = dict(scheme=scheme, discretization=discretization, measure=measure)
+    paths = [
+        HestonProcess.paths(
+            HestonEngine(**dict(params, phi=phi), backend=backend),
+            512,
+            50,
+            1.0,
+            fields=("s", "v", "rho"),
+            rng=np.random.default_rng(1),
+            **kwargs,
+        )
+        for backend in ("numpy", "numba")
+    ]
+    for actual, expected in zip(paths[1], paths[0]):
+        np.testing.assert_allclose(actual, expected, rtol=1e-13, atol=0.0)
+
+
+def test_step_writes_into_out(params):
+    engine = HestonEngine(**params, backend="numba")
+    n = 64
+    state = (np.full(n, 100.0), np.full(n, 0.04), np.full(n, -0.7))
+    out = (np.empty(n), np.empty(n), np.empty(n))
+    zv, zs = np.random.default_rng(2).standard_normal((2, n))
+    result = engine.backend.step(
+        engine, *state, zv, zs, 0.01, "milstein", "truncation", "rn", out=out
+    )
+    assert all(r is o for r, o in zip(result, out))
+    expected = HestonEngine(**params).backend.step(
+        engine, *state, zv, zs, 0.01, "milstein", "truncation", "rn"
+    )
+    for r, e in zip(result, expected):
+        np.testing.assert_allclose(r, e, rtol=1e-13, atol=0.0)
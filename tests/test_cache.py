@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Persistent store of priced results: round trips, least-recently-used
+eviction, pickling to worker processes and the entries the engines and the
+calibrator write through it.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.calibration.heston import HestonCalibrator
+from src.processes.reducers import TerminalReducer
+from src.processes.heston import HestonProcess
+from src.engines.heston import HestonEngine
+from src.engines.cache import DiskCache
+import numpy as np
+import pickle
+import os
+
+
+def test_round_trip(tmp_path):
+    store = DiskCache(str(tmp_path))
+    key = store.key("npv", ("HestonEngine", ("kappa", 1.5)), np.arange(3.0))
+    assert store.get(key) is None
+    entry = {"npv": np.linspace(0.0, 1.0, 5), "empty": np.empty(0)}
+    store.put(key, entry)
+    assert key in store and len(store) == 1
+    result = store.get(key)
+    for name, array in entry.items():
+        np.testing.assert_array_equal(result[name], array)
+    assert (store.hits, store.misses) == (1, 1)
+
+    # persisted on disk, read back by another instance
+    store.close()
+    np.testing.assert_array_equal(
+        DiskCache(str(tmp_path)).get(key)["npv"], entry["npv"]
+    )
+
+
+def test_keys_are_content_addressed():
+    a = DiskCache.key("npv", (1.0, "x"), np.arange(3.0))
+    assert a == DiskCache.key("npv", (1.0, "x"), np.arange(3.0))
+    assert a != DiskCache.key("npv", [1.0, "x"], np.arange(3.0))
+    assert a != DiskCache.key("npv", (1.0, "x"), np.arange(3))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    entry = {"npv": np.zeros(1024)}
+    store = DiskCache(str(tmp_path), max_bytes=1)
+    keys = [store.key("entry", i) for i in range(4)]
+    store.put(keys[0], entry)
+    nbytes = store.nbytes
+    store.max_bytes = 3 * nbytes
+    for key in keys[1:3]:
+        store.put(key, entry)
+    store.get(keys[0])
+    store.put(keys[3], entry)
+    assert [key in store for key in keys] == [True, False, True, True]
+    assert not os.path.exists(store._folder(keys[1]))
+    assert store.nbytes == 3 * nbytes
+
+
+def test_pickle_reopens_the_directory(tmp_path):
+    store = DiskCache(str(tmp_path), max_bytes=2**20)
+    key = store.key("entry")
+    store.put(key, {"npv": np.ones(4)})
+    clone = pickle.loads(pickle.dumps(store))
+    assert (clone.path, clone.max_bytes) == (store.path, store.max_bytes)
+    np.testing.assert_array_equal(clone.get(key)["npv"], np.ones(4))
+
+
+def test_simulate_with_a_store_in_workers(tmp_path, params):
+    engine = HestonEngine(**params, store=DiskCache(str(tmp_path)))
+    kwargs = dict(reducers={"s": TerminalReducer()}, block_size=256, seed=3)
+    results = [
+        HestonProcess.simulate(engine, 1024, 8, 1.0, n_workers=n, **kwargs)["s"]
+        for n in (1, 2)
+    ]
+    np.testing.assert_array_equal(results[0], results[1])
+
+
+def test_npv_reads_through_the_store(tmp_path, params, book):
+    store = DiskCache(str(tmp_path))
+    engine = HestonEngine(**params, integration="laguerre", store=store)
+    npv = engine.npv(book)
+    assert len(store) == 1 and store.misses == 1
+    np.testing.assert_array_equal(engine.npv(book), npv)
+    assert store.hits == 1
+    np.testing.assert_array_equal(
+        HestonEngine(**params, integration="laguerre")._npv(book), npv
+    )
+
+
+def test_calibration_stores_only_the_fit(tmp_path, params, book):
+    book.quote[:] = HestonEngine(**params, integration="laguerre").npv(book)
+    store = DiskCache(str(tmp_path))
+    start = dict(params, kappa=2.0, theta=0.06, rho=-0.5)
+    engine = HestonEngine(**start, integration="laguerre", store=store)
+    fit = ("kappa", "theta", "rho")
+    result = HestonCalibrator(engine, fit=fit, store=store).calibrate(book)
+    assert result["converged"] and result["rmse"] < 1e-6
+    assert len(store) == 1
+
+    # the same calibration is read back
+    engine = HestonEngine(**start, integration="laguerre", store=store)
+    again = HestonCalibrator(engine, fit=fit, store=store).calibrate(book)
+    assert again == result and store.hits == 1
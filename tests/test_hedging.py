@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Delta hedger: the interpolated grid against one option per path, the
+fixed-node pricing of the grid and degenerate path states.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.processes.heston import HestonProcess
+from src.engines.heston import HestonEngine
+from src.hedging.delta import DeltaHedger
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def state(params):
+    engine = HestonEngine(**params, integration="laguerre")
+    s, vol = HestonProcess.paths(
+        engine, 2000, 25, 0.5, fields=("s", "vol"), rng=np.random.default_rng(4)
+    )
+    return s[:, -1], vol[:, -1]
+
+
+def test_grid_matches_one_option_per_path(params, state):
+    engine = HestonEngine(**params, integration="laguerre")
+    exact = DeltaHedger(engine, grid=None).hedge_ratios(*state, 100.0, 0.5, 1)
+    grid = DeltaHedger(engine).hedge_ratios(*state, 100.0, 0.5, 1)
+    assert DeltaHedger(engine).grid == (64, 16)
+    # bilinear interpolation error of the 64 x 16 grid
+    np.testing.assert_allclose(grid, exact, rtol=0.0, atol=1e-2)
+    assert np.mean(np.abs(grid - exact)) < 1e-3
+
+
+def test_grid_prices_quad_vec_engines_on_fixed_nodes(params, state):
+    engine = HestonEngine(**params)
+    grid = DeltaHedger(engine).hedge_ratios(*state, 100.0, 0.5, -1)
+    assert engine.integration == "quad_vec"
+    laguerre = HestonEngine(**params, integration="laguerre")
+    expected = DeltaHedger(laguerre).hedge_ratios(*state, 100.0, 0.5, -1)
+    np.testing.assert_allclose(grid, expected, rtol=1e-12, atol=0.0)
+
+
+@pytest.mark.parametrize("vol", [np.linspace(0.1, 0.3, 50), np.full(50, 0.2), None])
+def test_grid_with_equal_spots(params, vol):
+    engine = HestonEngine(**params, integration="laguerre")
+    hedger = DeltaHedger(engine, sigma=0.2 if vol is None else None)
+    s = np.full(50, 95.0)
+    delta = hedger.hedge_ratios(s, vol, 100.0, 0.5, 1)
+    exact = DeltaHedger(hedger.engine, sigma=hedger.sigma, grid=None).hedge_ratios(
+        s, vol, 100.0, 0.5, 1
+    )
+    assert np.all(np.isfinite(delta))
+    np.testing.assert_allclose(delta, exact, rtol=0.0, atol=1e-3)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Cold start of the package: `import src` loads none of its subpackages nor
+their dependencies, and the imports of `benchmarks/bench_imports.py` stay
+within their budgets, timed in fresh interpreters.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+import importlib.util
+import subprocess
+import pytest
+import time
+import sys
+import os
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+spec = importlib.util.spec_from_file_location(
+    "bench_imports", os.path.join(ROOT, "benchmarks", "bench_imports.py")
+)
+bench_imports = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_imports)
+
+
+def imported(statement):
+    script = f"{statement}; import sys; print(*sys.modules, sep=chr(10))"
+    command = [sys.executable, "-c", script]
+    result = subprocess.run(command, cwd=ROOT, check=True, capture_output=True)
+    return result.stdout.decode().split()
+
+
+def best_time(run, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_import_is_lazy():
+    modules = imported("import src")
+    assert "src" in modules
+    loaded = [
+        name
+        for name in modules
+        if name.split(".")[0] in ("numpy", "scipy", "numba")
+        or (name.startswith("src.") and name != "src._lazy")
+    ]
+    assert loaded == []
+
+
+def test_export_loads_its_subpackage_only():
+    modules = imported("import src; src.BlackScholesEngine")
+    assert "src.engines.blackscholes" in modules
+    assert "src.engines.heston" not in modules and "src.processes" not in modules
+    assert "numba" not in modules
+
+
+@pytest.mark.parametrize("module", bench_imports.bench_import.params)
+def test_import_budget(module):
+    baseline = best_time(bench_imports.bench_import.baseline())
+    elapsed = best_time(bench_imports.bench_import(module))
+    budget = bench_imports.bench_import.budget[module]
+    assert elapsed <= budget * baseline, (
+        f"import {module} took {elapsed * 1e3:.0f} ms, "
+        f"{elapsed / baseline:.2f} x import numpy (budget {budget})"
+    )
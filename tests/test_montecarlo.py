@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Monte Carlo engine: prices within their standard errors of the Fourier ones,
+variance reduction by the controls, and reproducible seeded runs.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.engines.montecarlo import MonteCarloHestonEngine
+from src.engines.heston import HestonEngine
+from src.engines.cache import DiskCache
+import numpy as np
+import pytest
+
+# 80 steps up to 2 years put every maturity of the book on a step
+SETTINGS = dict(n_paths=2**15, n_steps=80, seed=7)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(scheme="qe"),
+        dict(scheme="qe", antithetic=False),
+        dict(scheme="qe", control_variate="spot"),
+        dict(scheme="qe", qmc=True, antithetic=False),
+    ],
+)
+def test_prices_within_standard_errors(params, book, kwargs):
+    expected = HestonEngine(**params, integration="laguerre").npv(book)
+    engine = MonteCarloHestonEngine(**params, **SETTINGS, **kwargs)
+    npv, error = engine.npv_and_error(book)
+    assert np.all(error > 0.0)
+    assert np.max(np.abs(npv - expected) / error) < 4.0
+
+
+# antithetic pairs already cancel most of what the spot control removes
+@pytest.mark.parametrize(
+    "control_variate, ratio", [("spot", 0.95), ("blackscholes", 0.8)]
+)
+def test_controls_reduce_the_error(params, book, control_variate, ratio):
+    plain = MonteCarloHestonEngine(**params, **SETTINGS)
+    npv, error = plain.npv_and_error(book)
+    engine = MonteCarloHestonEngine(
+        **params, **SETTINGS, control_variate=control_variate
+    )
+    controlled, controlled_error = engine.npv_and_error(book)
+    # same paths: the estimates differ by less than the plain error
+    assert np.max(np.abs(controlled - npv) / error) < 3.0
+    assert np.mean(controlled_error / error) < ratio
+
+
+def test_seeded_runs_are_reproducible(params, book):
+    seed = np.random.SeedSequence(11)
+    engine = MonteCarloHestonEngine(**params, **dict(SETTINGS, seed=seed))
+    first = engine.npv(book)
+    np.testing.assert_array_equal(engine.npv(book), first)
+    assert seed.n_children_spawned == 0
+    other = MonteCarloHestonEngine(**params, **dict(SETTINGS, seed=11))
+    np.testing.assert_array_equal(other.npv(book), first)
+
+
+def test_seeded_prices_are_stored(tmp_path, params, book):
+    store = DiskCache(str(tmp_path))
+    seed = np.random.SeedSequence(11)
+    engine = MonteCarloHestonEngine(**params, **dict(SETTINGS, seed=seed), store=store)
+    npv = engine.npv(book)
+    np.testing.assert_array_equal(engine.npv(book), npv)
+    assert (store.hits, store.misses, len(store)) == (1, 1, 1)
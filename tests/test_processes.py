@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Seeded simulation: results independent of the number of workers, seeds
+left unspawned, and blocks merged in order.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.processes.reducers import TerminalReducer, MaxReducer, AverageReducer
+from src.processes.heston import HestonProcess
+from src.engines.heston import HestonEngine
+import numpy as np
+import pytest
+
+REDUCERS = {"s": TerminalReducer(), "max": MaxReducer(), "mean": AverageReducer("v")}
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(scheme="qe"), dict(qmc=True)])
+def test_simulate_is_independent_of_the_workers(params, kwargs):
+    engine = HestonEngine(**params)
+    results = [
+        HestonProcess.simulate(
+            engine,
+            3072,
+            16,
+            1.0,
+            REDUCERS,
+            block_size=512,
+            seed=5,
+            n_workers=n,
+            **kwargs
+        )
+        for n in (1, 3)
+    ]
+    assert results[0]["s"].shape == (3072,)
+    for name in REDUCERS:
+        np.testing.assert_array_equal(results[1][name], results[0][name])
+
+
+def test_default_blocks_do_not_depend_on_the_workers(params):
+    engine = HestonEngine(**params)
+    n_paths = 2 * HestonProcess.default_block_size + 100
+    results = [
+        HestonProcess.simulate(engine, n_paths, 4, 1.0, REDUCERS, seed=5, n_workers=n)
+        for n in (1, 2)
+    ]
+    for name in REDUCERS:
+        np.testing.assert_array_equal(results[1][name], results[0][name])
+
+
+def test_seed_sequence_is_not_spawned(params):
+    engine = HestonEngine(**params)
+    seed = np.random.SeedSequence(5)
+    first = HestonProcess.simulate(engine, 1000, 8, 1.0, REDUCERS, seed=seed)
+    assert seed.n_children_spawned == 0
+    again = HestonProcess.simulate(engine, 1000, 8, 1.0, REDUCERS, seed=seed)
+    np.testing.assert_array_equal(again["s"], first["s"])
+    other = HestonProcess.simulate(engine, 1000, 8, 1.0, REDUCERS, seed=5)
+    np.testing.assert_array_equal(other["s"], first["s"])
+
+
+def test_blocks_are_merged_in_order(params):
+    # block i draws from the i-th child stream whatever the number of blocks
+    engine = HestonEngine(**params)
+    kwargs = dict(block_size=256, seed=5)
+    whole = HestonProcess.simulate(engine, 1024, 8, 1.0, REDUCERS, **kwargs)
+    head = HestonProcess.simulate(engine, 768, 8, 1.0, REDUCERS, **kwargs)
+    for name in ("s", "max"):
+        np.testing.assert_array_equal(head[name], whole[name][:768])
+
+
+def test_child_seeds_match_spawn():
+    children = np.random.SeedSequence(3).spawn(4)
+    seeds = HestonProcess.child_seeds(3, 4)
+    for seed, child in zip(seeds, children):
+        assert seed.generate_state(4).tolist() == child.generate_state(4).tolist()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""\
+Scenario ladders: every spot, variance and time scenario against repricing
+the shifted book, and options expiring within the time decay.
+"""
+
+__author__ = None
+__copyright__ = None
+
+
+from src.instruments.option import OptionBook
+from src.engines.heston import HestonEngine
+import numpy as np
+
+
+def test_ladder_matches_repricing(params, book):
+    engine = HestonEngine(**params, integration="laguerre")
+    book.v0[::2] = 0.09
+    spot_shifts = np.array([-0.1, 0.0, 0.05])
+    v0_shifts = np.array([-0.01, 0.0, 0.02])
+    time_decay = np.array([0.0, 0.1])
+    ladder = engine.scenarios(book, spot_shifts, v0_shifts, time_decay)
+    assert ladder.shape == (3, 3, 2, len(book))
+
+    v0 = np.where(np.isnan(book.v0), engine.v0, book.v0)
+    for i, d_s in enumerate(spot_shifts):
+        for j, d_v in enumerate(v0_shifts):
+            for k, d_t in enumerate(time_decay):
+                shifted = OptionBook(
+                    book.s0 * (1.0 + d_s),
+                    book.strike,
+                    book.tau - d_t,
+                    book.flag,
+                    v0=v0 + d_v,
+                )
+                np.testing.assert_allclose(
+                    ladder[i, j, k], engine.npv(shifted), rtol=0.0, atol=1e-10
+                )
+
+
+def test_expired_options_are_worth_their_intrinsic_value(params):
+    engine = HestonEngine(**params, integration="laguerre")
+    book = OptionBook(100.0, np.array([90.0, 110.0, 90.0, 110.0]), 0.25, [1, 1, -1, -1])
+    ladder = engine.scenarios(book, [-0.2, 0.0, 0.2], time_decay=[0.25, 0.5])
+    s0 = 100.0 * np.array([0.8, 1.0, 1.2])[:, None, None, None]
+    intrinsic = np.maximum(book.flag * (s0 - book.strike), 0.0)
+    np.testing.assert_array_equal(ladder, np.broadcast_to(intrinsic, ladder.shape))
+
+
+def test_default_ladder_is_the_npv(params, book):
+    engine = HestonEngine(**params, integration="legendre")
+    ladder = engine.scenarios(book)
+    np.testing.assert_allclose(ladder[0, 0, 0], engine.npv(book), rtol=0.0, atol=1e-12)